@@ -1,27 +1,35 @@
 import bpy
-from .operators import register_association, export_nodegroup, import_nodegroup, drop_handler
+from .operators import register_association, export_nodegroup, import_nodegroup, drop_handler, deduplicate_nodegroups
+from . import preferences
+from .log import get_logger
+
+logger = get_logger(__name__)
 
 def register():
+    preferences.register()
     register_association.register()
     export_nodegroup.register()
     export_nodegroup.register_menu()
     drop_handler.register()
+    deduplicate_nodegroups.register()
     
     # Actually run the file association registration
-    print("[XWZ] Running file association registration...")
+    logger.debug('Running file association registration...')
 
     try:
         success = register_association.perform_file_association()
         if success:
-            print("File association registration completed successfully!")
+            logger.info('File association registration completed successfully!')
         else:
-            print("File association registration failed!")
+            logger.error('File association registration failed!')
     except Exception as e:
-        print(f"Error during file association registration: {e}")
+        logger.error('Error during file association registration: %s', e)
 
 def unregister():
+    deduplicate_nodegroups.unregister()
     drop_handler.unregister()
     export_nodegroup.unregister_menu()
     export_nodegroup.unregister()
     register_association.unregister()
-    print("[XWZ] Node File Link addon unregistered.")
\ No newline at end of file
+    logger.debug('Node File Link addon unregistered.')
+    preferences.unregister()
\ No newline at end of file
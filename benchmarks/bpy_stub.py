@@ -0,0 +1,111 @@
+"""Minimal stand-ins for bpy and mathutils, so the bpy-free stages run without Blender.
+
+Only what the addon's modules touch at import time is provided. Anything that
+needs real Blender data (appending .blend files, placing nodes) is out of scope for
+the benchmarks and fails loudly instead of pretending to work.
+"""
+
+import os
+import sys
+import types
+import tempfile
+
+ADDON_PACKAGE = "node_file_link"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _ID:
+    pass
+
+
+class _Vector(tuple):
+    def __new__(cls, values=(0.0, 0.0, 0.0)):
+        return super().__new__(cls, values)
+
+    x = property(lambda self: self[0])
+    y = property(lambda self: self[1])
+    z = property(lambda self: self[2] if len(self) > 2 else 0.0)
+
+
+def _property(*args, **kwargs):
+    return None
+
+
+def _unavailable(name):
+    def call(*args, **kwargs):
+        raise RuntimeError(f"{name} needs Blender and is not available in the benchmark stub")
+    return call
+
+
+def _build_modules() -> dict:
+    bpy = types.ModuleType("bpy")
+
+    bpy_types = types.ModuleType("bpy.types")
+    for name in ('ID', 'NodeTree', 'Material', 'Object', 'Image', 'Text'):
+        setattr(bpy_types, name, type(name, (_ID,), {}) if name != 'ID' else _ID)
+    for name in ('Operator', 'Menu', 'Panel', 'AddonPreferences', 'PropertyGroup', 'FileHandler',
+                 'OperatorFileListElement'):
+        setattr(bpy_types, name, type(name, (), {}))
+
+    bpy_props = types.ModuleType("bpy.props")
+    for name in ('StringProperty', 'BoolProperty', 'IntProperty', 'FloatProperty',
+                 'EnumProperty', 'CollectionProperty', 'PointerProperty'):
+        setattr(bpy_props, name, _property)
+
+    bpy_utils = types.ModuleType("bpy.utils")
+    bpy_utils.user_resource = lambda resource_type, path="", create=False: os.path.join(
+        tempfile.gettempdir(), "node_file_link_bench", resource_type.lower(), path)
+    bpy_utils.register_class = _property
+    bpy_utils.unregister_class = _property
+
+    bpy_app = types.ModuleType("bpy.app")
+    bpy_app.version = (4, 1, 0)
+    bpy_app.version_string = "4.1.0 (benchmark stub)"
+    bpy_app.background = True
+    bpy_app.timers = types.SimpleNamespace(register=_unavailable("bpy.app.timers.register"))
+
+    bpy.types = bpy_types
+    bpy.props = bpy_props
+    bpy.utils = bpy_utils
+    bpy.app = bpy_app
+    bpy.data = types.SimpleNamespace(node_groups=[], libraries=types.SimpleNamespace(
+        load=_unavailable("bpy.data.libraries.load"), write=_unavailable("bpy.data.libraries.write")))
+    bpy.context = types.SimpleNamespace(preferences=None, screen=None, window=None, area=None)
+
+    mathutils = types.ModuleType("mathutils")
+    mathutils.Vector = _Vector
+    mathutils.Euler = _Vector
+    mathutils.Color = _Vector
+
+    bpy_extras = types.ModuleType("bpy_extras")
+    io_utils = types.ModuleType("bpy_extras.io_utils")
+    io_utils.ImportHelper = type('ImportHelper', (), {})
+    io_utils.ExportHelper = type('ExportHelper', (), {})
+    bpy_extras.io_utils = io_utils
+
+    return {
+        'bpy': bpy, 'bpy.types': bpy_types, 'bpy.props': bpy_props, 'bpy.utils': bpy_utils,
+        'bpy.app': bpy_app, 'mathutils': mathutils, 'bpy_extras': bpy_extras,
+        'bpy_extras.io_utils': io_utils,
+    }
+
+
+def install() -> bool:
+    """Register the stub modules unless a real bpy is importable. Returns True if stubbed."""
+    try:
+        import bpy  # noqa: F401
+        return False
+    except ImportError:
+        pass
+    for name, module in _build_modules().items():
+        sys.modules.setdefault(name, module)
+    return True
+
+
+def load_addon():
+    """Import the addon as a package without running its register() side of __init__.py."""
+    if ADDON_PACKAGE not in sys.modules:
+        package = types.ModuleType(ADDON_PACKAGE)
+        package.__path__ = [REPO_ROOT]
+        sys.modules[ADDON_PACKAGE] = package
+    return sys.modules[ADDON_PACKAGE]
@@ -0,0 +1,269 @@
+"""Benchmarks for the bpy-free stages of export and import, runnable without Blender.
+
+Each configuration generates a synthetic package (see synthetic.py), then times
+packaging (zip + SHA-256) and the import stages that run before bpy is involved
+(open, manifest read and parse, extraction with CRC check, content hash check).
+For compression presets that compress the .blend itself, the decompression Blender
+does when loading it is timed as well, as the 'blend_decompress' import stage.
+Every configuration runs in its own process, so peak RSS is per configuration::
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --preset large --manifest-format both --repeat 5
+    python benchmarks/run_benchmarks.py --compression stored --compression deflate --compression lzma
+    python benchmarks/run_benchmarks.py --output current.json --baseline release.json
+
+With --baseline, the exit code is 1 if export or import got slower than the baseline
+by more than --tolerance, so the run can gate a release.
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import List, Optional
+
+import bpy_stub
+from synthetic import TreeSpec, write_sources
+
+PRESETS = {
+    'small': TreeSpec("Small", nodes=25, links=30, sockets=4),
+    'medium': TreeSpec("Medium", nodes=250, links=350, sockets=8, nested=4),
+    'large': TreeSpec("Large", nodes=2000, links=3000, sockets=16, nested=16),
+    'huge': TreeSpec("Huge", nodes=10000, links=15000, sockets=32, nested=64),
+}
+MANIFEST_FORMATS = ('json', 'compact', 'both')
+COMPRESSIONS = ('stored', 'deflate', 'lzma', 'legacy')
+# Results written before the compression axis existed packaged an uncompressed .blend with deflate
+BASELINE_COMPRESSION = 'deflate'
+DEFAULT_TOLERANCE = 0.25
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _median_stages(runs: List[dict]) -> dict:
+    names = []
+    for run in runs:
+        names.extend(name for name in run if name not in names)
+    return {name: statistics.median(run.get(name, 0.0) for run in runs) for name in names}
+
+
+def _time(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def run_configuration(spec: TreeSpec, manifest_format: str, repeat: int,
+                      compression: str = BASELINE_COMPRESSION) -> dict:
+    """Benchmark one configuration in this process. Needs the stub installed and the addon loaded."""
+    from node_file_link.serialization import profiling
+    from node_file_link.serialization.node_packager import NodePackager, get_compression_preset
+    from node_file_link.serialization.nodegroup_unpacker import NodeGroupUnpacker
+    from node_file_link.serialization.compact_manifest import decode_manifest
+
+    work_dir = tempfile.mkdtemp(prefix="node_bench_")
+    try:
+        preset = get_compression_preset(compression)
+        sources = write_sources(spec, os.path.join(work_dir, "src"), manifest_format, preset.blend_compress)
+        package_path = os.path.join(work_dir, f"{spec.name}.node")
+
+        export_runs = []
+        for _ in range(repeat):
+            profile = profiling.start_profile('export', package_path)
+            start = time.perf_counter()
+            with profiling.activate(profile):
+                success, message = NodePackager.from_preset(compression).package(package_path, sources)
+            if not success:
+                raise RuntimeError(message)
+            stages = {name: stage.seconds for name, stage in profile.stages.items()}
+            stages['total'] = time.perf_counter() - start
+            export_runs.append(stages)
+
+        import_runs = []
+        for index in range(repeat):
+            unpacker = NodeGroupUnpacker(use_cache=False, verify_hash=True)
+            extract_dir = os.path.join(work_dir, f"extract_{index}")
+            os.makedirs(extract_dir)
+            start = time.perf_counter()
+            prepared = unpacker._prepare_package(package_path, extract_dir, {})
+            elapsed = time.perf_counter() - start
+            if prepared.error:
+                raise RuntimeError(prepared.error)
+            stages = {name: stage.seconds for name, stage in prepared.profile.stages.items()}
+            if preset.blend_compress:
+                stages['blend_decompress'] = sum(_time(_decompress_file, path) for path in prepared.blend_paths)
+                elapsed += stages['blend_decompress']
+            stages['total'] = elapsed
+            import_runs.append(stages)
+            unpacker.cleanup()
+
+        # Manifest parsing on its own, without the zip read around it
+        parse = {}
+        for path in sources:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            if path.endswith('.json'):
+                parse['json'] = min(_time(json.loads, raw) for _ in range(repeat))
+            elif not path.endswith('.blend'):
+                parse['compact'] = min(_time(decode_manifest, raw) for _ in range(repeat))
+
+        package_bytes = os.path.getsize(package_path)
+        export = _median_stages(export_runs)
+        imported = _median_stages(import_runs)
+        return {
+            'spec': spec.to_dict(),
+            'manifest_format': manifest_format,
+            'compression': compression,
+            'repeat': repeat,
+            'package_bytes': package_bytes,
+            'member_bytes': {os.path.basename(path): os.path.getsize(path) for path in sources},
+            'export': export,
+            'import': imported,
+            'parse': parse,
+            'import_mb_per_second': package_bytes / imported['total'] / 1e6 if imported['total'] else None,
+            'nodes_per_second': spec.nodes / imported['total'] if imported['total'] else None,
+            'peak_rss_bytes': _peak_rss_bytes(),
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _decompress_file(path: str):
+    with open(path, 'rb') as f:
+        zlib.decompress(f.read())
+
+
+def _run_worker(payload: str) -> int:
+    bpy_stub.install()
+    bpy_stub.load_addon()
+    job = json.loads(payload)
+    result = run_configuration(TreeSpec.from_dict(job['spec']), job['manifest_format'], job['repeat'],
+                               job['compression'])
+    print(json.dumps(result))
+    return 0
+
+
+def run_isolated(spec: TreeSpec, manifest_format: str, repeat: int, compression: str = BASELINE_COMPRESSION) -> dict:
+    """Run one configuration in a fresh interpreter so its peak RSS is not shared with others."""
+    payload = json.dumps({'spec': spec.to_dict(), 'manifest_format': manifest_format, 'repeat': repeat,
+                          'compression': compression})
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", payload],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{spec.name} ({manifest_format}, {compression}) failed:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _result_key(result: dict) -> tuple:
+    return (result['spec']['name'], result['manifest_format'], result.get('compression', BASELINE_COMPRESSION))
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float) -> List[str]:
+    """Describe every export/import total that is slower than the baseline by more than tolerance."""
+    previous = {_result_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(_result_key(result))
+        if before is None:
+            continue
+        for operation in ('export', 'import'):
+            old, new = before[operation]['total'], result[operation]['total']
+            if old and new > old * (1.0 + tolerance):
+                regressions.append(f"{result['spec']['name']} ({result['manifest_format']}, "
+                                   f"{result.get('compression', BASELINE_COMPRESSION)}) {operation}: "
+                                   f"{old * 1000:.1f} ms -> {new * 1000:.1f} ms (+{(new / old - 1.0) * 100:.0f}%)")
+    return regressions
+
+
+def format_table(results: List[dict]) -> str:
+    header = ("config", "format", "compression", "nodes", "links", "size KB", "export ms", "import ms",
+              "parse ms", "MB/s", "peak RSS MB")
+    rows = [header]
+    for result in results:
+        spec = result['spec']
+        parse = sum(result['parse'].values())
+        rss = result['peak_rss_bytes']
+        rows.append((
+            spec['name'], result['manifest_format'], result.get('compression', BASELINE_COMPRESSION),
+            str(spec['nodes']), str(spec['links']),
+            f"{result['package_bytes'] / 1024:.1f}",
+            f"{result['export']['total'] * 1000:.2f}",
+            f"{result['import']['total'] * 1000:.2f}",
+            f"{parse * 1000:.2f}",
+            f"{result['import_mb_per_second']:.1f}" if result['import_mb_per_second'] else "-",
+            f"{rss / 1e6:.1f}" if rss else "-",
+        ))
+    widths = [max(len(row[column]) for row in rows) for column in range(len(header))]
+    return "\n".join("  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark .node packaging and the bpy-free import stages")
+    parser.add_argument("--preset", action="append", choices=sorted(PRESETS),
+                        help="Configuration to run (repeatable, default: all presets)")
+    parser.add_argument("--nodes", type=int, help="Run a custom configuration with this many nodes instead")
+    parser.add_argument("--links", type=int, help="Links of the custom configuration (default: 1.5 x nodes)")
+    parser.add_argument("--sockets", type=int, default=8, help="Interface sockets of the custom configuration")
+    parser.add_argument("--nested", type=int, default=0, help="Nested groups of the custom configuration")
+    parser.add_argument("--manifest-format", action="append", choices=MANIFEST_FORMATS,
+                        help="Manifest encoding(s) to package (repeatable, default: json)")
+    parser.add_argument("--compression", action="append", choices=COMPRESSIONS,
+                        help=f"Compression preset(s) to package with (repeatable, default: {BASELINE_COMPRESSION})")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration; stage times are medians")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against results previously written with --output")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown against the baseline, as a fraction (default: 0.25)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--worker"]:
+        return _run_worker(argv[1])
+
+    args = build_parser().parse_args(argv)
+    if args.nodes:
+        links = args.links if args.links is not None else args.nodes * 3 // 2
+        specs = [TreeSpec("Custom", nodes=args.nodes, links=links, sockets=args.sockets, nested=args.nested)]
+    else:
+        specs = [PRESETS[name] for name in (args.preset or PRESETS)]
+    formats = args.manifest_format or ['json']
+    compressions = args.compression or [BASELINE_COMPRESSION]
+
+    results = []
+    for spec in specs:
+        for manifest_format in formats:
+            for compression in compressions:
+                results.append(run_isolated(spec, manifest_format, max(args.repeat, 1), compression))
+    print(format_table(results))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
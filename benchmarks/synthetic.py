@@ -0,0 +1,246 @@
+"""Synthetic .node package contents, generated in pure Python.
+
+The manifest has the same shape the serializer writes (interface, nodes with sockets,
+links by socket identifier, layout, dependencies). The .blend member cannot be
+produced without Blender, so it is a deterministic blob of roughly the size and
+compressibility a real file of that many nodes has: a fixed header block plus one
+record per node. For packages whose .blend Blender compresses itself, the blob is
+zlib-compressed as a stand-in for the zstd Blender uses.
+"""
+
+import os
+import json
+import zlib
+import random
+import struct
+import hashlib
+from typing import List
+
+# (bl_idname, type, inputs, outputs, properties); sockets are (identifier, bl_idname, default)
+NODE_TYPES = [
+    ('GeometryNodeSetPosition', 'SET_POSITION',
+     [('Geometry', 'NodeSocketGeometry', None), ('Selection', 'NodeSocketBool', True),
+      ('Position', 'NodeSocketVector', [0.0, 0.0, 0.0]), ('Offset', 'NodeSocketVectorTranslation', [0.0, 0.0, 0.0])],
+     [('Geometry', 'NodeSocketGeometry', None)], {}),
+    ('ShaderNodeMath', 'MATH',
+     [('Value', 'NodeSocketFloat', 0.5), ('Value_001', 'NodeSocketFloat', 0.5), ('Value_002', 'NodeSocketFloat', 0.5)],
+     [('Value', 'NodeSocketFloat', 0.0)], {'operation': 'MULTIPLY'}),
+    ('ShaderNodeVectorMath', 'VECT_MATH',
+     [('Vector', 'NodeSocketVector', [0.0, 0.0, 0.0]), ('Vector_001', 'NodeSocketVector', [0.0, 0.0, 0.0]),
+      ('Scale', 'NodeSocketFloat', 1.0)],
+     [('Vector', 'NodeSocketVector', [0.0, 0.0, 0.0]), ('Value', 'NodeSocketFloat', 0.0)], {'operation': 'ADD'}),
+    ('GeometryNodeInputPosition', 'INPUT_POSITION', [],
+     [('Position', 'NodeSocketVector', [0.0, 0.0, 0.0])], {}),
+    ('GeometryNodeTransform', 'TRANSFORM_GEOMETRY',
+     [('Geometry', 'NodeSocketGeometry', None), ('Translation', 'NodeSocketVectorTranslation', [0.0, 0.0, 0.0]),
+      ('Rotation', 'NodeSocketRotation', [0.0, 0.0, 0.0]), ('Scale', 'NodeSocketVectorXYZ', [1.0, 1.0, 1.0])],
+     [('Geometry', 'NodeSocketGeometry', None)], {}),
+    ('FunctionNodeCompare', 'COMPARE',
+     [('A', 'NodeSocketFloat', 0.0), ('B', 'NodeSocketFloat', 0.0), ('Epsilon', 'NodeSocketFloat', 0.001)],
+     [('Result', 'NodeSocketBool', False)], {'operation': 'GREATER_THAN', 'data_type': 'FLOAT', 'mode': 'ELEMENT'}),
+    ('GeometryNodeStoreNamedAttribute', 'STORE_NAMED_ATTRIBUTE',
+     [('Geometry', 'NodeSocketGeometry', None), ('Selection', 'NodeSocketBool', True),
+      ('Name', 'NodeSocketString', "attribute"), ('Value', 'NodeSocketFloat', 0.0)],
+     [('Geometry', 'NodeSocketGeometry', None)], {'data_type': 'FLOAT', 'domain': 'POINT'}),
+]
+
+_SOCKET_TYPES = {
+    'NodeSocketGeometry': 'GEOMETRY', 'NodeSocketBool': 'BOOLEAN', 'NodeSocketFloat': 'VALUE',
+    'NodeSocketString': 'STRING', 'NodeSocketRotation': 'ROTATION', 'NodeSocketInt': 'INT',
+}
+
+BLEND_HEADER = b"BLENDER-v401"
+BLEND_BASE_SIZE = 60 * 1024
+BLEND_NODE_RECORD = 1024
+# Close to the ratio of Blender's default zstd level on node data
+BLEND_COMPRESS_LEVEL = 3
+
+
+class TreeSpec:
+    """Size of one synthetic node group: total nodes, links, interface sockets and nested groups."""
+
+    def __init__(self, name: str, nodes: int, links: int, sockets: int = 4, nested: int = 0,
+                 nested_nodes: int = 20, seed: int = 0):
+        self.name = name
+        self.nodes = max(nodes, 2)
+        self.links = links
+        self.sockets = max(sockets, 1)
+        self.nested = nested
+        self.nested_nodes = nested_nodes
+        self.seed = seed
+
+    @property
+    def nested_names(self) -> List[str]:
+        return [f"{self.name} Sub {index:03d}" for index in range(self.nested)]
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'nodes': self.nodes, 'links': self.links, 'sockets': self.sockets,
+                'nested': self.nested, 'nested_nodes': self.nested_nodes, 'seed': self.seed}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'TreeSpec':
+        return cls(**data)
+
+
+def _socket(identifier: str, bl_idname: str, default) -> dict:
+    return {
+        'name': identifier.split('_')[0],
+        'identifier': identifier,
+        'type': _SOCKET_TYPES.get(bl_idname, 'VECTOR'),
+        'bl_idname': bl_idname,
+        'enabled': True,
+        'hide': False,
+        'hide_value': False,
+        'default_value': default
+    }
+
+
+def _node(name: str, bl_idname: str, node_type: str, location, inputs, outputs, properties) -> dict:
+    return {
+        'name': name,
+        'label': "",
+        'type': node_type,
+        'bl_idname': bl_idname,
+        'location': [float(location[0]), float(location[1])],
+        'width': 140.0,
+        'height': 100.0,
+        'hide': False,
+        'mute': False,
+        'select': False,
+        'inputs': [_socket(*socket) for socket in inputs],
+        'outputs': [_socket(*socket) for socket in outputs],
+        'properties': dict(properties)
+    }
+
+
+def _interface(spec: TreeSpec) -> dict:
+    inputs, outputs = [], []
+    for index in range(spec.sockets):
+        is_output = index == spec.sockets - 1 or index % 3 == 2
+        item = {
+            'name': f"Socket {index}",
+            'identifier': f"Socket_{index}",
+            'socket_type': 'NodeSocketGeometry' if is_output else 'NodeSocketFloat',
+            'in_out': 'OUTPUT' if is_output else 'INPUT',
+            'description': "",
+            'default_value': None if is_output else 1.0,
+            'attribute_domain': 'POINT'
+        }
+        if not is_output:
+            item.update({'min_value': 0.0, 'max_value': 100.0, 'subtype': 'NONE'})
+        (outputs if is_output else inputs).append(item)
+    return {'inputs': inputs, 'outputs': outputs}
+
+
+def build_manifest(spec: TreeSpec) -> dict:
+    rng = random.Random(spec.seed)
+    interface = _interface(spec)
+
+    nodes = [
+        _node("Group Input", 'NodeGroupInput', 'GROUP_INPUT', (-400.0, 0.0), [],
+              [(item['identifier'], item['socket_type'], item['default_value']) for item in interface['inputs']], {}),
+        _node("Group Output", 'NodeGroupOutput', 'GROUP_OUTPUT', (400.0, 0.0),
+              [(item['identifier'], item['socket_type'], item['default_value']) for item in interface['outputs']], [], {}),
+    ]
+    nested_names = spec.nested_names
+    for index in range(spec.nodes - 2):
+        location = ((index % 40) * 180.0, -(index // 40) * 160.0)
+        if index < len(nested_names):
+            node = _node(f"Group.{index:03d}" if index else "Group", 'GeometryNodeGroup', 'GROUP', location,
+                         [('Socket_0', 'NodeSocketGeometry', None)], [('Socket_1', 'NodeSocketGeometry', None)], {})
+            node['node_tree'] = nested_names[index]
+        else:
+            bl_idname, node_type, inputs, outputs, properties = NODE_TYPES[index % len(NODE_TYPES)]
+            name = f"{node_type.replace('_', ' ').title()}.{index:04d}"
+            node = _node(name, bl_idname, node_type, location, inputs, outputs, properties)
+        nodes.append(node)
+
+    # Random pairs of distinct nodes; the bpy-free stages never validate the graph itself
+    links = []
+    sources = [index for index, node in enumerate(nodes) if node['outputs']]
+    targets = [index for index, node in enumerate(nodes) if node['inputs']]
+    for _ in range(spec.links):
+        from_index = rng.choice(sources)
+        to_index = rng.choice(targets)
+        while to_index == from_index:
+            to_index = rng.choice(targets)
+        from_node, to_node = nodes[from_index], nodes[to_index]
+        links.append({
+            'from_node': from_node['name'],
+            'from_socket': rng.choice(from_node['outputs'])['identifier'],
+            'to_node': to_node['name'],
+            'to_socket': rng.choice(to_node['inputs'])['identifier'],
+            'is_valid': True,
+            'is_muted': False
+        })
+
+    layout = {
+        'frames': [
+            {'name': f"Frame.{index:03d}", 'label': f"Section {index}", 'location': [index * 1000.0, 200.0],
+             'width': 800.0, 'height': 600.0, 'shrink': True, 'text': ""}
+            for index in range(spec.nodes // 50)
+        ],
+        'reroutes': []
+    }
+
+    dependencies = {'node_groups': nested_names, 'materials': [], 'objects': [], 'images': [], 'texts': []}
+    if nested_names:
+        dependencies['subgroups'] = {
+            name: hashlib.sha256(name.encode('utf-8')).hexdigest() for name in nested_names + [spec.name]
+        }
+
+    return {
+        'nodegroup_info': {
+            'name': spec.name,
+            'package_name': spec.name,
+            'description': "Synthetic benchmark tree",
+            'type': 'GeometryNodeTree',
+            'version': "1.0.0",
+            'blender_version': "4.1.0",
+            'export_timestamp': "2025-01-01T00:00:00"
+        },
+        'interface': interface,
+        'nodes': nodes,
+        'links': links,
+        'layout': layout,
+        'dependencies': dependencies
+    }
+
+
+def build_blend_blob(spec: TreeSpec, compressed: bool = False) -> bytes:
+    """Deterministic stand-in for the .blend: zero-padded records with names and float data."""
+    rng = random.Random(spec.seed + 1)
+    parts = [BLEND_HEADER, bytes(BLEND_BASE_SIZE - len(BLEND_HEADER))]
+    total_nodes = spec.nodes + spec.nested * spec.nested_nodes
+    padding = bytes(BLEND_NODE_RECORD - 64 - 32 * 4)
+    for index in range(total_nodes):
+        name = f"Node.{index:06d}".encode('ascii').ljust(64, b'\0')
+        values = struct.pack('<32f', *(rng.uniform(-1000.0, 1000.0) if slot < 8 else 0.0 for slot in range(32)))
+        parts.append(name + values + padding)
+    blob = b''.join(parts)
+    return zlib.compress(blob, BLEND_COMPRESS_LEVEL) if compressed else blob
+
+
+def write_sources(spec: TreeSpec, directory: str, manifest_format: str = 'json',
+                  compress_blend: bool = False) -> List[str]:
+    """Write the members of a package (.blend plus manifest) and return their paths."""
+    from node_file_link.serialization.compact_manifest import COMPACT_MANIFEST_EXT, encode_manifest
+
+    os.makedirs(directory, exist_ok=True)
+    metadata = build_manifest(spec)
+    blend_path = os.path.join(directory, f"{spec.name}.blend")
+    with open(blend_path, 'wb') as f:
+        f.write(build_blend_blob(spec, compress_blend))
+    paths = [blend_path]
+
+    if manifest_format in ('json', 'both'):
+        json_path = os.path.join(directory, f"{spec.name}.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        paths.append(json_path)
+    if manifest_format in ('compact', 'both'):
+        compact_path = os.path.join(directory, f"{spec.name}{COMPACT_MANIFEST_EXT}")
+        with open(compact_path, 'wb') as f:
+            f.write(encode_manifest(metadata))
+        paths.append(compact_path)
+    return paths
@@ -0,0 +1,251 @@
+"""Headless batch export/import of .node packages.
+
+Run inside Blender, passing arguments after ``--``::
+
+    blender -b --python-expr "import runpy; runpy.run_module('bl_ext.user_default.node_file_link.cli', run_name='__main__')" -- export --output-dir out/ scenes/*.blend
+    blender -b --python-expr "..." -- import --target library.blend packages/
+    blender -b --python-expr "..." -- delta old_release/ new_release/ --output-dir patches/
+"""
+
+import bpy
+import os
+import sys
+import json
+import argparse
+from typing import List, Optional
+
+from .serialization.node_exporter import NodeGroupExporter, package_file_name
+from .serialization.nodegroup_unpacker import NodeGroupUnpacker
+from .serialization.nodegroup_serializer import MANIFEST_FORMATS
+from .serialization.node_packager import COMPRESSION_PRESETS, DEFAULT_COMPRESSION
+from .serialization.package_inspector import inspect_package
+from .serialization.delta_package import PATCH_SUFFIX, create_delta_package, default_patch_path
+from .serialization.node_archive import read_package_config
+from .serialization import profiling
+from .log import get_logger, configure
+
+logger = get_logger("cli")
+
+
+def _collect_node_files(paths: List[str]) -> List[str]:
+    node_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                node_files.extend(os.path.join(root, f) for f in sorted(files) if f.lower().endswith('.node'))
+        elif path.lower().endswith('.node'):
+            node_files.append(path)
+        else:
+            logger.warning('Skipping non-.node path: %s', path)
+    return node_files
+
+
+def _exportable_node_groups() -> list:
+    return [
+        ng for ng in bpy.data.node_groups
+        if ng.bl_rna.identifier == 'GeometryNodeTree' and ng.library is None
+    ]
+
+
+def export_blend_files(blend_files: List[str], output_dir: str, force: bool = False,
+                       manifest_format: str = 'json', bundle_dependencies: bool = False,
+                       compression: str = DEFAULT_COMPRESSION, compression_level: Optional[int] = None) -> int:
+    exporter = NodeGroupExporter(force=force, manifest_format=manifest_format,
+                                 bundle_dependencies=bundle_dependencies,
+                                 compression=compression, compression_level=compression_level)
+    exported = skipped = failed = 0
+    # Package path (case-folded for Windows and macOS) -> (blend file, node group) that wrote it
+    sources = {}
+
+    for blend_file in blend_files:
+        logger.debug('Opening %s', blend_file)
+        bpy.ops.wm.open_mainfile(filepath=os.path.abspath(blend_file))
+
+        for node_group in _exportable_node_groups():
+            output_path = os.path.join(output_dir, package_file_name(node_group.name))
+            source = sources.setdefault(output_path.lower(), (blend_file, node_group.name))
+            if source != (blend_file, node_group.name):
+                failed += 1
+                logger.error("❌ %s (%s): %s.node was already written for '%s' from %s, rename one of the groups",
+                             node_group.name, blend_file, output_path, source[1], source[0])
+                continue
+
+            success, message = exporter.export(node_group, output_path)
+            if not success:
+                failed += 1
+                logger.error('❌ %s: %s', node_group.name, message)
+            elif exporter.skipped:
+                skipped += 1
+            else:
+                exported += 1
+            logger.info('%s: %s', node_group.name, message)
+
+    logger.info('Export finished: %s exported, %s unchanged, %s failed', exported, skipped, failed)
+    return 1 if failed else 0
+
+
+def inspect_node_files(paths: List[str]) -> int:
+    node_files = _collect_node_files(paths)
+    if not node_files:
+        logger.error('No .node files found')
+        return 1
+
+    failed = 0
+    for node_file in node_files:
+        try:
+            print(json.dumps(inspect_package(node_file).to_dict(), indent=2))
+        except Exception as e:
+            failed += 1
+            logger.error('%s: %s', node_file, e)
+    return 1 if failed else 0
+
+
+def _delta_pairs(base: str, target: str) -> List[tuple]:
+    if not os.path.isdir(target):
+        return [(base, target)]
+    # Versions of the same package have the same path below both folders
+    return [
+        (os.path.join(base, os.path.relpath(node_file, target)), node_file)
+        for node_file in _collect_node_files([target])
+        if not node_file.lower().endswith(f"{PATCH_SUFFIX}.node")
+    ]
+
+
+def create_delta_files(base: str, target: str, output_dir: Optional[str] = None) -> int:
+    written = unchanged = failed = 0
+    for base_file, target_file in _delta_pairs(base, target):
+        base_config = read_package_config(base_file)
+        if base_config is None:
+            logger.warning('No base version of %s, ship the full package', target_file)
+            failed += 1
+            continue
+        if base_config.get('hash') == (read_package_config(target_file) or {}).get('hash'):
+            unchanged += 1
+            continue
+
+        output_path = None
+        if output_dir:
+            relative = os.path.relpath(target_file, target) if os.path.isdir(target) else os.path.basename(target_file)
+            output_path = default_patch_path(os.path.join(output_dir, relative))
+        success, message = create_delta_package(base_file, target_file, output_path)
+        if success:
+            written += 1
+            logger.info('%s: %s', os.path.basename(target_file), message)
+        else:
+            failed += 1
+            logger.error('❌ %s: %s', os.path.basename(target_file), message)
+
+    logger.info('Delta finished: %s patch(es) written, %s unchanged, %s need the full package', written, unchanged, failed)
+    return 1 if failed else 0
+
+
+def import_node_files(paths: List[str], target_blend: str, node_groups: Optional[List[str]] = None,
+                      link: bool = False, override: bool = False, library_dir: Optional[str] = None) -> int:
+    node_files = _collect_node_files(paths)
+    if not node_files:
+        logger.error('No .node files found')
+        return 1
+
+    if link and not override:
+        logger.warning('Linked node groups are only saved while something uses them; add --override to keep them')
+
+    if os.path.exists(target_blend):
+        bpy.ops.wm.open_mainfile(filepath=os.path.abspath(target_blend))
+    else:
+        bpy.ops.wm.read_homefile(use_empty=True)
+
+    existing = set(bpy.data.node_groups)
+    unpacker = NodeGroupUnpacker(link=link, override=override,
+                                 library_dir=os.path.abspath(library_dir) if library_dir else None)
+    try:
+        if node_groups:
+            success_count, failure_count, error_messages = 0, 0, []
+            for node_file in node_files:
+                success, message = unpacker.unpack_node_file(node_file, node_groups)
+                if success:
+                    success_count += 1
+                else:
+                    failure_count += 1
+                    error_messages.append(f"{os.path.basename(node_file)}: {message}")
+        else:
+            success_count, failure_count, error_messages = unpacker.process_multiple_files(node_files)
+    finally:
+        unpacker.cleanup()
+
+    # Nothing instances the groups in a headless session, keep them alive on save
+    for node_group in bpy.data.node_groups:
+        if node_group not in existing and node_group.library is None:
+            node_group.use_fake_user = True
+
+    bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(target_blend))
+
+    logger.info('Import finished: %s succeeded, %s failed, saved %s', success_count, failure_count, target_blend)
+    for error in error_messages:
+        logger.error('%s', error)
+    return 1 if failure_count else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="node_file_link.cli", description="Batch export/import .node packages")
+    parser.add_argument("--profile-log", help="Append per-stage timings of every export/import to this JSON lines file")
+    parser.add_argument("--verbose", action="store_true", help="Log every file, node group and placement step")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export every geometry node group in .blend files")
+    export_parser.add_argument("blend_files", nargs="+", help=".blend files to export from")
+    export_parser.add_argument("--output-dir", "-o", required=True, help="Directory to write .node packages to")
+    export_parser.add_argument("--force", action="store_true", help="Rewrite packages even if unchanged")
+    export_parser.add_argument("--manifest-format", choices=MANIFEST_FORMATS, default="json",
+                               help="Write the manifest as indented JSON, compact binary, or both")
+    export_parser.add_argument("--bundle-dependencies", action="store_true",
+                               help="Record transitive dependencies and content hashes of nested groups")
+    export_parser.add_argument("--compression", choices=sorted(COMPRESSION_PRESETS), default=DEFAULT_COMPRESSION,
+                               help=f"Where packages are compressed (default: {DEFAULT_COMPRESSION}, see DOCS.md)")
+    export_parser.add_argument("--compression-level", type=int, choices=range(0, 10), metavar="0-9",
+                               help="Deflate level of the zip (default: the preset's own)")
+
+    import_parser = subparsers.add_parser("import", help="Import .node packages into a .blend file")
+    import_parser.add_argument("paths", nargs="+", help=".node files or directories containing them")
+    import_parser.add_argument("--target", "-t", required=True, help=".blend file to import into (created if missing)")
+    import_parser.add_argument("--group", "-g", action="append", dest="node_groups",
+                               help="Only import this node group and the groups it uses (repeatable)")
+    import_parser.add_argument("--link", action="store_true",
+                               help="Link the node groups from a content-addressed library folder instead of appending")
+    import_parser.add_argument("--override", action="store_true", help="With --link, create library overrides")
+    import_parser.add_argument("--library-dir", help="Folder for linked packages (default: the user extension folder)")
+
+    inspect_parser = subparsers.add_parser("inspect", help="List the node groups in .node packages without loading them")
+    inspect_parser.add_argument("paths", nargs="+", help=".node files or directories containing them")
+
+    delta_parser = subparsers.add_parser("delta", help="Write patch packages holding only what changed between versions")
+    delta_parser.add_argument("base", help="Base version: a .node file, or a directory of them")
+    delta_parser.add_argument("target", help="New version: a .node file, or a directory laid out like base")
+    delta_parser.add_argument("--output-dir", "-o", help="Directory to write patches to (default: next to each target)")
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+
+    args = build_parser().parse_args(argv)
+    configure('DEBUG' if args.verbose else 'INFO')
+    if args.profile_log:
+        profiling.set_log_path(os.path.abspath(args.profile_log))
+
+    if args.command == "export":
+        os.makedirs(args.output_dir, exist_ok=True)
+        return export_blend_files(args.blend_files, args.output_dir, args.force,
+                                  args.manifest_format, args.bundle_dependencies,
+                                  args.compression, args.compression_level)
+    if args.command == "inspect":
+        return inspect_node_files(args.paths)
+    if args.command == "delta":
+        return create_delta_files(args.base, args.target, args.output_dir)
+    return import_node_files(args.paths, args.target, args.node_groups,
+                             args.link, args.override, args.library_dir)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""Leveled logging for the addon.
+
+Modules get a child of the addon logger with ``logger = get_logger(__name__)`` and
+log with %-style arguments, so messages below the active level are never formatted::
+
+    logger.debug("Placed %s at %s", node.name, node.location)
+
+The level comes from the addon preferences (WARNING by default), so batch imports
+do not write to Blender's console for every node, file and socket.
+"""
+
+import sys
+import logging
+from typing import Optional
+
+ADDON_PACKAGE = __package__ or "node_file_link"
+DEFAULT_LEVEL = 'WARNING'
+
+# Preference values -> logging levels; OFF silences the addon entirely
+LOG_LEVELS = {
+    'OFF': logging.CRITICAL + 1,
+    'ERROR': logging.ERROR,
+    'WARNING': logging.WARNING,
+    'INFO': logging.INFO,
+    'DEBUG': logging.DEBUG,
+}
+
+_handler = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    if name.startswith(ADDON_PACKAGE + "."):
+        name = name[len(ADDON_PACKAGE) + 1:]
+    return logging.getLogger(ADDON_PACKAGE).getChild(name)
+
+
+def configure(level: Optional[str] = None, stream=None):
+    """Set the addon log level and make sure records reach the console exactly once."""
+    global _handler
+
+    addon_logger = logging.getLogger(ADDON_PACKAGE)
+    if _handler is None:
+        _handler = logging.StreamHandler(stream or sys.stdout)
+        _handler.setFormatter(logging.Formatter("[XWZ] %(levelname)s %(module)s: %(message)s"))
+        addon_logger.addHandler(_handler)
+        # Blender's root logger may have its own handlers; don't print twice
+        addon_logger.propagate = False
+    elif stream is not None:
+        _handler.setStream(stream)
+
+    addon_logger.setLevel(LOG_LEVELS.get(level or DEFAULT_LEVEL, logging.WARNING))
+
+
+def shutdown():
+    global _handler
+    if _handler is not None:
+        logging.getLogger(ADDON_PACKAGE).removeHandler(_handler)
+        _handler = None
@@ -0,0 +1,47 @@
+import bpy
+from bpy.types import Operator
+from ..serialization.structural_hash import NodeGroupDeduplicator
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+
+class MergeDuplicateNodeGroups(Operator):
+    bl_idname = "node.merge_duplicate_nodegroups"
+    bl_label = "Merge Duplicate Node Groups"
+    bl_description = "Replace structurally identical node groups (e.g. 'Group.001') with a single copy and remove the rest"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        try:
+            deduplicator = NodeGroupDeduplicator()
+            removed = deduplicator.deduplicate()
+            
+            if removed == 0:
+                self.report({'INFO'}, "No duplicate node groups found")
+            else:
+                self.report({'INFO'}, f"Merged {removed} duplicate node group(s)")
+            return {'FINISHED'}
+            
+        except Exception as e:
+            self.report({'ERROR'}, f"Merging duplicate node groups failed: {str(e)}")
+            logger.error('Merging duplicate node groups failed: %s', e, exc_info=True)
+            return {'CANCELLED'}
+
+
+def node_editor_menu(self, context):
+    if (hasattr(context.space_data, 'type') and 
+        context.space_data.type == 'NODE_EDITOR'):
+        
+        layout = self.layout
+        layout.operator(MergeDuplicateNodeGroups.bl_idname, icon='AUTOMERGE_ON')
+
+def register():
+    bpy.utils.register_class(MergeDuplicateNodeGroups)
+    if hasattr(bpy.types, 'NODE_MT_node'):
+        bpy.types.NODE_MT_node.append(node_editor_menu)
+
+def unregister():
+    if hasattr(bpy.types, 'NODE_MT_node'):
+        bpy.types.NODE_MT_node.remove(node_editor_menu)
+    bpy.utils.unregister_class(MergeDuplicateNodeGroups)
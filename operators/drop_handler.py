@@ -3,9 +3,31 @@ import os
 from bpy.props import StringProperty, CollectionProperty
 from bpy.types import Operator
 from ..serialization.nodegroup_unpacker import unpack_node_files
+from .import_progress import ModalImportProgress
+from ..preferences import unpacker_options
+from ..log import get_logger
 
+logger = get_logger(__name__)
 
-class NodeDropHandler(Operator):
+# Drops of this many files or more are extracted on worker threads, with progress and Esc to cancel
+BACKGROUND_IMPORT_THRESHOLD = 2
+
+
+def _report_background_import(success_count, error_count, error_messages):
+    summary = f"Imported node groups from {success_count} file(s)"
+    if error_count > 0:
+        summary += f", {error_count} failed"
+    
+    def draw(self, context):
+        self.layout.label(text=summary)
+        for err in error_messages[:10]:
+            self.layout.label(text=err)
+    
+    icon = 'ERROR' if error_count > 0 else 'INFO'
+    bpy.context.window_manager.popup_menu(draw, title="Node File Import", icon=icon)
+
+
+class NodeDropHandler(ModalImportProgress, Operator):
     bl_idname = "node.drop_handler"
     bl_label = "Node Drop Handler"
     bl_description = "Handle dropped .node files and import node groups"
@@ -27,87 +49,143 @@ class NodeDropHandler(Operator):
         self.mouse_x = event.mouse_region_x if hasattr(event, 'mouse_region_x') else 0
         self.mouse_y = event.mouse_region_y if hasattr(event, 'mouse_region_y') else 0
         
-        print(f"Mouse position captured: ({self.mouse_x}, {self.mouse_y})")
+        logger.debug('Mouse position captured: (%s, %s)', self.mouse_x, self.mouse_y)
         
-        return self.execute(context)
-    
-    def execute(self, context):
-        print("=" * 60)
-        print("NODE FILE DROP DETECTED!")
-        print("=" * 60)
+        node_file_paths = self._collect_node_files() if self.directory else []
+        if len(node_file_paths) < BACKGROUND_IMPORT_THRESHOLD:
+            return self.execute(context)
         
-        if not self.directory:
-            print("No directory specified")
-            self.report({'ERROR'}, "No directory specified")
+        try:
+            from ..serialization.nodegroup_unpacker import NodeGroupUnpacker
+            from ..serialization.import_workers import AsyncImportQueue
+            unpacker = NodeGroupUnpacker(**unpacker_options())
+            unpacker.set_mouse_coordinates(self.mouse_x, self.mouse_y)
+            
+            self._import_queue = AsyncImportQueue(unpacker)
+            self._import_queue.capture_context(context)
+            self._import_queue.start(node_file_paths, use_timer=False)
+        except Exception as e:
+            error_msg = f"Error processing .node files: {str(e)}"
+            logger.error('%s', error_msg, exc_info=True)
+            self.report({'ERROR'}, error_msg)
             return {'CANCELLED'}
         
-        print(f"Drop directory: {self.directory}")
+        logger.info('Importing %s .node file(s) in the background', len(node_file_paths))
+        return self._begin_modal_import(context)
+    
+    def _import_step(self, context) -> bool:
+        return self._import_queue.step()
+    
+    def _import_progress(self):
+        return self._import_queue.processed, self._import_queue.total
+    
+    def _import_cancel(self, context):
+        self._import_queue.cancel()
+    
+    def _import_abort(self, context):
+        self._import_queue.abort()
+    
+    def _import_finish(self, context, cancelled: bool) -> set:
+        import_queue = self._import_queue
+        if cancelled:
+            self.report({'WARNING'}, f"Import cancelled: {import_queue.success_count} of {import_queue.total} file(s) imported")
+        elif import_queue.success_count > 0:
+            self.report({'INFO'}, f"Successfully imported node groups from {import_queue.success_count} file(s)")
         
+        if import_queue.failure_count > 0:
+            _report_background_import(import_queue.success_count, import_queue.failure_count, import_queue.error_messages)
+        return {'FINISHED'} if import_queue.success_count > 0 else {'CANCELLED'}
+    
+    def _collect_node_files(self) -> list:
         node_file_paths = []
         other_files = []
         
         for file_elem in self.files:
             filepath = os.path.join(self.directory, file_elem.name)
-            print(f"Dropped file: {file_elem.name}")
+            logger.debug('Dropped file: %s', file_elem.name)
             
             if file_elem.name.lower().endswith('.node'):
                 if os.path.exists(filepath):
                     node_file_paths.append(filepath)
-                    print(f"   Valid .node file: {file_elem.name}")
+                    logger.debug('   Valid .node file: %s', file_elem.name)
                 else:
-                    print(f"   File does not exist: {file_elem.name}")
+                    logger.debug('   File does not exist: %s', file_elem.name)
             else:
                 other_files.append(file_elem.name)
-                print(f"   Not a .node file: {file_elem.name}")
+                logger.debug('   Not a .node file: %s', file_elem.name)
         
-        print("-" * 40)
-        print(f"   Summary:")
-        print(f"   Total files dropped: {len(self.files)}")
-        print(f"   Valid .node files: {len(node_file_paths)}")
-        print(f"   Other files: {len(other_files)}")
+        logger.debug('%s', "-" * 40)
+        logger.debug('   Summary:')
+        logger.debug('   Total files dropped: %s', len(self.files))
+        logger.debug('   Valid .node files: %s', len(node_file_paths))
+        logger.debug('   Other files: %s', len(other_files))
+        return node_file_paths
+    
+    def execute(self, context):
+        logger.debug('%s', "=" * 60)
+        logger.debug('NODE FILE DROP DETECTED!')
+        logger.debug('%s', "=" * 60)
+        
+        if not self.directory:
+            logger.debug('No directory specified')
+            self.report({'ERROR'}, "No directory specified")
+            return {'CANCELLED'}
+        
+        logger.debug('Drop directory: %s', self.directory)
+        node_file_paths = self._collect_node_files()
         
         if not node_file_paths:
             message = "No valid .node files found in drop"
-            print(f"{message}")
+            logger.warning('%s', message)
             self.report({'WARNING'}, message)
             return {'CANCELLED'}
         
-        print("-" * 40)
-        print("Processing .node files...")
+        logger.debug('%s', "-" * 40)
+        logger.debug('Processing .node files...')
         
         try:
             from ..serialization.nodegroup_unpacker import NodeGroupUnpacker
-            unpacker = NodeGroupUnpacker()
+            unpacker = NodeGroupUnpacker(**unpacker_options())
             unpacker.set_mouse_coordinates(self.mouse_x, self.mouse_y)
             
+            if len(node_file_paths) >= BACKGROUND_IMPORT_THRESHOLD:
+                from ..serialization.import_workers import AsyncImportQueue
+                import_queue = AsyncImportQueue(unpacker, on_complete=_report_background_import)
+                import_queue.capture_context(context)
+                import_queue.start(node_file_paths)
+                
+                message = f"Importing {len(node_file_paths)} .node file(s) in the background..."
+                logger.info('%s', message)
+                self.report({'INFO'}, message)
+                logger.debug('%s', "=" * 60)
+                return {'FINISHED'}
+            
             success_count, error_count, error_messages = unpacker.process_multiple_files(node_file_paths)
             
             if success_count > 0:
                 message = f"Successfully imported node groups from {success_count} file(s)"
-                print(f"{message}")
+                logger.info('%s', message)
                 self.report({'INFO'}, message)
                 if error_count > 0:
                     self.report({'WARNING'}, f"{error_count} file(s) failed to process")
-                print("=" * 60)
+                logger.debug('%s', "=" * 60)
                 return {'FINISHED'}
             else:
                 message = "No files were successfully processed"
-                print(f"{message}")
+                logger.error('%s', message)
                 if error_messages:
-                    print("Errors:")
+                    logger.error('Errors:')
                     for err in error_messages:
-                        print(f"  • {err}")
+                        logger.error('  • %s', err)
                 self.report({'ERROR'}, message)
-                print("=" * 60)
+                logger.debug('%s', "=" * 60)
                 return {'CANCELLED'}
                 
         except Exception as e:
             error_msg = f"Error processing .node files: {str(e)}"
-            print(f"{error_msg}")
-            import traceback
-            traceback.print_exc()
+            logger.error('%s', error_msg, exc_info=True)
             self.report({'ERROR'}, error_msg)
-            print("=" * 60)
+            logger.debug('%s', "=" * 60)
             return {'CANCELLED'}
 
 
@@ -119,16 +197,16 @@ class NODE_FH_drop_handler(bpy.types.FileHandler):
 
     @classmethod
     def poll_drop(cls, context):
-        print(f"Drop poll check - Area: {context.area.type if context.area else 'None'}")
+        logger.debug('Drop poll check - Area: %s', context.area.type if context.area else 'None')
         return True
 
 
 def register():
     bpy.utils.register_class(NodeDropHandler)
     bpy.utils.register_class(NODE_FH_drop_handler)
-    print("Node drop handler registered")
+    logger.debug('Node drop handler registered')
 
 def unregister():
     bpy.utils.unregister_class(NODE_FH_drop_handler)
     bpy.utils.unregister_class(NodeDropHandler)
-    print("Node drop handler unregistered")
+    logger.debug('Node drop handler unregistered')
@@ -1,12 +1,13 @@
 import bpy
 import os
-import tempfile
-import shutil
-import subprocess
-from bpy.props import StringProperty
+from bpy.props import StringProperty, BoolProperty, EnumProperty, IntProperty
 from bpy.types import Operator
 from bpy_extras.io_utils import ExportHelper
-from ..serialization.nodegroup_serializer import NodeGroupSerializer
+from ..serialization.node_exporter import NodeGroupExporter, package_file_name
+from ..serialization.node_packager import COMPRESSION_PRESETS, DEFAULT_COMPRESSION
+from ..log import get_logger
+
+logger = get_logger(__name__)
 
 class ExportNodeGroup(Operator, ExportHelper):
     bl_idname = "node.export_nodegroup"
@@ -22,6 +23,47 @@ class ExportNodeGroup(Operator, ExportHelper):
         maxlen=255,
     )
     
+    force_export: BoolProperty(
+        name="Force Re-export",
+        description="Rewrite the package even if the node group is unchanged since the last export",
+        default=False,
+    )
+    
+    manifest_format: EnumProperty(
+        name="Manifest Format",
+        description="Encoding of the node graph manifest stored next to the .blend",
+        items=[
+            ('json', "JSON", "Indented JSON, human readable"),
+            ('compact', "Compact", "Binary manifest with interned strings and packed floats, smaller and faster to load"),
+            ('both', "Both", "Write both encodings; readers prefer the compact one"),
+        ],
+        default='json',
+    )
+    
+    bundle_dependencies: BoolProperty(
+        name="Bundle Dependencies",
+        description="Record every nested group, material, object, image and text, with content hashes "
+                    "so importing reuses nested groups that are already in the file",
+        default=False,
+    )
+    
+    compression: EnumProperty(
+        name="Compression",
+        description="Whether the .blend is compressed by Blender or by the zip. Compressing once keeps imports fast",
+        items=[(name, name.title() if name != 'lzma' else "LZMA", preset.description)
+               for name, preset in COMPRESSION_PRESETS.items()],
+        default=DEFAULT_COMPRESSION,
+    )
+    
+    compression_level: IntProperty(
+        name="Deflate Level",
+        description="Zip compression level of the Deflate preset. Higher is smaller and slower to export, "
+                    "imports are about as fast at any level",
+        default=6,
+        min=1,
+        max=9,
+    )
+    
     @classmethod
     def poll(cls, context):
         if context.space_data.type != 'NODE_EDITOR':
@@ -38,7 +80,7 @@ class ExportNodeGroup(Operator, ExportHelper):
     def invoke(self, context, event):
         node_group_to_export = self._get_node_group_to_export(context)
         if node_group_to_export:
-            default_name = node_group_to_export.name.replace(" ", "_")
+            default_name = package_file_name(node_group_to_export.name)
             self.filepath = default_name + ".node"
         
         context.window_manager.fileselect_add(self)
@@ -68,7 +110,7 @@ class ExportNodeGroup(Operator, ExportHelper):
             output_path = self.filepath
             
             if not output_path or output_path.strip() == "" or output_path == "untitled":
-                default_name = node_tree.name.replace(" ", "_")
+                default_name = package_file_name(node_tree.name)
                 self.filepath = default_name + ".node"
                 context.window_manager.fileselect_add(self)
                 return {'RUNNING_MODAL'}
@@ -81,9 +123,9 @@ class ExportNodeGroup(Operator, ExportHelper):
                 output_path = output_path[:-5]
             
             if not output_path or os.path.basename(output_path).strip() == "":
-                default_name = node_tree.name.replace(" ", "_")
+                default_name = package_file_name(node_tree.name)
                 output_path = os.path.join(os.path.dirname(output_path) if output_path else os.getcwd(), default_name)
-                print(f"Using fallback output path: {output_path}")
+                logger.debug('Using fallback output path: %s', output_path)
             
             final_output_path = output_path
             if not final_output_path.strip():
@@ -92,114 +134,22 @@ class ExportNodeGroup(Operator, ExportHelper):
             
             package_name = os.path.basename(final_output_path)
             if not package_name:
-                package_name = node_tree.name.replace(" ", "_")
+                package_name = package_file_name(node_tree.name)
             
-            temp_dir = tempfile.mkdtemp(prefix="nodegroup_export_")
-            print(f"Created temp directory: {temp_dir}")
+            level = self.compression_level if self.compression == 'deflate' else None
+            exporter = NodeGroupExporter(force=self.force_export, manifest_format=self.manifest_format,
+                                         bundle_dependencies=self.bundle_dependencies,
+                                         compression=self.compression, compression_level=level)
             
-            try:
-                serializer = NodeGroupSerializer()
-                
-                self.report({'INFO'}, f"Serializing node group '{node_tree.name}' as '{package_name}'...")
-                print(f"Serializing node group data for: {node_tree.name} with package name: {package_name}")
-                success = serializer.serialize_nodegroup(node_tree, temp_dir, package_name)
-                
-                if not success:
-                    self.report({'ERROR'}, "Failed to serialize node group")
-                    return {'CANCELLED'}
-                
-                print(f"Serialization completed. Temp dir contents: {os.listdir(temp_dir)}")
-                
-                addon_dir = os.path.dirname(os.path.dirname(__file__))
-                package_script = os.path.join(addon_dir, "serialization", "package.bat")
-                
-                if not os.path.exists(package_script):
-                    self.report({'ERROR'}, f"Package script not found: {package_script}")
-                    return {'CANCELLED'}
-                
-                self.report({'INFO'}, "Packaging node group...")
-                
-                original_cwd = os.getcwd()
-                os.chdir(temp_dir)
-                
-                try:
-                    files_to_package = []
-                    for item in os.listdir(temp_dir):
-                        if os.path.isfile(item) or os.path.isdir(item):
-                            files_to_package.append(item)
-                    
-                    if not files_to_package:
-                        self.report({'ERROR'}, "No files to package")
-                        return {'CANCELLED'}
-                    
-                    output_name = package_name  # Use the package name consistently
-                    print(f"Output path: {final_output_path}")
-                    print(f"Output name: {output_name}")
-                    print(f"Files to package: {files_to_package}")
-                    
-                    if not output_name:
-                        output_name = node_tree.name.replace(" ", "_")
-                        print(f"Using node tree name as output: {output_name}")
-                    
-                    cmd = [package_script, output_name] + files_to_package
-                    
-                    formatted_args = [f'"{arg}"' if ' ' in arg else arg for arg in cmd]
-                    print(f"Full command being executed: {' '.join(formatted_args)}")
-                    
-                    result = subprocess.run(cmd, capture_output=True, text=True, shell=False, cwd=temp_dir)
-                    
-                    print(f"Package command: {' '.join(cmd)}")
-                    print(f"Return code: {result.returncode}")
-                    print(f"STDOUT: {result.stdout}")
-                    print(f"STDERR: {result.stderr}")
-                    
-                    if result.returncode == 0:
-                        temp_node_file = os.path.join(temp_dir, f"{output_name}.node")
-                        final_node_file = f"{final_output_path}.node"
-                        
-                        print(f"Looking for temp file: {temp_node_file}")
-                        print(f"Target final file: {final_node_file}")
-                        print(f"Output path variable: '{final_output_path}'")
-                        print(f"Output name variable: '{output_name}'")
-                        
-                        if not os.path.exists(temp_node_file):
-                            temp_files = [f for f in os.listdir(temp_dir) if f.endswith('.node')]
-                            print(f"Available .node files in temp dir: {temp_files}")
-                            
-                            if temp_files:
-                                temp_node_file = os.path.join(temp_dir, temp_files[0])
-                                print(f"Using found file: {temp_node_file}")
-                            else:
-                                self.report({'ERROR'}, "No .node package file was created by the packaging script")
-                                return {'CANCELLED'}
-                        
-                        if os.path.exists(temp_node_file):
-                            target_dir = os.path.dirname(final_node_file)
-                            if target_dir:  # Only create directory if there's a path
-                                os.makedirs(target_dir, exist_ok=True)
-                            
-                            print(f"Moving from: {temp_node_file}")
-                            print(f"Moving to: {final_node_file}")
-                            
-                            shutil.move(temp_node_file, final_node_file)
-                            
-                            self.report({'INFO'}, f"Successfully exported node group to: {final_node_file}")
-                            return {'FINISHED'}
-                        else:
-                            self.report({'ERROR'}, "Package file was not created")
-                            return {'CANCELLED'}
-                    else:
-                        self.report({'ERROR'}, f"Packaging failed: {result.stderr}")
-                        return {'CANCELLED'}
-                        
-                finally:
-                    os.chdir(original_cwd)
-                    
-            finally:
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception as e:
-                    print(f"Warning: Failed to clean up temp directory: {e}")
+            self.report({'INFO'}, f"Serializing node group '{node_tree.name}' as '{package_name}'...")
+            success, message = exporter.export(node_tree, final_output_path, package_name)
+            
+            if not success:
+                self.report({'ERROR'}, message)
+                return {'CANCELLED'}
+            
+            self.report({'INFO'}, message)
+            return {'FINISHED'}
                     
         except Exception as e:
             self.report({'ERROR'}, f"Export failed: {str(e)}")
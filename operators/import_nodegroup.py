@@ -1,19 +1,35 @@
 import bpy
 import os
-import json
-import tempfile
-import zipfile
+import time
 from bpy.props import StringProperty, CollectionProperty
 from bpy.types import Operator
 from bpy_extras.io_utils import ImportHelper
-from mathutils import Vector, Color, Euler
+from ..serialization.node_archive import NodeArchive
+from ..serialization.nodegroup_unpacker import NodeGroupUnpacker
+from ..serialization.link_builder import build_links
+from ..serialization.node_builder import build_nodes
+from ..serialization.manifest_schema import ManifestSchemaError, validate_manifest
+from ..serialization.structural_hash import deduplicate_node_groups
+from ..serialization import profiling
+from .import_progress import ModalImportProgress
+from ..log import get_logger
 
-class ImportNodeGroup(Operator, ImportHelper):
+logger = get_logger(__name__)
+
+
+def _is_node_type(bl_idname: str) -> bool:
+    return isinstance(getattr(bpy.types, bl_idname, None), type)
+
+
+class ImportNodeGroup(ModalImportProgress, Operator, ImportHelper):
     bl_idname = "node.import_nodegroup"
     bl_label = "Import Node Group"
     bl_description = "Import a .node file into Blender"
     bl_options = {'REGISTER', 'UNDO'}
     
+    # Main-thread time per modal step; at least one file is imported per step
+    STEP_BUDGET = 0.05
+    
     filename_ext = ".node"
     filter_glob: StringProperty(
         default="*.node",
@@ -46,8 +62,7 @@ class ImportNodeGroup(Operator, ImportHelper):
                 
         except Exception as e:
             self.report({'ERROR'}, f"Import failed: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error('Import failed: %s', e, exc_info=True)
             return {'CANCELLED'}
     
     def invoke(self, context, event):
@@ -62,26 +77,58 @@ class ImportNodeGroup(Operator, ImportHelper):
             self.report({'ERROR'}, "No directory specified")
             return {'CANCELLED'}
         
-        imported_count = 0
-        failed_count = 0
+        self._file_paths = [
+            os.path.join(self.directory, file_elem.name) for file_elem in self.files
+            if file_elem.name.lower().endswith('.node')
+        ]
+        self._next_file = 0
+        self._imported_count = 0
+        self._failed_count = 0
         
-        for file_elem in self.files:
-            if file_elem.name.lower().endswith('.node'):
-                filepath = os.path.join(self.directory, file_elem.name)
-                try:
-                    success = self._import_node_file(context, filepath)
-                    if success:
-                        imported_count += 1
-                    else:
-                        failed_count += 1
-                except Exception as e:
-                    print(f"Failed to import {filepath}: {e}")
-                    failed_count += 1
+        # Scripts and background mode have no event loop to drive a modal operator
+        if bpy.app.background or context.window is None:
+            while self._import_step(context):
+                pass
+            return self._import_finish(context, False)
+        return self._begin_modal_import(context)
+    
+    def _import_step(self, context) -> bool:
+        deadline = time.perf_counter() + self.STEP_BUDGET
+        while self._next_file < len(self._file_paths):
+            filepath = self._file_paths[self._next_file]
+            self._next_file += 1
+            try:
+                success = self._import_node_file(context, filepath)
+                if success:
+                    self._imported_count += 1
+                else:
+                    self._failed_count += 1
+            except Exception as e:
+                logger.error('Failed to import %s: %s', filepath, e)
+                self._failed_count += 1
+            if time.perf_counter() >= deadline:
+                break
+        return self._next_file < len(self._file_paths)
+    
+    def _import_progress(self):
+        return self._next_file, len(self._file_paths)
+    
+    def _import_cancel(self, context):
+        # Files already imported stay; the rest are skipped
+        self._file_paths = self._file_paths[:self._next_file]
+    
+    def _import_abort(self, context):
+        self._import_cancel(context)
+    
+    def _import_finish(self, context, cancelled: bool) -> set:
+        if cancelled:
+            self.report({'WARNING'}, f"Import cancelled after {self._imported_count} node group(s)")
+            return {'FINISHED'} if self._imported_count > 0 else {'CANCELLED'}
         
-        if imported_count > 0:
-            self.report({'INFO'}, f"Successfully imported {imported_count} node group(s)")
-            if failed_count > 0:
-                self.report({'WARNING'}, f"{failed_count} file(s) failed to import")
+        if self._imported_count > 0:
+            self.report({'INFO'}, f"Successfully imported {self._imported_count} node group(s)")
+            if self._failed_count > 0:
+                self.report({'WARNING'}, f"{self._failed_count} file(s) failed to import")
             return {'FINISHED'}
         else:
             self.report({'ERROR'}, "No files were successfully imported")
@@ -103,37 +150,48 @@ class ImportNodeGroup(Operator, ImportHelper):
     
     def _import_node_file(self, context, filepath):
         try:
-            temp_dir = tempfile.mkdtemp(prefix="nodegroup_import_")
-            
-            try:
-                with zipfile.ZipFile(filepath, 'r') as zip_file:
-                    zip_file.extractall(temp_dir)
+            with profiling.profile('import', filepath) as import_profile:
+                with NodeArchive(filepath) as archive:
+                    is_patch = bool(archive.delta_names)
+                    metadata = None if is_patch else archive.read_manifest()
                 
-                json_files = [f for f in os.listdir(temp_dir) if f.endswith('.json')]
-                if not json_files:
-                    print("No JSON metadata file found in .node package")
-                    return False
+                if is_patch:
+                    # Patches update a group already in the file (or the import cache) instead of building one
+                    return self._apply_patch_package(filepath)
                 
-                json_path = os.path.join(temp_dir, json_files[0])
-                
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                
-                return self._reconstruct_node_group(context, metadata, temp_dir)
+                if metadata is None:
+                    import_profile.error = "No manifest found"
+                    logger.warning('No manifest found in .node package')
+                    return False
                 
-            finally:
-                import shutil
+                # Reject the package before any node group exists, so nothing needs cleaning up
                 try:
-                    shutil.rmtree(temp_dir)
-                except Exception as e:
-                    print(f"Warning: Failed to clean up temp directory: {e}")
+                    with profiling.stage('validate_manifest'):
+                        validate_manifest(metadata, known_node_type=_is_node_type)
+                except ManifestSchemaError as e:
+                    import_profile.error = str(e)
+                    logger.error('%s: %s', os.path.basename(filepath), e)
+                    return False
+                
+                success = self._reconstruct_node_group(context, metadata, None)
+                if not success:
+                    import_profile.error = "Reconstruction failed"
+                return success
                     
         except Exception as e:
-            print(f"Error importing node file {filepath}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error('Error importing node file %s: %s', filepath, e, exc_info=True)
             return False
     
+    def _apply_patch_package(self, filepath):
+        unpacker = NodeGroupUnpacker()
+        try:
+            success, message = unpacker.unpack_node_file(filepath)
+        finally:
+            unpacker.cleanup()
+        if not success:
+            logger.error('%s: %s', os.path.basename(filepath), message)
+        return success
+    
     def _reconstruct_node_group(self, context, metadata, temp_dir):
         """Reconstruct node group from metadata"""
         try:
@@ -145,15 +203,22 @@ class ImportNodeGroup(Operator, ImportHelper):
             
             node_group = bpy.data.node_groups.new(name=node_group_name, type='GeometryNodeTree')
             
-            print(f"Created node group: {node_group_name}")
+            logger.info('Created node group: %s', node_group_name)
             
             node_group.nodes.clear()
             
             self._reconstruct_interface(node_group, metadata.get('interface', {}))
             
-            node_map = self._reconstruct_nodes(node_group, metadata.get('nodes', []))
+            with profiling.stage('reconstruct_nodes'):
+                node_map = self._reconstruct_nodes(node_group, metadata.get('nodes', []))
+            
+            with profiling.stage('reconstruct_links'):
+                self._reconstruct_links(node_group, metadata.get('links', []), node_map)
             
-            self._reconstruct_links(node_group, metadata.get('links', []), node_map)
+            remapped = deduplicate_node_groups([node_group])
+            if node_group_name in remapped:
+                node_group_name = remapped[node_group_name]
+                node_group = bpy.data.node_groups[node_group_name]
             
             if (context.space_data and 
                 hasattr(context.space_data, 'type') and 
@@ -176,13 +241,11 @@ class ImportNodeGroup(Operator, ImportHelper):
                     group_node.select = True
                     context.space_data.node_tree.nodes.active = group_node
             
-            print(f"Successfully reconstructed node group: {node_group_name}")
+            logger.info('Successfully reconstructed node group: %s', node_group_name)
             return True
             
         except Exception as e:
-            print(f"Error reconstructing node group: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error('Error reconstructing node group: %s', e, exc_info=True)
             return False
     
     def _get_unique_name(self, base_name):
@@ -212,7 +275,7 @@ class ImportNodeGroup(Operator, ImportHelper):
                     try:
                         socket.default_value = default_value
                     except Exception as e:
-                        print(f"Could not set default value for input {socket.name}: {e}")
+                        logger.warning('Could not set default value for input %s: %s', socket.name, e)
             
             for output_data in interface_data.get('outputs', []):
                 socket_type = output_data.get('socket_type', 'NodeSocketGeometry')
@@ -223,84 +286,17 @@ class ImportNodeGroup(Operator, ImportHelper):
                 )
         
         except Exception as e:
-            print(f"Error reconstructing interface: {e}")
+            logger.error('Error reconstructing interface: %s', e)
     
     def _reconstruct_nodes(self, node_group, nodes_data):
-        node_map = {}
-        
-        for node_data in nodes_data:
-            try:
-                node_type = node_data.get('bl_idname', node_data.get('type', 'GeometryNodeGroup'))
-                node = node_group.nodes.new(type=node_type)
-                
-                node.name = node_data.get('name', node.name)
-                node.label = node_data.get('label', '')
-                node.location = Vector(node_data.get('location', [0, 0]))
-                node.width = node_data.get('width', node.width)
-                node.height = node_data.get('height', node.height)
-                node.hide = node_data.get('hide', False)
-                node.mute = node_data.get('mute', False)
-                
-                properties = node_data.get('properties', {})
-                for prop_name, prop_value in properties.items():
-                    if hasattr(node, prop_name):
-                        try:
-                            setattr(node, prop_name, prop_value)
-                        except Exception as e:
-                            print(f"Could not set property {prop_name} on node {node.name}: {e}")
-                
-                inputs_data = node_data.get('inputs', [])
-                for i, input_data in enumerate(inputs_data):
-                    if i < len(node.inputs):
-                        socket = node.inputs[i]
-                        default_value = input_data.get('default_value')
-                        if default_value is not None and hasattr(socket, 'default_value'):
-                            try:
-                                socket.default_value = default_value
-                            except Exception as e:
-                                print(f"Could not set default value for socket {socket.name}: {e}")
-                
-                node_map[node_data.get('name')] = node
-                
-            except Exception as e:
-                print(f"Error creating node {node_data.get('name', 'Unknown')}: {e}")
-        
-        return node_map
+        return build_nodes(node_group, nodes_data).nodes_by_name
     
     def _reconstruct_links(self, node_group, links_data, node_map):
-        for link_data in links_data:
-            try:
-                from_node_name = link_data.get('from_node')
-                to_node_name = link_data.get('to_node')
-                from_socket_id = link_data.get('from_socket')
-                to_socket_id = link_data.get('to_socket')
-                
-                from_node = node_map.get(from_node_name)
-                to_node = node_map.get(to_node_name)
-                
-                if not from_node or not to_node:
-                    print(f"Could not find nodes for link: {from_node_name} -> {to_node_name}")
-                    continue
-                
-                from_socket = None
-                for socket in from_node.outputs:
-                    if socket.identifier == from_socket_id:
-                        from_socket = socket
-                        break
-                
-                to_socket = None
-                for socket in to_node.inputs:
-                    if socket.identifier == to_socket_id:
-                        to_socket = socket
-                        break
-                
-                if from_socket and to_socket:
-                    node_group.links.new(from_socket, to_socket)
-                else:
-                    print(f"Could not find sockets for link: {from_socket_id} -> {to_socket_id}")
-                    
-            except Exception as e:
-                print(f"Error creating link: {e}")
+        build_links(node_group, node_map, (
+            (link_data.get('from_node'), link_data.get('from_socket'),
+             link_data.get('to_node'), link_data.get('to_socket'))
+            for link_data in links_data
+        ))
 
 
 class NODE_FH_import_nodegroup(bpy.types.FileHandler):
@@ -0,0 +1,85 @@
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+
+class ModalImportProgress:
+    """Mixin for import operators that do their work in small steps from a modal timer.
+
+    The operator implements these hooks:
+
+    - _import_step(context) -> bool: one bounded piece of main-thread work, True while work remains
+    - _import_progress() -> (done, total)
+    - _import_cancel(context): Esc was pressed; stop and finish what is loaded
+    - _import_abort(context): Blender cancelled the operator; stop without touching scene data
+    - _import_finish(context, cancelled) -> set: the operator's return value
+
+    The mixin drives the timer, reports progress in the status bar through
+    window_manager.progress_update and cancels on Esc. Other events pass through, so
+    the UI stays usable meanwhile. It is a plain mixin rather than an ABC, because
+    ABCMeta conflicts with the metaclass of bpy.types.Operator.
+    """
+
+    TIMER_INTERVAL = 0.05
+
+    _timer = None
+    _cancelling = False
+
+    def _begin_modal_import(self, context):
+        wm = context.window_manager
+        _, total = self._import_progress()
+        self._cancelling = False
+        self._timer = wm.event_timer_add(self.TIMER_INTERVAL, window=context.window)
+        wm.progress_begin(0, max(total, 1))
+        wm.modal_handler_add(self)
+        self._update_status(context)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC' and event.value == 'PRESS' and not self._cancelling:
+            self._cancelling = True
+            self._import_cancel(context)
+            self._update_status(context)
+            return {'RUNNING_MODAL'}
+
+        if event.type != 'TIMER' or event.timer is not self._timer:
+            return {'PASS_THROUGH'}
+
+        try:
+            running = self._import_step(context)
+        except Exception as e:
+            logger.error('Import step failed: %s', e, exc_info=True)
+            self.report({'ERROR'}, f"Import failed: {str(e)}")
+            running = False
+
+        self._update_status(context)
+        if running:
+            return {'PASS_THROUGH'}
+
+        self._end_modal_import(context)
+        return self._import_finish(context, self._cancelling)
+
+    def cancel(self, context):
+        # Called by Blender when the window closes or another file is loaded mid-import
+        self._cancelling = True
+        self._import_abort(context)
+        self._end_modal_import(context)
+
+    def _update_status(self, context):
+        done, total = self._import_progress()
+        context.window_manager.progress_update(done)
+        if self._cancelling:
+            text = f"Cancelling .node import ({done}/{total} processed)..."
+        else:
+            text = f"Importing .node files: {done}/{total} (Esc to cancel)"
+        if context.workspace is not None:
+            context.workspace.status_text_set(text)
+
+    def _end_modal_import(self, context):
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
+        if context.workspace is not None:
+            context.workspace.status_text_set(None)
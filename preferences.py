@@ -0,0 +1,104 @@
+import bpy
+from bpy.props import EnumProperty, IntProperty, StringProperty
+from bpy.types import AddonPreferences
+
+from . import log
+from .serialization import import_cache
+
+
+def _update_log_level(self, context):
+    log.configure(self.log_level)
+
+
+def _apply_cache_size(preferences):
+    import_cache.set_cache_limit(preferences.cache_size_mb * 1024 * 1024 if preferences.cache_size_mb else None)
+
+
+def _update_cache_size(self, context):
+    _apply_cache_size(self)
+
+
+class NodeFileLinkPreferences(AddonPreferences):
+    bl_idname = __package__
+    
+    log_level: EnumProperty(
+        name="Console Logging",
+        description="How much the addon writes to the system console. Lower levels keep large batch imports fast",
+        items=[
+            ('OFF', "Off", "Do not write to the console"),
+            ('ERROR', "Errors", "Only failed imports and exports"),
+            ('WARNING', "Warnings", "Errors and recoverable problems"),
+            ('INFO', "Info", "One line per imported or exported package"),
+            ('DEBUG', "Debug", "Every file, node group and placement step"),
+        ],
+        default=log.DEFAULT_LEVEL,
+        update=_update_log_level,
+    )
+    
+    import_mode: EnumProperty(
+        name="Drop Import Mode",
+        description="How dropped .node packages are brought into the file",
+        items=[
+            ('APPEND', "Append", "Copy the node groups into the file"),
+            ('LINK', "Link", "Link the node groups from the library folder; files stay small and share one copy"),
+            ('OVERRIDE', "Link with Override", "Link, then create editable library overrides of the imported groups"),
+        ],
+        default='APPEND',
+    )
+    
+    library_dir: StringProperty(
+        name="Linked Library Folder",
+        description="Where linked packages are extracted, one folder per content hash. "
+                    "Use a shared folder so every machine resolves the same paths. Empty uses the user extension folder",
+        subtype='DIR_PATH',
+        default="",
+    )
+    
+    cache_size_mb: IntProperty(
+        name="Import Cache Size (MB)",
+        description="Extracted packages are kept for reuse until the cache grows past this size, "
+                    "then the least recently used are removed. 0 keeps everything",
+        default=import_cache.DEFAULT_CACHE_LIMIT // (1024 * 1024),
+        min=0,
+        update=_update_cache_size,
+    )
+    
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "log_level")
+        layout.prop(self, "import_mode")
+        row = layout.row()
+        row.enabled = self.import_mode != 'APPEND'
+        row.prop(self, "library_dir")
+        layout.prop(self, "cache_size_mb")
+
+
+def get_preferences():
+    addon = bpy.context.preferences.addons.get(__package__)
+    return addon.preferences if addon else None
+
+
+def unpacker_options() -> dict:
+    """NodeGroupUnpacker keyword arguments for the import mode chosen in the preferences."""
+    preferences = get_preferences()
+    if preferences is None or preferences.import_mode == 'APPEND':
+        return {}
+    return {
+        'link': True,
+        'override': preferences.import_mode == 'OVERRIDE',
+        'library_dir': bpy.path.abspath(preferences.library_dir) if preferences.library_dir else None,
+    }
+
+
+def register():
+    bpy.utils.register_class(NodeFileLinkPreferences)
+    preferences = get_preferences()
+    log.configure(preferences.log_level if preferences else None)
+    if preferences:
+        _apply_cache_size(preferences)
+    library_dir = preferences.library_dir if preferences else ""
+    import_cache.startup_cleanup(bpy.path.abspath(library_dir) if library_dir else None)
+
+def unregister():
+    bpy.utils.unregister_class(NodeFileLinkPreferences)
+    log.shutdown()
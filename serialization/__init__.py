@@ -1,4 +1,10 @@
 from .nodegroup_serializer import NodeGroupSerializer
 from .nodegroup_unpacker import NodeGroupUnpacker, unpack_node_files
+from .node_packager import NodePackager, package_node_files
+from .library_index import LibraryIndexer, LibraryCatalog, index_library
+from .package_inspector import PackageContents, inspect_package
+from .delta_package import create_delta_package
 
-__all__ = ['NodeGroupSerializer', 'NodeGroupUnpacker', 'unpack_node_files']
+__all__ = ['NodeGroupSerializer', 'NodeGroupUnpacker', 'unpack_node_files', 'NodePackager', 'package_node_files',
+           'LibraryIndexer', 'LibraryCatalog', 'index_library', 'PackageContents', 'inspect_package',
+           'create_delta_package']
@@ -0,0 +1,402 @@
+"""Compact binary encoding of the package manifest.
+
+Layout (little endian)::
+
+    magic 'NMB1'
+    string table   varint count, then varint length + UTF-8 bytes per string
+    section table  varint count, then (varint key, u32 offset, u32 length) per top-level key
+    section blobs  one encoded value per top-level key
+
+Every string (keys, bl_idnames, socket identifiers, names...) is stored once in the
+string table and referenced by index. Lists made only of floats are stored as packed
+float32 arrays when that is lossless, which covers locations and vector defaults
+coming from RNA. Lists of dicts sharing the same keys (nodes, sockets, links) are
+stored column by column, so string, bool and number columns decode in bulk. Socket
+lists nested in every node are flattened into one table for the whole section. Each
+top-level section can be decoded on its own with read_section.
+"""
+
+import struct
+from itertools import accumulate
+from typing import Optional
+
+COMPACT_MANIFEST_EXT = '.nmb'
+MAGIC = b'NMB1'
+
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT, _FLOAT32_ARRAY, _FLOAT64_ARRAY, _RECORDS = range(11)
+
+# Column encodings inside a _RECORDS table
+(_COL_GENERIC, _COL_STR, _COL_BOOL, _COL_FLOAT32, _COL_FLOAT64, _COL_INT,
+ _COL_SPARSE, _COL_NESTED_RECORDS, _COL_FLOAT_VECTORS, _COL_UNION, _COL_NONE) = range(11)
+
+_F64 = struct.Struct('<d')
+_U32 = struct.Struct('<I')
+
+
+class CompactManifestError(ValueError):
+    pass
+
+
+def _write_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos: int):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _is_float32_exact(value: float) -> bool:
+    try:
+        return struct.unpack('<f', struct.pack('<f', value))[0] == value
+    except OverflowError:
+        # Beyond the float32 range
+        return False
+
+
+class _Encoder:
+    def __init__(self):
+        self.strings = []
+        self._string_index = {}
+
+    def intern(self, text: str) -> int:
+        index = self._string_index.get(text)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(text)
+            self._string_index[text] = index
+        return index
+
+    def encode(self, out: bytearray, value):
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            # Zigzag without a fixed width, so ints of any size round-trip
+            _write_varint(out, -2 * value - 1 if value < 0 else value << 1)
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _F64.pack(value)
+        elif isinstance(value, str):
+            out.append(_STR)
+            _write_varint(out, self.intern(value))
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                _write_varint(out, self.intern(str(key)))
+                self.encode(out, item)
+        elif isinstance(value, (list, tuple)):
+            if len(value) > 1 and self._is_record_list(value):
+                self._encode_records(out, value)
+            elif value and all(type(item) is float for item in value):
+                exact = all(_is_float32_exact(item) for item in value)
+                out.append(_FLOAT32_ARRAY if exact else _FLOAT64_ARRAY)
+                _write_varint(out, len(value))
+                out += struct.pack(f"<{len(value)}{'f' if exact else 'd'}", *value)
+            else:
+                out.append(_LIST)
+                _write_varint(out, len(value))
+                for item in value:
+                    self.encode(out, item)
+        else:
+            out.append(_STR)
+            _write_varint(out, self.intern(str(value)))
+
+    def _is_record_list(self, value) -> bool:
+        return all(type(item) is dict and item for item in value)
+
+    def _encode_records(self, out: bytearray, rows):
+        keys = list(dict.fromkeys(key for row in rows for key in row))
+        out.append(_RECORDS)
+        _write_varint(out, len(rows))
+        _write_varint(out, len(keys))
+        for key in keys:
+            _write_varint(out, self.intern(key))
+        for key in keys:
+            if all(key in row for row in rows):
+                self._encode_column(out, [row[key] for row in rows])
+            else:
+                out.append(_COL_SPARSE)
+                out += bytes(key in row for row in rows)
+                self._encode_column(out, [row[key] for row in rows if key in row])
+
+    def _encode_column(self, out: bytearray, column):
+        types = {type(item) for item in column}
+        count = len(column)
+        if types == {str}:
+            out.append(_COL_STR)
+            out += struct.pack(f"<{count}I", *(self.intern(item) for item in column))
+        elif types == {bool}:
+            out.append(_COL_BOOL)
+            out += bytes(column)
+        elif types == {float}:
+            exact = all(_is_float32_exact(item) for item in column)
+            out.append(_COL_FLOAT32 if exact else _COL_FLOAT64)
+            out += struct.pack(f"<{count}{'f' if exact else 'd'}", *column)
+        elif types == {int} and all(-(1 << 63) <= item < (1 << 63) for item in column):
+            out.append(_COL_INT)
+            out += struct.pack(f"<{count}q", *column)
+        elif types == {list} and self._is_nested_record_column(column):
+            out.append(_COL_NESTED_RECORDS)
+            out += struct.pack(f"<{count}I", *(len(item) for item in column))
+            self._encode_records(out, [row for item in column for row in item])
+        elif types == {list} and all(item and all(type(v) is float for v in item) for item in column):
+            flat = [v for item in column for v in item]
+            exact = all(_is_float32_exact(v) for v in flat)
+            out.append(_COL_FLOAT_VECTORS)
+            out.append(_COL_FLOAT32 if exact else _COL_FLOAT64)
+            out += struct.pack(f"<{count}I", *(len(item) for item in column))
+            out += struct.pack(f"<{len(flat)}{'f' if exact else 'd'}", *flat)
+        elif types == {type(None)}:
+            out.append(_COL_NONE)
+        elif 1 < len(types) <= 8:
+            # Mixed columns such as default_value: one homogeneous sub-column per type
+            groups = list(dict.fromkeys(type(item) for item in column))
+            group_index = {group: index for index, group in enumerate(groups)}
+            out.append(_COL_UNION)
+            out.append(len(groups))
+            out += bytes(group_index[type(item)] for item in column)
+            for group in groups:
+                values = [item for item in column if type(item) is group]
+                _write_varint(out, len(values))
+                self._encode_column(out, values)
+        else:
+            out.append(_COL_GENERIC)
+            for item in column:
+                self.encode(out, item)
+
+    def _is_nested_record_column(self, column) -> bool:
+        has_rows = False
+        for item in column:
+            for row in item:
+                if type(row) is not dict or not row:
+                    return False
+                has_rows = True
+        return has_rows
+
+
+class _Decoder:
+    def __init__(self, data, strings):
+        self.data = data
+        self.strings = strings
+
+    def decode(self, pos: int):
+        data = self.data
+        tag = data[pos]
+        pos += 1
+        if tag == _NONE:
+            return None, pos
+        if tag == _TRUE:
+            return True, pos
+        if tag == _FALSE:
+            return False, pos
+        if tag == _INT:
+            raw, pos = _read_varint(data, pos)
+            return (raw >> 1) ^ -(raw & 1), pos
+        if tag == _FLOAT:
+            return _F64.unpack_from(data, pos)[0], pos + 8
+        if tag == _STR:
+            index, pos = _read_varint(data, pos)
+            return self.strings[index], pos
+        if tag == _LIST:
+            count, pos = _read_varint(data, pos)
+            items = []
+            for _ in range(count):
+                item, pos = self.decode(pos)
+                items.append(item)
+            return items, pos
+        if tag == _DICT:
+            count, pos = _read_varint(data, pos)
+            result = {}
+            for _ in range(count):
+                key_index, pos = _read_varint(data, pos)
+                result[self.strings[key_index]], pos = self.decode(pos)
+            return result, pos
+        if tag in (_FLOAT32_ARRAY, _FLOAT64_ARRAY):
+            count, pos = _read_varint(data, pos)
+            code, size = ('f', 4) if tag == _FLOAT32_ARRAY else ('d', 8)
+            values = list(struct.unpack_from(f"<{count}{code}", data, pos))
+            return values, pos + count * size
+        if tag == _RECORDS:
+            return self._decode_records(pos)
+        raise CompactManifestError(f"Unknown value tag {tag} at offset {pos - 1}")
+
+    def _decode_records(self, pos: int):
+        data = self.data
+        rows, pos = _read_varint(data, pos)
+        key_count, pos = _read_varint(data, pos)
+        keys = []
+        for _ in range(key_count):
+            key_index, pos = _read_varint(data, pos)
+            keys.append(self.strings[key_index])
+
+        dense_keys = []
+        dense_columns = []
+        sparse_columns = []
+        for key in keys:
+            if data[pos] == _COL_SPARSE:
+                presence = data[pos + 1:pos + 1 + rows]
+                pos += 1 + rows
+                present_rows = [index for index, present in enumerate(presence) if present]
+                values, pos = self._decode_column(pos, len(present_rows))
+                sparse_columns.append((key, present_rows, values))
+            else:
+                column, pos = self._decode_column(pos, rows)
+                dense_keys.append(key)
+                dense_columns.append(column)
+
+        if dense_columns:
+            records = [dict(zip(dense_keys, row)) for row in zip(*dense_columns)]
+        else:
+            records = [{} for _ in range(rows)]
+
+        for key, present_rows, values in sparse_columns:
+            for index, value in zip(present_rows, values):
+                records[index][key] = value
+
+        return records, pos
+
+    def _decode_column(self, pos: int, rows: int):
+        data = self.data
+        kind = data[pos]
+        pos += 1
+        if kind == _COL_STR:
+            indices = struct.unpack_from(f"<{rows}I", data, pos)
+            return list(map(self.strings.__getitem__, indices)), pos + rows * 4
+        if kind == _COL_BOOL:
+            return list(map(bool, data[pos:pos + rows])), pos + rows
+        if kind == _COL_FLOAT32:
+            return list(struct.unpack_from(f"<{rows}f", data, pos)), pos + rows * 4
+        if kind == _COL_FLOAT64:
+            return list(struct.unpack_from(f"<{rows}d", data, pos)), pos + rows * 8
+        if kind == _COL_INT:
+            return list(struct.unpack_from(f"<{rows}q", data, pos)), pos + rows * 8
+        if kind == _COL_NESTED_RECORDS:
+            lengths = struct.unpack_from(f"<{rows}I", data, pos)
+            flat, pos = self.decode(pos + rows * 4)
+            return _split(flat, lengths), pos
+        if kind == _COL_FLOAT_VECTORS:
+            code, size = ('f', 4) if data[pos] == _COL_FLOAT32 else ('d', 8)
+            lengths = struct.unpack_from(f"<{rows}I", data, pos + 1)
+            pos += 1 + rows * 4
+            total = sum(lengths)
+            flat = list(struct.unpack_from(f"<{total}{code}", data, pos))
+            return _split(flat, lengths), pos + total * size
+        if kind == _COL_NONE:
+            return [None] * rows, pos
+        if kind == _COL_UNION:
+            group_count = data[pos]
+            tags = data[pos + 1:pos + 1 + rows]
+            pos += 1 + rows
+            groups = []
+            for _ in range(group_count):
+                count, pos = _read_varint(data, pos)
+                values, pos = self._decode_column(pos, count)
+                groups.append(iter(values).__next__)
+            return [groups[tag]() for tag in tags], pos
+        if kind == _COL_GENERIC:
+            column = []
+            for _ in range(rows):
+                item, pos = self.decode(pos)
+                column.append(item)
+            return column, pos
+        raise CompactManifestError(f"Unknown column kind {kind} at offset {pos - 1}")
+
+
+def _split(flat: list, lengths) -> list:
+    ends = list(accumulate(lengths))
+    return [flat[end - length:end] for end, length in zip(ends, lengths)]
+
+
+def encode_manifest(metadata: dict) -> bytes:
+    encoder = _Encoder()
+    sections = []
+    for key, value in metadata.items():
+        blob = bytearray()
+        encoder.encode(blob, value)
+        sections.append((encoder.intern(key), blob))
+
+    header = bytearray(MAGIC)
+    _write_varint(header, len(encoder.strings))
+    for text in encoder.strings:
+        encoded = text.encode('utf-8')
+        _write_varint(header, len(encoded))
+        header += encoded
+
+    _write_varint(header, len(sections))
+    table_size = sum(len(_varint_bytes(key)) + 2 * _U32.size for key, _ in sections)
+    offset = len(header) + table_size
+    for key, blob in sections:
+        _write_varint(header, key)
+        header += _U32.pack(offset)
+        header += _U32.pack(len(blob))
+        offset += len(blob)
+
+    return bytes(header) + b''.join(bytes(blob) for _, blob in sections)
+
+
+def _varint_bytes(value: int) -> bytearray:
+    out = bytearray()
+    _write_varint(out, value)
+    return out
+
+
+def _read_header(data):
+    if bytes(data[:4]) != MAGIC:
+        raise CompactManifestError("Not a compact manifest")
+
+    pos = 4
+    count, pos = _read_varint(data, pos)
+    strings = []
+    for _ in range(count):
+        length, pos = _read_varint(data, pos)
+        strings.append(bytes(data[pos:pos + length]).decode('utf-8'))
+        pos += length
+
+    section_count, pos = _read_varint(data, pos)
+    sections = {}
+    for _ in range(section_count):
+        key_index, pos = _read_varint(data, pos)
+        offset = _U32.unpack_from(data, pos)[0]
+        length = _U32.unpack_from(data, pos + 4)[0]
+        sections[strings[key_index]] = (offset, length)
+        pos += 8
+    return strings, sections
+
+
+def decode_manifest(data) -> dict:
+    return read_sections(data)
+
+
+def read_sections(data, keys=None) -> dict:
+    """Decode the requested top-level sections (all of them if keys is None), skipping the rest."""
+    try:
+        strings, sections = _read_header(data)
+        decoder = _Decoder(data, strings)
+        return {
+            key: decoder.decode(offset)[0]
+            for key, (offset, _) in sections.items()
+            if keys is None or key in keys
+        }
+    except (IndexError, KeyError, struct.error, UnicodeDecodeError) as e:
+        raise CompactManifestError(f"Truncated or corrupt compact manifest: {e}") from e
+
+
+def read_section(data, key: str) -> Optional[object]:
+    """Decode a single top-level section (e.g. 'nodegroup_info') without touching the others."""
+    return read_sections(data, (key,)).get(key)
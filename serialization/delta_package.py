@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+from typing import Optional, Tuple
+
+from .node_archive import NodeArchive
+from .node_packager import package_node_files
+from .manifest_delta import DELTA_FORMAT_VERSION, DELTA_MANIFEST_EXT, DeltaError, diff_manifests, describe_delta, dump_delta
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+PATCH_SUFFIX = '.patch'
+# A patch holds JSON only; the .blend-oriented default preset would store nothing compressed
+PATCH_COMPRESSION = 'deflate'
+
+
+def _read_version(filepath: str) -> Tuple[dict, dict]:
+    with NodeArchive(filepath) as archive:
+        if archive.delta_names:
+            raise DeltaError(f"{os.path.basename(filepath)} is itself a patch package")
+        config_data = archive.read_config() or {}
+        metadata = archive.read_manifest()
+    if metadata is None:
+        raise DeltaError(f"{os.path.basename(filepath)} has no manifest")
+    if not config_data.get('hash'):
+        raise DeltaError(f"{os.path.basename(filepath)} has no content hash in its .config")
+    # Without a hash per nested group, a change inside one cannot be told apart from no change
+    dependencies = metadata.get('dependencies', {})
+    unhashed = [name for name in dependencies.get('node_groups', []) if name not in dependencies.get('subgroups', {})]
+    if unhashed:
+        raise DeltaError(f"{os.path.basename(filepath)} has no content hash for nested group(s) "
+                         f"{', '.join(sorted(unhashed))}; export it with bundled dependencies")
+    return metadata, config_data
+
+
+def build_delta(base_path: str, target_path: str) -> dict:
+    """Diff two exported versions of a package into a delta manifest."""
+    base, base_config = _read_version(base_path)
+    target, target_config = _read_version(target_path)
+    if base_config['hash'] == target_config['hash']:
+        raise DeltaError(f"{os.path.basename(base_path)} and {os.path.basename(target_path)} are the same version")
+
+    delta = diff_manifests(base, target)
+    nodegroup_info = target.get('nodegroup_info', {})
+    delta['delta_info'] = {
+        'format': DELTA_FORMAT_VERSION,
+        'name': nodegroup_info.get('name'),
+        'package_name': nodegroup_info.get('package_name', nodegroup_info.get('name')),
+        'base_hash': base_config['hash'],
+        'target_hash': target_config['hash'],
+    }
+    return delta
+
+
+def default_patch_path(target_path: str) -> str:
+    stem = target_path[:-5] if target_path.lower().endswith('.node') else target_path
+    return f"{stem}{PATCH_SUFFIX}.node"
+
+
+def create_delta_package(base_path: str, target_path: str, output_path: Optional[str] = None) -> Tuple[bool, str]:
+    """Write a patch package that updates the base version of a node group to the target version.
+
+    Both arguments are full packages of the same node group. On success the message
+    is the path of the written patch.
+    """
+    try:
+        delta = build_delta(base_path, target_path)
+    except (DeltaError, OSError) as e:
+        return False, str(e)
+
+    output_path = output_path or default_patch_path(target_path)
+    info = delta['delta_info']
+    temp_dir = tempfile.mkdtemp(prefix="nodegroup_export_")
+    try:
+        delta_path = os.path.join(temp_dir, f"{info['package_name']}{DELTA_MANIFEST_EXT}")
+        with open(delta_path, 'wb') as f:
+            f.write(dump_delta(delta))
+
+        extra_config = {'base_hash': info['base_hash'], 'target_hash': info['target_hash']}
+        success, message = package_node_files(output_path, [delta_path], extra_config=extra_config,
+                                              preset=PATCH_COMPRESSION)
+        if not success:
+            return False, message
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    logger.info('Patch for %s (%s -> %s): %s; %s bytes instead of %s', info['name'], info['base_hash'][:12],
+                info['target_hash'][:12], describe_delta(delta), os.path.getsize(message),
+                os.path.getsize(target_path))
+    return True, message
@@ -0,0 +1,180 @@
+import time
+from typing import List
+
+from .node_builder import NodeBuilder
+from .link_builder import LinkBuilder
+from .manifest_delta import INTERFACE_DIRECTIONS, describe_delta
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+# Interface socket fields written from a delta, besides socket_type
+INTERFACE_FIELDS = ('name', 'description', 'default_value', 'min_value', 'max_value', 'subtype', 'attribute_domain')
+GROUP_INPUT_NODE = 'NodeGroupInput'
+GROUP_OUTPUT_NODE = 'NodeGroupOutput'
+
+
+class DeltaPatcher:
+    """Applies a delta manifest to the node group it was made for, in place.
+
+    The order matters: interface sockets first (group input and output nodes get
+    their sockets from it), then removed nodes and links, changed nodes, added nodes
+    and finally the links, which may point at any of those. Blender picks its own
+    identifier for a new interface socket; links to it are remapped to that identifier.
+    """
+
+    def __init__(self, node_group):
+        self.node_group = node_group
+        self.errors: List[str] = []
+        self.elapsed = 0.0
+        # Interface socket identifier in the delta -> identifier of the socket created for it here
+        self.socket_identifiers = {}
+
+    def apply(self, delta: dict):
+        start = time.perf_counter()
+        interface_delta = delta.get('interface', {})
+        for direction, in_out in zip(INTERFACE_DIRECTIONS, ('INPUT', 'OUTPUT')):
+            if interface_delta.get(direction):
+                self._patch_interface(in_out, interface_delta[direction])
+
+        nodes = self.node_group.nodes
+        nodes_by_name = {node.name: node for node in nodes}
+        node_delta = delta.get('nodes', {})
+        link_delta = delta.get('links', {})
+
+        for name in node_delta.get('removed', []):
+            node = nodes_by_name.pop(name, None)
+            if node is None:
+                self.errors.append(f"Node {name} to remove is not in {self.node_group.name}")
+            else:
+                nodes.remove(node)
+        self._patch_links(link_delta.get('removed', []), link_delta.get('changed', []))
+
+        builder = NodeBuilder(self.node_group)
+        for change in node_delta.get('changed', []):
+            node = nodes_by_name.get(change.get('name'))
+            if node is None:
+                self.errors.append(f"Node {change.get('name')} to update is not in {self.node_group.name}")
+            else:
+                builder.update(node, change.get('fields', {}))
+        builder.build(node_delta.get('added', []))
+        self.errors.extend(builder.errors)
+        nodes_by_name.update(builder.nodes_by_name)
+
+        links = LinkBuilder(self.node_group, nodes_by_name)
+        links.build(self._link_spec(link_data, nodes_by_name) for link_data in link_delta.get('added', []))
+        self.errors.extend(links.errors)
+
+        description = delta.get('nodegroup_info', {}).get('description')
+        if description is not None and hasattr(self.node_group, 'description'):
+            self.node_group.description = description
+        self.elapsed = time.perf_counter() - start
+
+    def _interface_sockets(self, in_out: str) -> dict:
+        return {
+            item.identifier: item for item in self.node_group.interface.items_tree
+            if item.item_type == 'SOCKET' and item.in_out == in_out
+        }
+
+    def _patch_interface(self, in_out: str, changes: dict):
+        interface = self.node_group.interface
+        sockets = self._interface_sockets(in_out)
+
+        for removed in changes.get('removed', []):
+            identifier = removed.get('identifier')
+            if identifier not in sockets:
+                # Sockets added by an earlier patch have identifiers Blender picked; fall back to the name
+                identifier = next((key for key, item in sockets.items() if item.name == removed.get('name')), None)
+            if identifier is None:
+                self.errors.append(f"Interface socket {removed.get('name')} to remove is not in {self.node_group.name}")
+                continue
+            interface.remove(sockets.pop(identifier))
+
+        for socket_data in changes.get('changed', []):
+            item = sockets.get(socket_data.get('identifier'))
+            if item is None:
+                self.errors.append(f"Interface socket {socket_data.get('name')} to update is not in {self.node_group.name}")
+                continue
+            socket_type = socket_data.get('socket_type')
+            if socket_type and item.socket_type != socket_type:
+                self._set_field(item, 'socket_type', socket_type)
+            self._apply_socket_fields(item, socket_data)
+
+        for socket_data in changes.get('added', []):
+            item = interface.new_socket(name=socket_data.get('name', 'Socket'), in_out=in_out,
+                                        socket_type=socket_data.get('socket_type', 'NodeSocketGeometry'))
+            self._apply_socket_fields(item, socket_data)
+            identifier = socket_data.get('identifier')
+            sockets[identifier] = item
+            if item.identifier != identifier:
+                self.socket_identifiers[identifier] = item.identifier
+
+        order = changes.get('order')
+        if order:
+            self._reorder(interface, [sockets[identifier] for identifier in order if identifier in sockets])
+
+    def _apply_socket_fields(self, item, socket_data: dict):
+        for field in INTERFACE_FIELDS:
+            value = socket_data.get(field)
+            if value is not None and hasattr(item, field) and getattr(item, field) != value:
+                self._set_field(item, field, value)
+
+    def _set_field(self, item, field: str, value):
+        try:
+            setattr(item, field, value)
+        except Exception as e:
+            self.errors.append(f"Could not set {field} of interface socket {item.name}: {e}")
+
+    def _reorder(self, interface, ordered: list):
+        # Sockets of one direction sit next to each other, so they are moved within their own slots
+        positions = sorted(item.position for item in ordered)
+        try:
+            for item, position in zip(ordered, positions):
+                if item.position != position:
+                    interface.move(item, position)
+        except (AttributeError, RuntimeError, TypeError) as e:
+            self.errors.append(f"Could not reorder the interface of {self.node_group.name}: {e}")
+
+    def _patch_links(self, removed: list, changed: list):
+        if not removed and not changed:
+            return
+        links_by_key = {
+            (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier): link
+            for link in self.node_group.links
+        }
+        for link_data in removed:
+            link = links_by_key.pop(self._link_key(link_data), None)
+            if link is None:
+                self.errors.append(f"Link {link_data.get('from_node')} -> {link_data.get('to_node')} to remove is not in "
+                                   f"{self.node_group.name}")
+            else:
+                self.node_group.links.remove(link)
+        for link_data in changed:
+            link = links_by_key.get(self._link_key(link_data))
+            if link is not None:
+                link.is_muted = bool(link_data.get('is_muted'))
+
+    @staticmethod
+    def _link_key(link_data: dict) -> tuple:
+        return (link_data.get('from_node'), link_data.get('from_socket'),
+                link_data.get('to_node'), link_data.get('to_socket'))
+
+    def _link_spec(self, link_data: dict, nodes_by_name: dict) -> tuple:
+        from_node, from_socket, to_node, to_socket = self._link_key(link_data)
+        if self.socket_identifiers:
+            from_type = getattr(nodes_by_name.get(from_node), 'bl_idname', None)
+            to_type = getattr(nodes_by_name.get(to_node), 'bl_idname', None)
+            if from_type == GROUP_INPUT_NODE:
+                from_socket = self.socket_identifiers.get(from_socket, from_socket)
+            if to_type == GROUP_OUTPUT_NODE:
+                to_socket = self.socket_identifiers.get(to_socket, to_socket)
+        return from_node, from_socket, to_node, to_socket
+
+
+def apply_delta(node_group, delta: dict) -> DeltaPatcher:
+    patcher = DeltaPatcher(node_group)
+    patcher.apply(delta)
+    for error in patcher.errors:
+        logger.warning('%s', error)
+    logger.info("Patched '%s' in %.1f ms: %s", node_group.name, patcher.elapsed * 1000, describe_delta(delta))
+    return patcher
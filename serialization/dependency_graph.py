@@ -0,0 +1,121 @@
+import re
+import bpy
+import hashlib
+from typing import Dict, List, Optional
+
+SUBGROUP_HASH_PROPERTY = "node_group_hash"
+DEPENDENCY_KINDS = ('node_groups', 'materials', 'objects', 'images', 'texts')
+
+# Node attributes that can point at another datablock (group nodes, frames, image/object nodes...)
+_ID_ATTRIBUTES = ('node_tree', 'material', 'object', 'image', 'text')
+_DUPLICATE_SUFFIX = re.compile(r'\.\d{3}$')
+
+
+def _kind_of(datablock) -> Optional[str]:
+    if isinstance(datablock, bpy.types.NodeTree):
+        return 'node_groups'
+    if isinstance(datablock, bpy.types.Material):
+        return 'materials'
+    if isinstance(datablock, bpy.types.Object):
+        return 'objects'
+    if isinstance(datablock, bpy.types.Image):
+        return 'images'
+    if isinstance(datablock, bpy.types.Text):
+        return 'texts'
+    return None
+
+
+def _referenced_ids(node):
+    for attribute in _ID_ATTRIBUTES:
+        value = getattr(node, attribute, None)
+        if isinstance(value, bpy.types.ID):
+            yield value
+    for socket in node.inputs:
+        value = getattr(socket, 'default_value', None)
+        if isinstance(value, bpy.types.ID):
+            yield value
+
+
+def base_name(name: str) -> str:
+    """Strip Blender's '.001' duplicate suffix so re-imported copies address the same subgroup."""
+    return _DUPLICATE_SUFFIX.sub('', name)
+
+
+def subgroup_hash(fingerprint: str, name: str, child_hashes: List[str]) -> str:
+    """Content address of a node group: its own graph plus, recursively, the groups it uses."""
+    combined = '|'.join([fingerprint, base_name(name)] + child_hashes)
+    return hashlib.sha256(combined.encode('utf-8')).hexdigest()
+
+
+class DependencyGraph:
+    """Transitive closure of the datablocks a node group uses.
+
+    node_groups is in post-order, so every group comes after the groups nested in it.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.node_groups = []
+        self.children: Dict[str, List[str]] = {}
+        self.ids = {kind: [] for kind in DEPENDENCY_KINDS if kind != 'node_groups'}
+        self._walk()
+
+    def _add(self, kind: str, datablock):
+        if datablock not in self.ids[kind]:
+            self.ids[kind].append(datablock)
+
+    def _walk(self):
+        visited = set()
+        # (tree, visit key, expanded, embedded); embedded material trees all share one name
+        stack = [(self.root, self.root.name_full, False, False)]
+
+        while stack:
+            tree, key, expanded, embedded = stack.pop()
+            if expanded:
+                self.node_groups.append(tree)
+                continue
+            if key in visited:
+                continue
+            visited.add(key)
+
+            # Material node trees are walked for their images but are not node groups themselves
+            if not embedded:
+                stack.append((tree, key, True, False))
+
+            children = []
+            for node in tree.nodes:
+                for datablock in _referenced_ids(node):
+                    kind = _kind_of(datablock)
+                    if kind == 'node_groups':
+                        if datablock != tree:
+                            if datablock.name not in children:
+                                children.append(datablock.name)
+                            stack.append((datablock, datablock.name_full, False, False))
+                    elif kind:
+                        self._add(kind, datablock)
+                        if kind == 'materials' and datablock.node_tree is not None:
+                            stack.append((datablock.node_tree, f"{datablock.name_full}/node_tree", False, True))
+
+            if not embedded:
+                self.children[tree.name] = children
+
+    def names(self) -> dict:
+        """Dependency names by kind, as stored in the manifest (root excluded)."""
+        names = {'node_groups': [ng.name for ng in self.node_groups if ng != self.root]}
+        for kind, datablocks in self.ids.items():
+            names[kind] = [datablock.name for datablock in datablocks]
+        return names
+
+
+def index_subgroups(node_groups) -> dict:
+    """Map subgroup content hashes to the node groups already in the file tagged with them.
+
+    A tag is only what the group hashed to when it was imported; check the group's current
+    hash before reusing it, since it may have been edited since.
+    """
+    index = {}
+    for node_group in node_groups:
+        group_hash = node_group.get(SUBGROUP_HASH_PROPERTY)
+        if group_hash:
+            index.setdefault(group_hash, []).append(node_group)
+    return index
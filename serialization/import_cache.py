@@ -0,0 +1,357 @@
+import os
+import re
+import json
+import time
+import shutil
+import tempfile
+import threading
+from collections import Counter
+from typing import List, Optional
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+HASH_PROPERTY = "node_file_hash"
+PACKAGE_PROPERTY = "node_file_package"
+CACHE_DIRNAME = "import_cache"
+# Extracted payloads of linked packages; production files point here, so it is never evicted
+LINKED_LIBRARY_DIRNAME = "linked_libraries"
+INDEX_FILENAME = "index.json"
+STAGING_DIRNAME = ".staging"
+DEFAULT_CACHE_LIMIT = 2 * 1024 ** 3
+# Leftovers younger than this may belong to another Blender instance that is still working
+STALE_SECONDS = 60 * 60
+TEMP_PREFIXES = ("nodegroup_unpack_", "nodegroup_export_")
+
+_cache_limit = DEFAULT_CACHE_LIMIT
+
+# Content hashes name folders of the store and come from a package's .config, so nothing else is accepted
+CONTENT_HASH_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+
+def is_content_hash(value) -> bool:
+    return isinstance(value, str) and CONTENT_HASH_PATTERN.fullmatch(value) is not None
+
+
+def _addon_package() -> str:
+    return __package__.rpartition('.')[0] if __package__ else "node_file_link"
+
+
+def get_default_cache_dir(dirname: str = CACHE_DIRNAME) -> str:
+    try:
+        import bpy
+        if hasattr(bpy.utils, 'extension_path_user'):
+            return bpy.utils.extension_path_user(_addon_package(), path=dirname, create=True)
+        return os.path.join(bpy.utils.user_resource('CONFIG'), "node_file_link", dirname)
+    except Exception:
+        return os.path.join(tempfile.gettempdir(), "node_file_link", dirname)
+
+
+def set_cache_limit(max_bytes: Optional[int]):
+    """Size cap of evictable import caches; None lets them grow without bound."""
+    global _cache_limit
+    _cache_limit = max_bytes
+
+
+def _modified_before(path: str, cutoff: float) -> bool:
+    try:
+        return os.path.getmtime(path) < cutoff
+    except OSError:
+        return False
+
+
+class ImportCache:
+    """Persistent, content-addressed store of extracted .blend files, keyed by package hash.
+
+    Each package version is extracted once. Entries are populated in a staging folder
+    and renamed into place, so a crash never leaves a half-written entry, and once the
+    store grows past its size cap the least recently used entries are evicted. Several
+    Blender instances can share a store: the index is merged with the copy on disk
+    whenever it is saved.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None, evictable: bool = True):
+        self.cache_dir = cache_dir or get_default_cache_dir()
+        self.index_path = os.path.join(self.cache_dir, INDEX_FILENAME)
+        self.staging_dir = os.path.join(self.cache_dir, STAGING_DIRNAME)
+        self.max_bytes = max_bytes
+        self.evictable = evictable
+        self.entries = {}
+        self._lock = threading.RLock()
+        self._hash_locks = {}
+        # Hash -> number of imports holding an entry whose .blend files are not loaded yet; never evicted
+        self._in_use = Counter()
+        self._load_index()
+
+    @property
+    def limit(self) -> Optional[int]:
+        if not self.evictable:
+            return None
+        return self.max_bytes if self.max_bytes is not None else _cache_limit
+
+    def _read_index_file(self) -> dict:
+        entries = {}
+        try:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.debug('Import cache index unreadable, starting fresh: %s', e)
+        if not isinstance(entries, dict):
+            return {}
+        return {key: entry for key, entry in entries.items() if is_content_hash(key) and isinstance(entry, dict)}
+
+    def _load_index(self):
+        self.entries = self._read_index_file()
+
+    def _hash_lock(self, content_hash: str):
+        with self._lock:
+            return self._hash_locks.setdefault(content_hash, threading.Lock())
+
+    def save(self):
+        with self._lock:
+            self._save_index()
+
+    def _save_index(self):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Keep entries another Blender instance added since we loaded the index
+            for content_hash, entry in self._read_index_file().items():
+                current = self.entries.get(content_hash)
+                if current is None:
+                    if os.path.isdir(self.entry_dir(content_hash)):
+                        self.entries[content_hash] = entry
+                elif entry.get('last_used', 0) > current.get('last_used', 0):
+                    current['last_used'] = entry['last_used']
+
+            partial_path = f"{self.index_path}.{os.getpid()}.partial"
+            with open(partial_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(partial_path, self.index_path)
+        except OSError as e:
+            logger.error('Failed to save import cache index: %s', e)
+
+    def entry_dir(self, content_hash: str) -> str:
+        if not is_content_hash(content_hash):
+            raise ValueError(f"Not a package content hash: {content_hash!r}")
+        return os.path.join(self.cache_dir, content_hash)
+
+    def _entry_size(self, entry: dict) -> int:
+        if 'size' not in entry:
+            entry['size'] = sum(os.path.getsize(path) for path in entry.get('blend_files', []) if os.path.exists(path))
+        return entry['size']
+
+    @property
+    def total_size(self) -> int:
+        with self._lock:
+            return sum(self._entry_size(entry) for entry in self.entries.values())
+
+    def lookup(self, content_hash: str) -> Optional[dict]:
+        with self._lock:
+            entry = self.entries.get(content_hash)
+        if not entry:
+            return None
+
+        blend_files = entry.get('blend_files', [])
+        if not blend_files or not all(os.path.exists(path) for path in blend_files):
+            self.evict(content_hash)
+            return None
+
+        with self._lock:
+            entry['last_used'] = time.time()
+            self._in_use[content_hash] += 1
+        return entry
+
+    def store_blends(self, content_hash: str, archive, verify: bool = False) -> List[str]:
+        target_dir = self.entry_dir(content_hash)
+        # Serialize per hash so the same package dropped twice is extracted once
+        with self._hash_lock(content_hash):
+            entry = self.lookup(content_hash)
+            if entry:
+                return entry['blend_files']
+
+            os.makedirs(self.staging_dir, exist_ok=True)
+            staging_dir = tempfile.mkdtemp(prefix=f"{content_hash[:16]}_", dir=self.staging_dir)
+            try:
+                staged_paths = archive.extract_blends(staging_dir)
+                if verify:
+                    archive.verify_content_hash(content_hash)
+                blend_paths = [os.path.join(target_dir, os.path.basename(path)) for path in staged_paths]
+                self._publish(staging_dir, target_dir, blend_paths)
+            finally:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+            with self._lock:
+                self.entries[content_hash] = {
+                    'source': archive.filepath,
+                    'blend_files': blend_paths,
+                    'node_groups': [],
+                    'size': sum(os.path.getsize(path) for path in blend_paths),
+                    'last_used': time.time()
+                }
+                self._in_use[content_hash] += 1
+                self._evict_over_limit()
+                self._save_index()
+            return blend_paths
+
+    def _publish(self, staging_dir: str, target_dir: str, blend_paths: List[str]):
+        # A directory rename is atomic, so the entry appears complete or not at all
+        try:
+            os.replace(staging_dir, target_dir)
+            return
+        except OSError:
+            if not os.path.isdir(target_dir):
+                raise
+        if all(os.path.exists(path) for path in blend_paths):
+            # Another Blender instance published the same content meanwhile
+            return
+        # An incomplete folder left behind by a crash
+        shutil.rmtree(target_dir, ignore_errors=True)
+        os.replace(staging_dir, target_dir)
+
+    def release(self, content_hash: str):
+        """Drop one hold on an entry; it can be evicted again once every import that looked it up released it."""
+        with self._lock:
+            self._release(content_hash)
+
+    def _release(self, content_hash: str):
+        if self._in_use[content_hash] > 1:
+            self._in_use[content_hash] -= 1
+        else:
+            self._in_use.pop(content_hash, None)
+
+    def record_node_groups(self, content_hash: str, node_group_names: List[str]):
+        with self._lock:
+            self._release(content_hash)
+            entry = self.entries.get(content_hash)
+            if entry is None:
+                return
+            entry['node_groups'] = sorted(set(entry.get('node_groups', [])) | set(node_group_names))
+            self._save_index()
+
+    def evict(self, content_hash: str):
+        with self._lock:
+            self.entries.pop(content_hash, None)
+            self._in_use.pop(content_hash, None)
+            if is_content_hash(content_hash):
+                shutil.rmtree(self.entry_dir(content_hash), ignore_errors=True)
+            self._save_index()
+
+    def _evict_over_limit(self) -> int:
+        limit = self.limit
+        if limit is None:
+            return 0
+        total = sum(self._entry_size(entry) for entry in self.entries.values())
+        if total <= limit:
+            return 0
+
+        evicted = 0
+        for content_hash, entry in sorted(self.entries.items(), key=lambda item: item[1].get('last_used', 0)):
+            if total <= limit:
+                break
+            if content_hash in self._in_use:
+                continue
+            total -= self._entry_size(entry)
+            del self.entries[content_hash]
+            shutil.rmtree(self.entry_dir(content_hash), ignore_errors=True)
+            evicted += 1
+
+        logger.debug('Evicted %s import cache entr%s, %s bytes in use', evicted, 'y' if evicted == 1 else 'ies', total)
+        return evicted
+
+    def cleanup_stale(self) -> int:
+        """Startup pass: remove what crashed sessions left behind and shrink the store to its cap."""
+        cutoff = time.time() - STALE_SECONDS
+        removed = 0
+        with self._lock:
+            if os.path.isdir(self.staging_dir):
+                for name in os.listdir(self.staging_dir):
+                    path = os.path.join(self.staging_dir, name)
+                    if _modified_before(path, cutoff):
+                        shutil.rmtree(path, ignore_errors=True)
+                        removed += 1
+
+            for content_hash, entry in list(self.entries.items()):
+                blend_files = entry.get('blend_files', [])
+                if not blend_files or not all(os.path.exists(path) for path in blend_files):
+                    del self.entries[content_hash]
+                    shutil.rmtree(self.entry_dir(content_hash), ignore_errors=True)
+                    removed += 1
+
+            # Folders missing from the index were published right before a crash. Linked
+            # stores keep them: a saved file may still point into one.
+            if self.evictable and os.path.isdir(self.cache_dir):
+                for name in os.listdir(self.cache_dir):
+                    path = os.path.join(self.cache_dir, name)
+                    if (name not in self.entries and name != STAGING_DIRNAME and os.path.isdir(path)
+                            and _modified_before(path, cutoff)):
+                        shutil.rmtree(path, ignore_errors=True)
+                        removed += 1
+
+            removed += self._evict_over_limit()
+            self._save_index()
+        return removed
+
+
+def open_library_store(library_dir: Optional[str] = None) -> ImportCache:
+    """The store of linked packages. Saved files point into it, so it is never evicted."""
+    return ImportCache(library_dir or get_default_cache_dir(LINKED_LIBRARY_DIRNAME), evictable=False)
+
+
+def cleanup_temp_dirs(temp_root: Optional[str] = None) -> int:
+    """Remove unpack/export temp folders leaked by sessions that exited before their cleanup ran."""
+    temp_root = temp_root or tempfile.gettempdir()
+    cutoff = time.time() - STALE_SECONDS
+    removed = 0
+    try:
+        names = os.listdir(temp_root)
+    except OSError:
+        return 0
+    for name in names:
+        path = os.path.join(temp_root, name)
+        if name.startswith(TEMP_PREFIXES) and os.path.isdir(path) and _modified_before(path, cutoff):
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def startup_cleanup(library_dir: Optional[str] = None) -> threading.Thread:
+    """Run the cleanup pass of the import cache, the linked store and leaked temp folders on a thread."""
+    cache_dir = get_default_cache_dir()
+    library_dir = library_dir or get_default_cache_dir(LINKED_LIBRARY_DIRNAME)
+
+    def run():
+        try:
+            removed = ImportCache(cache_dir).cleanup_stale()
+            removed += open_library_store(library_dir).cleanup_stale()
+            removed += cleanup_temp_dirs()
+            if removed:
+                logger.info('Startup cleanup removed %s stale cache entr%s and temp folder(s)',
+                            removed, 'y' if removed == 1 else 'ies')
+        except Exception as e:
+            logger.warning('Startup cleanup failed: %s', e)
+
+    thread = threading.Thread(target=run, name="node_cache_cleanup", daemon=True)
+    thread.start()
+    return thread
+
+
+def index_loaded_nodegroups(node_groups) -> dict:
+    """Map each package content hash to the node groups in the file that were imported from it."""
+    index = {}
+    for node_group in node_groups:
+        content_hash = node_group.get(HASH_PROPERTY)
+        if content_hash:
+            index.setdefault(content_hash, []).append(node_group)
+    return index
+
+
+def root_nodegroups(node_groups) -> list:
+    """Return the groups of a package that are not nested inside another of its groups."""
+    nested = set()
+    for node_group in node_groups:
+        for node in getattr(node_group, 'nodes', []):
+            child = getattr(node, 'node_tree', None)
+            if child is not None and child != node_group:
+                nested.add(child.name)
+    return [ng for ng in node_groups if ng.name not in nested]
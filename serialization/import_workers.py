@@ -0,0 +1,202 @@
+import bpy
+import os
+import time
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Callable
+
+from .nodegroup_unpacker import NodeGroupUnpacker
+from . import profiling
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncImportQueue:
+    """Prepares dropped packages on a worker pool and appends them on the main thread.
+
+    Decompression, hash verification and manifest parsing never touch bpy and run
+    concurrently; only the library load and node placement run on the main thread,
+    a time-boxed batch per step(). Steps come from a bpy.app.timers callback, or from
+    a modal operator that drives the queue itself and can cancel it.
+    """
+
+    POLL_INTERVAL = 0.05
+    MAIN_THREAD_BUDGET = 0.02
+
+    def __init__(self, unpacker: Optional[NodeGroupUnpacker] = None, max_workers: Optional[int] = None,
+                 on_complete: Optional[Callable[[int, int, List[str]], None]] = None):
+        self.unpacker = unpacker or NodeGroupUnpacker()
+        self.max_workers = max_workers or os.cpu_count()
+        self.on_complete = on_complete
+        self._executor = None
+        self._futures = []
+        self._ready = queue.Queue()
+        self._pending = 0
+        self._completed = False
+        self._loaded_index = {}
+        self._imported_nodegroups = []
+        self._window = None
+        self._area = None
+        self._region = None
+        self.success_count = 0
+        self.failure_count = 0
+        self.error_messages = []
+        self.total = 0
+        self.processed = 0
+        self.cancelled = False
+        self.profile = None
+
+    def capture_context(self, context):
+        self._window = context.window
+        self._area = context.area
+        self._region = context.region
+
+    @property
+    def is_running(self) -> bool:
+        return self._pending > 0
+
+    @property
+    def is_finished(self) -> bool:
+        return self._completed
+
+    def start(self, file_paths: List[str], use_timer: bool = True):
+        """Submit the files to the worker pool. Without use_timer the caller must call step()."""
+        self.total = len(file_paths)
+        self.profile = profiling.start_profile('import_batch', f"{len(file_paths)} file(s)")
+        self._loaded_index = self.unpacker._index_loaded_nodegroups()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="node_unpack")
+
+        logger.debug('Queued %s .node file(s) for background extraction on %s worker(s)', len(file_paths), self.max_workers)
+
+        for filepath in file_paths:
+            future = self._executor.submit(self.unpacker._prepare_package, filepath, None, dict(self._loaded_index))
+            self._pending += 1
+            self._futures.append(future)
+            future.add_done_callback(self._ready.put)
+
+        if use_timer:
+            bpy.app.timers.register(self._drain, first_interval=0.0)
+
+    def cancel(self):
+        """Stop loading packages. Queued extractions are dropped, running ones are discarded when done."""
+        if self.cancelled or self._completed:
+            return
+        self.cancelled = True
+        dropped = sum(1 for future in self._futures if future.cancel())
+        logger.info('Import cancelled, %s queued package(s) dropped', dropped)
+
+    def abort(self):
+        """Cancel and shut down without loading or placing anything, e.g. when Blender loads another file."""
+        if self._completed:
+            return
+        self.cancel()
+        self._completed = True
+        # Running extractions write into the temp dirs, let them finish before cleanup
+        self._executor.shutdown(wait=True)
+        try:
+            self._discard_ready()
+        finally:
+            self.unpacker.cleanup()
+            self.profile.finish("Aborted")
+
+    def _discard_ready(self):
+        # Packages that will never be stepped still hold their import cache entries
+        while self._pending > 0:
+            try:
+                future = self._ready.get_nowait()
+            except queue.Empty:
+                return
+            self._pending -= 1
+            self._finish_package(future)
+
+    def _drain(self):
+        return self.POLL_INTERVAL if self.step() else None
+
+    def step(self) -> bool:
+        """Load ready packages until the main-thread budget is used. Returns True while work remains."""
+        if self._completed:
+            return False
+        deadline = time.perf_counter() + self.MAIN_THREAD_BUDGET
+
+        while self._pending > 0 and time.perf_counter() < deadline:
+            try:
+                future = self._ready.get_nowait()
+            except queue.Empty:
+                break
+
+            self._pending -= 1
+            self.processed += 1
+            self._finish_package(future)
+
+        if self._pending > 0:
+            return True
+
+        self._complete()
+        return False
+
+    def _finish_package(self, future):
+        if self.cancelled:
+            if not future.cancelled() and future.exception() is None:
+                prepared = future.result()
+                try:
+                    prepared.profile.finish("Cancelled")
+                finally:
+                    self.unpacker._release_prepared(prepared)
+            return
+
+        try:
+            prepared = future.result()
+        except Exception as e:
+            self.failure_count += 1
+            self.error_messages.append(f"❌ Worker failed: {str(e)}")
+            return
+
+        filename = os.path.basename(prepared.filepath)
+        if prepared.error:
+            success, message = False, prepared.error
+        else:
+            with profiling.activate(self.profile), profiling.stage('load'):
+                success, message, nodegroups = self.unpacker._load_prepared_package(prepared, self._loaded_index)
+            prepared.profile.finish(None if success else message)
+            if success:
+                self._imported_nodegroups.extend(nodegroups)
+
+        if success:
+            self.success_count += 1
+            logger.info('✅ %s: %s', filename, message)
+        else:
+            self.failure_count += 1
+            error_msg = f"❌ {filename}: {message}"
+            logger.error('%s', error_msg)
+            self.error_messages.append(error_msg)
+
+    def _complete(self):
+        self._completed = True
+        try:
+            if self._imported_nodegroups:
+                with profiling.activate(self.profile), profiling.stage('place'):
+                    self._place_nodes()
+        finally:
+            self._executor.shutdown(wait=False)
+            self.unpacker.cleanup()
+            self.profile.finish("Cancelled" if self.cancelled else None)
+
+        logger.info('Background import finished: %s succeeded, %s failed%s', self.success_count, self.failure_count,
+                    ', cancelled' if self.cancelled else '')
+        if self.on_complete:
+            self.on_complete(self.success_count, self.failure_count, self.error_messages)
+
+    def _place_nodes(self):
+        mouse_coords = getattr(self.unpacker, '_mouse_coords', None)
+        place_at_cursor = len(self._imported_nodegroups) == 1
+
+        if self._area is not None and self._window is not None:
+            try:
+                with bpy.context.temp_override(window=self._window, area=self._area, region=self._region):
+                    self.unpacker._place_nodes_in_editors(self._imported_nodegroups, place_at_cursor, mouse_coords)
+                return
+            except (ReferenceError, TypeError) as e:
+                logger.warning('Drop editor is no longer available, placing in current context: %s', e)
+
+        self.unpacker._place_nodes_in_editors(self._imported_nodegroups, place_at_cursor, mouse_coords)
@@ -0,0 +1,252 @@
+import os
+import json
+import mmap
+import struct
+import hashlib
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, List, Optional, Iterator
+
+from .node_archive import NodeArchive
+from .compact_manifest import CompactManifestError
+from .package_config import ConfigError
+from .import_cache import is_content_hash
+from .manifest_schema import ManifestSchemaError, validate_manifest
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+CATALOG_FILENAME = ".node_catalog"
+CATALOG_MAGIC = b"NODECAT1"
+CATALOG_VERSION = 1
+
+# magic, version, record_count, bucket_count, name_table, hash_table, record_table
+_HEADER = struct.Struct('<8sIIIQQQ')
+_BUCKET = struct.Struct('<QI')
+_RECORD_REF = struct.Struct('<QI')
+_EMPTY_SLOT = 0
+
+# Manifest sections a catalog record is built from; nodes and links are never needed
+SUMMARY_SECTIONS = ('nodegroup_info', 'interface', 'dependencies')
+
+
+def _key_hash(key: str) -> int:
+    # Never 0 so an all-zero bucket can mark an empty slot
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little') or 1
+
+
+def read_package_summary(filepath: str) -> dict:
+    """Read just the central directory, manifest and .config of a package.
+
+    Raises ManifestSchemaError if the summarized manifest sections do not match the schema.
+    """
+    with NodeArchive(filepath) as archive:
+        config_data = archive.read_config() or {}
+        metadata = archive.read_manifest(SUMMARY_SECTIONS) or {}
+    # A name or socket of the wrong type would break the catalog of the whole folder
+    validate_manifest(metadata, sections=SUMMARY_SECTIONS)
+
+    nodegroup_info = metadata.get('nodegroup_info', {})
+    interface = metadata.get('interface', {})
+
+    return {
+        'name': nodegroup_info.get('name', ''),
+        'package_name': nodegroup_info.get('package_name', ''),
+        'description': nodegroup_info.get('description', ''),
+        'type': nodegroup_info.get('type', ''),
+        'blender_version': nodegroup_info.get('blender_version', ''),
+        # Catalog hashes are used to find a package's folder in the stores, so malformed ones are dropped
+        'hash': config_data.get('hash') if is_content_hash(config_data.get('hash')) else '',
+        'inputs': [[s.get('name'), s.get('socket_type')] for s in interface.get('inputs', [])],
+        'outputs': [[s.get('name'), s.get('socket_type')] for s in interface.get('outputs', [])],
+        'dependencies': metadata.get('dependencies', {}).get('node_groups', [])
+    }
+
+
+class LibraryCatalog:
+    """Memory-mapped, read-only view of a catalog written by LibraryIndexer."""
+
+    def __init__(self, catalog_path: str):
+        self.catalog_path = catalog_path
+        self._file = open(catalog_path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Catalog is empty: {catalog_path}")
+
+        (magic, version, self.record_count, self.bucket_count,
+         self._name_table, self._hash_table, self._record_table) = _HEADER.unpack_from(self._mmap, 0)
+
+        if magic != CATALOG_MAGIC or version != CATALOG_VERSION:
+            self.close()
+            raise ValueError(f"Not a supported .node catalog: {catalog_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def record(self, index: int) -> dict:
+        offset, length = _RECORD_REF.unpack_from(self._mmap, self._record_table + index * _RECORD_REF.size)
+        return json.loads(self._mmap[offset:offset + length])
+
+    def __iter__(self) -> Iterator[dict]:
+        for index in range(self.record_count):
+            yield self.record(index)
+
+    def _probe(self, table_offset: int, key: str, field: str) -> Iterator[dict]:
+        if self.bucket_count == 0:
+            return
+        key_hash = _key_hash(key)
+        slot = key_hash % self.bucket_count
+        for _ in range(self.bucket_count):
+            stored_hash, record_index = _BUCKET.unpack_from(self._mmap, table_offset + slot * _BUCKET.size)
+            if stored_hash == _EMPTY_SLOT:
+                return
+            if stored_hash == key_hash:
+                record = self.record(record_index)
+                if record.get(field) == key:
+                    yield record
+            slot = (slot + 1) % self.bucket_count
+
+    def find_by_name(self, name: str) -> List[dict]:
+        return list(self._probe(self._name_table, name, 'name'))
+
+    def find_by_hash(self, content_hash: str) -> Optional[dict]:
+        return next(self._probe(self._hash_table, content_hash.lower(), 'hash'), None)
+
+
+class LibraryIndexer:
+    """Builds a catalog of a folder of .node files, rescanning only files whose mtime or size changed."""
+
+    def __init__(self, library_dir: str, catalog_path: Optional[str] = None, max_workers: Optional[int] = None):
+        self.library_dir = library_dir
+        self.catalog_path = catalog_path or os.path.join(library_dir, CATALOG_FILENAME)
+        self.max_workers = max_workers
+        self.scanned_count = 0
+        self.reused_count = 0
+        self.errors = []
+
+    def _find_packages(self) -> List[Tuple[str, os.stat_result]]:
+        packages = []
+        for root, _, files in os.walk(self.library_dir):
+            for filename in files:
+                if filename.lower().endswith('.node'):
+                    full_path = os.path.join(root, filename)
+                    packages.append((full_path, os.stat(full_path)))
+        return packages
+
+    def _load_previous_records(self) -> dict:
+        if not os.path.exists(self.catalog_path):
+            return {}
+        try:
+            with LibraryCatalog(self.catalog_path) as catalog:
+                return {record['path']: record for record in catalog}
+        except (OSError, ValueError, json.JSONDecodeError) as e:
+            logger.warning('Ignoring unreadable catalog %s: %s', self.catalog_path, e)
+            return {}
+
+    def _scan_package(self, full_path: str, stat: os.stat_result) -> Optional[dict]:
+        try:
+            record = read_package_summary(full_path)
+        except (OSError, zipfile.BadZipFile, json.JSONDecodeError, UnicodeDecodeError, CompactManifestError,
+                ConfigError, ManifestSchemaError) as e:
+            self.errors.append(f"{full_path}: {e}")
+            return None
+        record['path'] = os.path.relpath(full_path, self.library_dir).replace(os.sep, '/')
+        record['mtime_ns'] = stat.st_mtime_ns
+        record['size'] = stat.st_size
+        return record
+
+    def scan(self) -> Tuple[bool, str]:
+        try:
+            previous = self._load_previous_records()
+            records = []
+            to_scan = []
+
+            for full_path, stat in self._find_packages():
+                relative_path = os.path.relpath(full_path, self.library_dir).replace(os.sep, '/')
+                old = previous.get(relative_path)
+                if old and old.get('mtime_ns') == stat.st_mtime_ns and old.get('size') == stat.st_size:
+                    records.append(old)
+                else:
+                    to_scan.append((full_path, stat))
+
+            self.reused_count = len(records)
+
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="node_index") as executor:
+                scanned = list(executor.map(lambda job: self._scan_package(*job), to_scan))
+            new_records = [record for record in scanned if record is not None]
+            self.scanned_count = len(new_records)
+            records.extend(new_records)
+
+            records.sort(key=lambda record: record['path'])
+            self._write_catalog(records)
+
+            return True, f"Indexed {len(records)} package(s): {self.scanned_count} scanned, {self.reused_count} unchanged"
+
+        except Exception as e:
+            return False, f"Error indexing library {self.library_dir}: {str(e)}"
+
+    def _build_table(self, records: List[dict], field: str, bucket_count: int) -> bytearray:
+        table = bytearray(bucket_count * _BUCKET.size)
+        for index, record in enumerate(records):
+            key = record.get(field)
+            if not key:
+                continue
+            key_hash = _key_hash(key)
+            slot = key_hash % bucket_count
+            while _BUCKET.unpack_from(table, slot * _BUCKET.size)[0] != _EMPTY_SLOT:
+                slot = (slot + 1) % bucket_count
+            _BUCKET.pack_into(table, slot * _BUCKET.size, key_hash, index)
+        return table
+
+    def _write_catalog(self, records: List[dict]):
+        # Keep the load factor at or below 0.5 so probes stay short
+        bucket_count = max(8, len(records) * 2)
+        name_table = self._build_table(records, 'name', bucket_count)
+        hash_table = self._build_table(records, 'hash', bucket_count)
+
+        blobs = [json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8') for record in records]
+
+        name_table_offset = _HEADER.size
+        hash_table_offset = name_table_offset + len(name_table)
+        record_table_offset = hash_table_offset + len(hash_table)
+        blob_offset = record_table_offset + len(records) * _RECORD_REF.size
+
+        record_table = bytearray()
+        for blob in blobs:
+            record_table += _RECORD_REF.pack(blob_offset, len(blob))
+            blob_offset += len(blob)
+
+        header = _HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION, len(records), bucket_count,
+                              name_table_offset, hash_table_offset, record_table_offset)
+
+        partial_path = f"{self.catalog_path}.partial"
+        with open(partial_path, 'wb') as f:
+            f.write(header)
+            f.write(name_table)
+            f.write(hash_table)
+            f.write(record_table)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(partial_path, self.catalog_path)
+
+
+def index_library(library_dir: str, catalog_path: Optional[str] = None) -> Tuple[bool, str]:
+    indexer = LibraryIndexer(library_dir, catalog_path)
+    success, message = indexer.scan()
+    for error in indexer.errors:
+        logger.warning('Skipped unreadable package %s', error)
+    return success, message
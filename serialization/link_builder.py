@@ -0,0 +1,87 @@
+import time
+from typing import Iterable, Tuple, Optional, List
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+# (from_node name, from_socket identifier, to_node name, to_socket identifier)
+LinkSpec = Tuple[str, str, str, str]
+
+
+class SocketIndex:
+    """Identifier -> socket maps, built once per node the first time one of its sockets is needed."""
+
+    def __init__(self, nodes_by_name: dict):
+        self.nodes_by_name = nodes_by_name
+        self._outputs = {}
+        self._inputs = {}
+
+    def _socket_map(self, cache: dict, node_name: str, direction: str) -> Optional[dict]:
+        sockets = cache.get(node_name)
+        if sockets is None:
+            node = self.nodes_by_name.get(node_name)
+            if node is None:
+                return None
+            sockets = {}
+            for socket in getattr(node, direction):
+                # Keep the first match, like the linear scans this replaces
+                sockets.setdefault(socket.identifier, socket)
+            cache[node_name] = sockets
+        return sockets
+
+    def output(self, node_name: str, identifier: str):
+        sockets = self._socket_map(self._outputs, node_name, 'outputs')
+        return sockets.get(identifier) if sockets is not None else None
+
+    def input(self, node_name: str, identifier: str):
+        sockets = self._socket_map(self._inputs, node_name, 'inputs')
+        return sockets.get(identifier) if sockets is not None else None
+
+
+class LinkBuilder:
+    """Resolves all links of a tree up front, then creates them in one pass."""
+
+    def __init__(self, node_tree, nodes_by_name: dict):
+        self.node_tree = node_tree
+        self.sockets = SocketIndex(nodes_by_name)
+        self.created = 0
+        self.errors: List[str] = []
+        self.elapsed = 0.0
+
+    def build(self, links: Iterable[LinkSpec]) -> int:
+        start = time.perf_counter()
+        nodes_by_name = self.sockets.nodes_by_name
+
+        resolved = []
+        for from_node, from_socket_id, to_node, to_socket_id in links:
+            if from_node not in nodes_by_name or to_node not in nodes_by_name:
+                self.errors.append(f"Could not find nodes for link: {from_node} -> {to_node}")
+                continue
+            from_socket = self.sockets.output(from_node, from_socket_id)
+            to_socket = self.sockets.input(to_node, to_socket_id)
+            if from_socket is None or to_socket is None:
+                self.errors.append(f"Could not find sockets for link: {from_socket_id} -> {to_socket_id}")
+                continue
+            resolved.append((from_socket, to_socket))
+
+        # The links come from a valid tree, so the per-link limit check (which counts
+        # every existing link of the tree) is skipped; it made big rebuilds quadratic.
+        new_link = self.node_tree.links.new
+        for from_socket, to_socket in resolved:
+            try:
+                new_link(from_socket, to_socket, verify_limits=False)
+                self.created += 1
+            except Exception as e:
+                self.errors.append(f"Error creating link {from_socket.identifier} -> {to_socket.identifier}: {e}")
+
+        self.elapsed = time.perf_counter() - start
+        return self.created
+
+
+def build_links(node_tree, nodes_by_name: dict, links: Iterable[LinkSpec]) -> LinkBuilder:
+    builder = LinkBuilder(node_tree, nodes_by_name)
+    builder.build(links)
+    for error in builder.errors:
+        logger.warning('%s', error)
+    logger.info('Created %s link(s) in %.1f ms', builder.created, builder.elapsed * 1000)
+    return builder
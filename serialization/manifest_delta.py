@@ -0,0 +1,199 @@
+"""Delta manifests: what changed in a node group between two exported versions.
+
+Entries are matched by the keys NodeGroupSerializer already writes: nodes by name,
+links by their endpoints (node names and socket identifiers) and interface sockets
+by identifier. A delta holds::
+
+    delta_info      format, root group name, content hashes of the base and target packages
+    nodegroup_info  the target's nodegroup_info
+    nodes           added (full records), changed (name + changed top-level fields), removed (names)
+    links           added, changed (is_muted), removed (endpoints only)
+    interface       per direction: added, changed (full records), removed, and the new order if it moved
+
+A node whose bl_idname changed is removed and added again, so every link touching
+it is in 'added'. The manifest only describes the root graph, so versions whose
+nested groups differ cannot be expressed as a delta; diff_manifests refuses them.
+"""
+
+import json
+from typing import List, Optional
+
+DELTA_MANIFEST_EXT = '.delta'
+DELTA_FORMAT_VERSION = 1
+
+# Selection is not part of the graph, like VOLATILE_NODE_FIELDS in nodegroup_serializer
+IGNORED_NODE_FIELDS = ('select',)
+LINK_KEY_FIELDS = ('from_node', 'from_socket', 'to_node', 'to_socket')
+INTERFACE_DIRECTIONS = ('inputs', 'outputs')
+
+
+class DeltaError(ValueError):
+    pass
+
+
+def _link_key(link: dict) -> tuple:
+    return tuple(link.get(field) for field in LINK_KEY_FIELDS)
+
+
+def _diff_nodes(base_nodes: list, target_nodes: list):
+    base_by_name = {node.get('name'): node for node in base_nodes}
+    added, changed, removed = [], [], []
+    recreated = set()
+    target_names = set()
+
+    for node in target_nodes:
+        name = node.get('name')
+        target_names.add(name)
+        before = base_by_name.get(name)
+        if before is None or before.get('bl_idname') != node.get('bl_idname'):
+            if before is not None:
+                removed.append(name)
+                recreated.add(name)
+            added.append(node)
+            continue
+        fields = {
+            key: value for key, value in node.items()
+            if key not in IGNORED_NODE_FIELDS and before.get(key) != value
+        }
+        # Fields the target no longer has are cleared
+        fields.update((key, None) for key in before if key not in node and key not in IGNORED_NODE_FIELDS)
+        if fields:
+            changed.append({'name': name, 'fields': fields})
+
+    gone = [name for name in base_by_name if name not in target_names]
+    removed.extend(gone)
+    return {'added': added, 'changed': changed, 'removed': removed}, recreated | set(gone)
+
+
+def _diff_links(base_links: list, target_links: list, replaced_nodes: set) -> dict:
+    base_by_key = {_link_key(link): link for link in base_links}
+    target_keys = set()
+    added, changed = [], []
+
+    for link in target_links:
+        key = _link_key(link)
+        target_keys.add(key)
+        before = base_by_key.get(key)
+        # Links of removed or recreated nodes are gone from the tree by the time links are added
+        if before is None or key[0] in replaced_nodes or key[2] in replaced_nodes:
+            added.append(link)
+        elif bool(before.get('is_muted')) != bool(link.get('is_muted')):
+            changed.append(link)
+
+    removed = [
+        dict(zip(LINK_KEY_FIELDS, key)) for key in base_by_key
+        if key not in target_keys and key[0] not in replaced_nodes and key[2] not in replaced_nodes
+    ]
+    return {'added': added, 'changed': changed, 'removed': removed}
+
+
+def _diff_sockets(base_sockets: list, target_sockets: list) -> Optional[dict]:
+    base_by_id = {socket.get('identifier'): socket for socket in base_sockets}
+    target_ids = [socket.get('identifier') for socket in target_sockets]
+    kept_ids = set(target_ids)
+    added = [socket for socket in target_sockets if socket.get('identifier') not in base_by_id]
+    changed = [
+        socket for socket in target_sockets
+        if socket.get('identifier') in base_by_id and base_by_id[socket.get('identifier')] != socket
+    ]
+    removed = [
+        {'identifier': identifier, 'name': socket.get('name')}
+        for identifier, socket in base_by_id.items() if identifier not in kept_ids
+    ]
+
+    result = {}
+    for key, entries in (('added', added), ('changed', changed), ('removed', removed)):
+        if entries:
+            result[key] = entries
+    # Patching keeps the base order and appends new sockets; anything else needs the explicit order
+    kept = [identifier for identifier in base_by_id if identifier in kept_ids]
+    if kept + [socket.get('identifier') for socket in added] != target_ids:
+        result['order'] = target_ids
+    return result or None
+
+
+def _diff_interface(base_interface: dict, target_interface: dict) -> dict:
+    interface = {}
+    for direction in INTERFACE_DIRECTIONS:
+        changes = _diff_sockets(base_interface.get(direction, []), target_interface.get(direction, []))
+        if changes:
+            interface[direction] = changes
+    return interface
+
+
+def nested_group_changes(base: dict, target: dict) -> List[str]:
+    """Nested groups the target uses that the base does not have, or has in another version."""
+    root = target.get('nodegroup_info', {}).get('name')
+    base_dependencies = base.get('dependencies', {})
+    target_dependencies = target.get('dependencies', {})
+
+    base_groups = set(base_dependencies.get('node_groups', []))
+    changes = {name for name in target_dependencies.get('node_groups', []) if name not in base_groups}
+    # Only packages exported with bundled dependencies carry per-group hashes
+    base_hashes = base_dependencies.get('subgroups', {})
+    changes.update(
+        name for name, group_hash in target_dependencies.get('subgroups', {}).items()
+        if name in base_hashes and base_hashes[name] != group_hash
+    )
+    changes.discard(root)
+    return sorted(changes)
+
+
+def diff_manifests(base: dict, target: dict) -> dict:
+    """The delta that turns the base manifest's graph into the target's (without delta_info)."""
+    base_name = base.get('nodegroup_info', {}).get('name')
+    target_name = target.get('nodegroup_info', {}).get('name')
+    if base_name != target_name:
+        raise DeltaError(f"Packages hold different node groups: '{base_name}' and '{target_name}'")
+
+    nested = nested_group_changes(base, target)
+    if nested:
+        raise DeltaError(f"Nested node group(s) added or changed, which a delta cannot carry: {', '.join(nested)}")
+
+    nodes, replaced = _diff_nodes(base.get('nodes', []), target.get('nodes', []))
+    return {
+        'nodegroup_info': target.get('nodegroup_info', {}),
+        'nodes': nodes,
+        'links': _diff_links(base.get('links', []), target.get('links', []), replaced),
+        'interface': _diff_interface(base.get('interface', {}), target.get('interface', {})),
+    }
+
+
+def describe_delta(delta: dict) -> str:
+    nodes = delta.get('nodes', {})
+    links = delta.get('links', {})
+    parts = [
+        f"{len(nodes.get('added', []))} node(s) added, {len(nodes.get('changed', []))} changed, "
+        f"{len(nodes.get('removed', []))} removed",
+        f"{len(links.get('added', []))} link(s) added, {len(links.get('changed', []))} changed, "
+        f"{len(links.get('removed', []))} removed",
+    ]
+    sockets = sum(
+        len(changes.get(key, []))
+        for changes in delta.get('interface', {}).values()
+        for key in ('added', 'changed', 'removed')
+    )
+    if sockets:
+        parts.append(f"{sockets} interface socket(s) changed")
+    return "; ".join(parts)
+
+
+def dump_delta(delta: dict) -> bytes:
+    return json.dumps(delta, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+
+def load_delta(text: str) -> dict:
+    try:
+        delta = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise DeltaError(f"Malformed delta manifest: {e}") from e
+    if not isinstance(delta, dict) or not isinstance(delta.get('delta_info'), dict):
+        raise DeltaError("Malformed delta manifest: no delta_info")
+
+    info = delta['delta_info']
+    if info.get('format') != DELTA_FORMAT_VERSION:
+        raise DeltaError(f"Unsupported delta format {info.get('format')!r}, this version reads {DELTA_FORMAT_VERSION}")
+    missing = [key for key in ('name', 'base_hash', 'target_hash') if not info.get(key)]
+    if missing:
+        raise DeltaError(f"Malformed delta manifest: delta_info has no {', '.join(missing)}")
+    return delta
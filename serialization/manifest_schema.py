@@ -0,0 +1,435 @@
+"""Versioned manifest schema, checked in one pass before anything is built from a manifest.
+
+A schema is declared with the small vocabulary below (Record, ListOf, MapOf, Nullable
+and plain Python types) and compiled once per version into nested closures, so
+validating a manifest does no schema interpretation. Graph-level rules that a
+declaration cannot express (unique node names, link endpoints, default values that
+match their socket type, known bl_idnames) run in the same pass over nodes and links.
+Validation stops at MAX_ERRORS, so a broken package is rejected as soon as it is
+clearly broken.
+"""
+
+from typing import Callable, Iterable, List, Optional
+
+# Written into nodegroup_info by the serializer; manifests without it are version 1
+SCHEMA_VERSION = 1
+MAX_ERRORS = 20
+# Distinct row shapes remembered per record declaration
+MAX_SHAPES = 4096
+
+NUMBER = 'number'
+INTEGER = 'integer'
+
+
+class ManifestSchemaError(ValueError):
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        shown = "; ".join(errors[:3])
+        more = f" (and {len(errors) - 3} more)" if len(errors) > 3 else ""
+        super().__init__(f"Invalid manifest: {shown}{more}")
+
+
+class _Rejected(Exception):
+    """Raised once MAX_ERRORS are collected, to stop walking the manifest."""
+
+
+class Record:
+    def __init__(self, fields: dict, required: Iterable[str] = ()):
+        self.fields = fields
+        self.required = tuple(required)
+
+
+class ListOf:
+    def __init__(self, item, min_length: int = 0, max_length: Optional[int] = None):
+        self.item = item
+        self.min_length = min_length
+        self.max_length = max_length
+
+
+class MapOf:
+    def __init__(self, value):
+        self.value = value
+
+
+class Nullable:
+    def __init__(self, spec):
+        self.spec = spec
+
+
+class OneOf:
+    def __init__(self, *specs, description: str = ""):
+        self.specs = specs
+        self.description = description
+
+
+_TYPE_NAMES = {str: "a string", bool: "a boolean", dict: "an object", list: "a list",
+               NUMBER: "a number", INTEGER: "an integer"}
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_integer(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class _Errors(list):
+    def add(self, message: str):
+        self.append(message)
+        if len(self) >= MAX_ERRORS:
+            raise _Rejected()
+
+
+class _Trial(list):
+    """Errors of one OneOf alternative, never cut short."""
+    add = list.append
+
+
+# Paths are (parent, key) pairs, only formatted into strings when something is wrong
+def format_path(path) -> str:
+    parts = []
+    while isinstance(path, tuple):
+        path, key = path
+        parts.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return path + "".join(reversed(parts))
+
+
+def _scalar_test(spec) -> Optional[tuple]:
+    """(predicate, description) for declarations that a single value test covers, else None."""
+    if isinstance(spec, Nullable):
+        inner = _scalar_test(spec.spec)
+        if inner is None:
+            return None
+        test, expected = inner
+        return (lambda value: value is None or test(value)), f"{expected} or null"
+    if spec is NUMBER:
+        return _is_number, _TYPE_NAMES[NUMBER]
+    if spec is INTEGER:
+        return _is_integer, _TYPE_NAMES[INTEGER]
+    if isinstance(spec, type):
+        return (lambda value: isinstance(value, spec)), _TYPE_NAMES.get(spec, spec.__name__)
+    return None
+
+
+def compile_spec(spec) -> Callable:
+    """Turn a declaration into a check(value, path, errors) closure."""
+    if spec is None:
+        return lambda value, path, errors: None
+
+    if isinstance(spec, Nullable):
+        inner = compile_spec(spec.spec)
+
+        def check_nullable(value, path, errors):
+            if value is not None:
+                inner(value, path, errors)
+        return check_nullable
+
+    if isinstance(spec, OneOf):
+        alternatives = [compile_spec(alternative) for alternative in spec.specs]
+        description = spec.description
+
+        def check_one_of(value, path, errors):
+            for check in alternatives:
+                trial = _Trial()
+                check(value, path, trial)
+                if not trial:
+                    return
+            errors.add(f"{format_path(path)} must be {description}")
+        return check_one_of
+
+    if spec is NUMBER or spec is INTEGER:
+        test = _is_number if spec is NUMBER else _is_integer
+        expected = _TYPE_NAMES[spec]
+
+        def check_number(value, path, errors):
+            if not test(value):
+                errors.add(f"{format_path(path)} must be {expected}")
+        return check_number
+
+    if isinstance(spec, type):
+        expected = _TYPE_NAMES.get(spec, spec.__name__)
+
+        def check_type(value, path, errors):
+            if not isinstance(value, spec):
+                errors.add(f"{format_path(path)} must be {expected}")
+        return check_type
+
+    if isinstance(spec, ListOf):
+        check_item = compile_spec(spec.item)
+        numbers = spec.item is NUMBER
+        min_length, max_length = spec.min_length, spec.max_length
+        if max_length is None:
+            expected = f"at least {min_length}"
+        else:
+            expected = str(min_length) if min_length == max_length else f"{min_length} to {max_length}"
+
+        def check_list(value, path, errors):
+            if not isinstance(value, list):
+                errors.add(f"{format_path(path)} must be a list")
+                return
+            if len(value) < min_length or (max_length is not None and len(value) > max_length):
+                errors.add(f"{format_path(path)} has {len(value)} item(s), expected {expected}")
+                return
+            if numbers:
+                for index, item in enumerate(value):
+                    if type(item) is not float and not _is_number(item):
+                        errors.add(f"{format_path((path, index))} must be a number")
+                return
+            for index, item in enumerate(value):
+                check_item(item, (path, index), errors)
+        return check_list
+
+    if isinstance(spec, MapOf):
+        check_value = compile_spec(spec.value)
+
+        def check_map(value, path, errors):
+            if not isinstance(value, dict):
+                errors.add(f"{format_path(path)} must be an object")
+                return
+            for key, item in value.items():
+                check_value(item, (path, key), errors)
+        return check_map
+
+    if isinstance(spec, Record):
+        scalars = [(key, _scalar_test(field)) for key, field in spec.fields.items() if _scalar_test(field)]
+        nested = [(key, compile_spec(field)) for key, field in spec.fields.items() if not _scalar_test(field)]
+        required = spec.required
+        # Rows of one manifest mostly share their keys and value types. Once such a shape has
+        # passed the required and scalar field checks, rows with that shape skip them.
+        valid_shapes = set()
+
+        def check_record(value, path, errors):
+            if not isinstance(value, dict):
+                errors.add(f"{format_path(path)} must be an object")
+                return
+            shape = (tuple(value), tuple(map(type, value.values())))
+            if shape not in valid_shapes:
+                error_count = len(errors)
+                for key in required:
+                    if key not in value:
+                        errors.add(f"{format_path(path)} is missing '{key}'")
+                for key, (test, expected) in scalars:
+                    if key in value and not test(value[key]):
+                        errors.add(f"{format_path((path, key))} must be {expected}")
+                if len(errors) == error_count and len(valid_shapes) < MAX_SHAPES:
+                    valid_shapes.add(shape)
+            for key, check_field in nested:
+                if key in value:
+                    check_field(value[key], (path, key), errors)
+        return check_record
+
+    raise TypeError(f"Unsupported schema declaration: {spec!r}")
+
+
+# Default values per socket type; sockets of other types are not checked
+_VECTOR = ListOf(NUMBER, 2, 4)
+# Older exports wrote vectors and colors as their repr, like "<Vector (1.0000, 1.0000, 1.0000)>"
+_ARRAY_DEFAULT = OneOf(ListOf(NUMBER, 2, 4), str, description="a list of 2 to 4 numbers")
+DEFAULT_VALUE_SPECS = {
+    'VALUE': NUMBER,
+    'INT': INTEGER,
+    'BOOLEAN': bool,
+    'STRING': str,
+    'MENU': str,
+    'VECTOR': _ARRAY_DEFAULT,
+    'ROTATION': _ARRAY_DEFAULT,
+    'RGBA': _ARRAY_DEFAULT,
+    'OBJECT': str,
+    'IMAGE': str,
+    'COLLECTION': str,
+    'TEXTURE': str,
+    'MATERIAL': str,
+}
+
+_SOCKET = Record({
+    'name': str,
+    'identifier': str,
+    'type': str,
+    'bl_idname': str,
+    'enabled': bool,
+    'hide': bool,
+    'hide_value': bool,
+}, required=('identifier',))
+
+_INTERFACE_SOCKET = Record({
+    'name': str,
+    'identifier': str,
+    'socket_type': str,
+    'in_out': str,
+    'description': str,
+}, required=('name',))
+
+SCHEMAS = {
+    1: {
+        'nodegroup_info': Record({
+            'name': str,
+            'package_name': str,
+            'type': str,
+            'schema_version': INTEGER,
+        }, required=('name',)),
+        'interface': Record({
+            'inputs': ListOf(_INTERFACE_SOCKET),
+            'outputs': ListOf(_INTERFACE_SOCKET),
+        }),
+        'node': Record({
+            'name': str,
+            'label': str,
+            'bl_idname': str,
+            'type': str,
+            'location': _VECTOR,
+            'width': NUMBER,
+            'height': NUMBER,
+            'hide': bool,
+            'mute': bool,
+            'select': bool,
+            'inputs': ListOf(_SOCKET),
+            'outputs': ListOf(_SOCKET),
+            'properties': dict,
+            'node_tree': Nullable(str),
+        }, required=('name', 'bl_idname')),
+        'link': Record({
+            'from_node': str,
+            'from_socket': str,
+            'to_node': str,
+            'to_socket': str,
+        }, required=('from_node', 'from_socket', 'to_node', 'to_socket')),
+        'layout': dict,
+        'dependencies': Record({
+            'node_groups': ListOf(str),
+            'subgroups': MapOf(str),
+            'children': MapOf(ListOf(str)),
+        }),
+    },
+}
+
+
+class ManifestValidator:
+    """All checks of one schema version, compiled once and reused for every manifest."""
+
+    def __init__(self, version: int, schema: dict):
+        self.version = version
+        self.sections = {key: compile_spec(spec) for key, spec in schema.items() if key not in ('node', 'link')}
+        self.check_node = compile_spec(schema['node'])
+        self.check_link = compile_spec(schema['link'])
+        self.default_checks = {socket_type: compile_spec(spec) for socket_type, spec in DEFAULT_VALUE_SPECS.items()}
+
+    def validate(self, metadata, known_node_type: Optional[Callable[[str], bool]] = None,
+                 sections: Optional[Iterable[str]] = None) -> List[str]:
+        """Every problem found, up to MAX_ERRORS. Sections absent from the manifest are not checked."""
+        errors = _Errors()
+        try:
+            if not isinstance(metadata, dict):
+                errors.add("manifest must be an object")
+                return list(errors)
+            if sections is not None:
+                metadata = {key: value for key, value in metadata.items() if key in sections}
+            for key, check in self.sections.items():
+                if key in metadata:
+                    check(metadata[key], key, errors)
+            if 'nodes' in metadata:
+                sockets = self._validate_nodes(metadata['nodes'], errors, known_node_type)
+                if 'links' in metadata:
+                    self._validate_links(metadata['links'], sockets, errors)
+        except _Rejected:
+            pass
+        return list(errors)
+
+    def _validate_nodes(self, nodes, errors: _Errors, known_node_type) -> dict:
+        """Check every node, returning name -> (output identifiers, input identifiers) for the links."""
+        sockets = {}
+        if not isinstance(nodes, list):
+            errors.add("nodes must be a list")
+            return sockets
+
+        check_node = self.check_node
+        default_checks = self.default_checks
+        type_known = {}
+        for index, node in enumerate(nodes):
+            path = ('nodes', index)
+            error_count = len(errors)
+            check_node(node, path, errors)
+            if len(errors) > error_count or not isinstance(node, dict):
+                continue
+
+            name = node['name']
+            if name in sockets:
+                errors.add(f"{format_path(path)}: duplicate node name '{name}'")
+
+            bl_idname = node['bl_idname']
+            if known_node_type is not None:
+                if bl_idname not in type_known:
+                    type_known[bl_idname] = known_node_type(bl_idname)
+                if not type_known[bl_idname]:
+                    errors.add(f"{format_path(path)}: unknown node type '{bl_idname}'")
+
+            inputs = node.get('inputs', [])
+            for socket_index, socket in enumerate(inputs):
+                value = socket.get('default_value')
+                check_default = default_checks.get(socket.get('type'))
+                if value is not None and check_default is not None:
+                    check_default(value, (((path, 'inputs'), socket_index), 'default_value'), errors)
+
+            sockets[name] = (
+                {socket['identifier'] for socket in node.get('outputs', [])} if 'outputs' in node else None,
+                {socket['identifier'] for socket in inputs} if 'inputs' in node else None,
+            )
+        return sockets
+
+    def _validate_links(self, links, sockets: dict, errors: _Errors):
+        if not isinstance(links, list):
+            errors.add("links must be a list")
+            return
+
+        check_link = self.check_link
+        for index, link in enumerate(links):
+            path = ('links', index)
+            error_count = len(errors)
+            check_link(link, path, errors)
+            if len(errors) > error_count:
+                continue
+
+            for end, socket_key, direction in (('from_node', 'from_socket', 0), ('to_node', 'to_socket', 1)):
+                node_sockets = sockets.get(link[end])
+                if node_sockets is None:
+                    errors.add(f"{format_path(path)}: {end} '{link[end]}' is not a node of this manifest")
+                    continue
+                identifiers = node_sockets[direction]
+                # Nodes that do not list their sockets cannot be checked further
+                if identifiers is not None and link[socket_key] not in identifiers:
+                    errors.add(f"{format_path(path)}: node '{link[end]}' has no {'output' if direction == 0 else 'input'} "
+                               f"'{link[socket_key]}'")
+
+
+_validators = {}
+
+
+def get_validator(version: int = SCHEMA_VERSION) -> ManifestValidator:
+    validator = _validators.get(version)
+    if validator is None:
+        if version not in SCHEMAS:
+            raise ManifestSchemaError([f"schema version {version} is not supported, "
+                                       f"this addon reads up to version {SCHEMA_VERSION}"])
+        validator = _validators[version] = ManifestValidator(version, SCHEMAS[version])
+    return validator
+
+
+def manifest_version(metadata: dict) -> int:
+    info = metadata.get('nodegroup_info') if isinstance(metadata, dict) else None
+    version = info.get('schema_version', 1) if isinstance(info, dict) else 1
+    if not _is_integer(version):
+        raise ManifestSchemaError([f"nodegroup_info.schema_version must be an integer, got {version!r}"])
+    return version
+
+
+def validate_manifest(metadata: dict, known_node_type: Optional[Callable[[str], bool]] = None,
+                      sections: Optional[Iterable[str]] = None):
+    """Raise ManifestSchemaError unless the manifest matches the schema version it declares.
+
+    known_node_type, when given, is asked once per distinct bl_idname whether this
+    Blender has that node type. sections limits the check to the top-level keys a
+    caller actually uses.
+    """
+    errors = get_validator(manifest_version(metadata)).validate(metadata, known_node_type, sections)
+    if errors:
+        raise ManifestSchemaError(errors)
@@ -0,0 +1,368 @@
+import os
+import json
+import mmap
+import zlib
+import struct
+import hashlib
+import zipfile
+from typing import Tuple, List, Optional
+
+from .node_packager import CONFIG_FILENAME, compute_content_hash
+from .compact_manifest import COMPACT_MANIFEST_EXT, read_sections
+from .manifest_delta import DELTA_MANIFEST_EXT, load_delta
+from .package_config import ConfigError, PackageConfig
+from . import profiling
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+# Packages at least this large are memory-mapped instead of read through a buffered file
+MMAP_THRESHOLD = 4 * 1024 * 1024
+
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+
+class IntegrityError(Exception):
+    pass
+
+
+class NodeArchive:
+    """Reads a .node package directly from its zip stream without extracting it.
+
+    Large packages are memory-mapped (use_mmap=None picks this from MMAP_THRESHOLD).
+    Entries are still resolved from the central directory by zipfile, but stored
+    members are then read as slices of the mapping: member_view hands them out
+    without a copy, and extraction, CRC check and hashing work on those slices
+    instead of buffered reads. Compressed members always go through zipfile.
+    """
+
+    def __init__(self, filepath: str, use_mmap: Optional[bool] = None):
+        self.filepath = filepath
+        self.config_name = None
+        self.json_names = []
+        self.compact_names = []
+        self.blend_names = []
+        self.delta_names = []
+        self.config = None
+        self._entry_hashes = {}
+        # Per-entry records every streamed member is checked against, once verify_entries is called
+        self._expected = {}
+        self._file = None
+        self._map = None
+        size = os.path.getsize(filepath)
+        with profiling.stage('open', size):
+            if use_mmap is None:
+                use_mmap = size >= MMAP_THRESHOLD
+            if use_mmap and size:
+                self._open_map(filepath)
+            # zipfile reads the central directory and compressed members through the handle the map was made from
+            self._zip = zipfile.ZipFile(self._file if self._file is not None else filepath, 'r')
+            self._index_members()
+
+    def _open_map(self, filepath: str):
+        self._file = open(filepath, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logger.debug('Could not memory-map %s, reading it buffered: %s', os.path.basename(filepath), e)
+            self._file.close()
+            self._file = None
+
+    def _index_members(self):
+        for info in self._zip.infolist():
+            if info.is_dir():
+                continue
+            filename = os.path.basename(info.filename)
+            if filename == CONFIG_FILENAME:
+                self.config_name = info.filename
+                continue
+            _, ext = os.path.splitext(filename)
+            if ext.lower() == '.json':
+                self.json_names.append(info.filename)
+            elif ext.lower() == COMPACT_MANIFEST_EXT:
+                self.compact_names.append(info.filename)
+            elif ext.lower() == '.blend':
+                self.blend_names.append(info.filename)
+            elif ext.lower() == DELTA_MANIFEST_EXT:
+                self.delta_names.append(info.filename)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def memory_mapped(self) -> bool:
+        return self._map is not None
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A view from member_view is still alive; the mapping goes away with it
+                logger.debug('Memory map of %s still in use at close', os.path.basename(self.filepath))
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def namelist(self) -> List[str]:
+        return self._zip.namelist()
+
+    def validate_structure(self, required_files) -> Tuple[bool, str]:
+        found_files = set()
+        if self.config_name:
+            found_files.add('.config')
+        if self.json_names or self.compact_names:
+            found_files.add('.json')
+        if self.blend_names:
+            found_files.add('.blend')
+
+        missing_files = set(required_files) - found_files
+        if missing_files:
+            missing_str = ", ".join(sorted(missing_files))
+            return False, f"Malformed .node file - missing required files: {missing_str}"
+
+        return True, "Valid .node file structure"
+
+    def _stored_view(self, info: zipfile.ZipInfo) -> Optional[memoryview]:
+        """The data of a stored member as a slice of the mapping, or None if it must be read through zipfile."""
+        if self._map is None or info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+            return None
+        header = _LOCAL_HEADER.unpack_from(self._map, info.header_offset)
+        if header[0] != _LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f"Bad local file header for {info.filename!r}")
+        start = info.header_offset + _LOCAL_HEADER.size + header[-2] + header[-1]
+        end = start + info.compress_size
+        if end > len(self._map):
+            raise zipfile.BadZipFile(f"Member {info.filename!r} extends past the end of the archive")
+        return memoryview(self._map)[start:end]
+
+    def _scan_view(self, info: zipfile.ZipInfo, view: memoryview, target=None):
+        # One pass over the slice for the CRC check, the entry hash and the optional copy out
+        crc = 0
+        digest = hashlib.sha256()
+        for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+            chunk = view[offset:offset + STREAM_CHUNK_SIZE]
+            crc = zlib.crc32(chunk, crc)
+            digest.update(chunk)
+            if target is not None:
+                target.write(chunk)
+            chunk.release()
+        if crc != info.CRC:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for file {info.filename!r}")
+        self._record_hash(info.filename, digest.hexdigest().upper())
+
+    def read_member(self, name: str) -> bytes:
+        info = self._zip.getinfo(name)
+        view = self._stored_view(info)
+        if view is not None:
+            with view:
+                self._scan_view(info, view)
+                return bytes(view)
+        # ZipExtFile verifies the CRC once the member has been read to the end
+        with self._zip.open(info, 'r') as member:
+            data = member.read()
+        self._record_hash(name, hashlib.sha256(data).hexdigest().upper())
+        return data
+
+    def member_view(self, name: str) -> memoryview:
+        """The bytes of a member, CRC-checked and hashed, without a copy when the member is stored.
+
+        Views of a memory-mapped package point into the mapping, so release them
+        (or use them in a with block) before closing the archive.
+        """
+        info = self._zip.getinfo(name)
+        view = self._stored_view(info)
+        if view is None:
+            return memoryview(self.read_member(name))
+        try:
+            self._scan_view(info, view)
+        except Exception:
+            view.release()
+            raise
+        return view
+
+    def read_manifest(self, sections=None) -> Optional[dict]:
+        """Read the manifest, or only the given top-level sections of it.
+
+        The compact encoding holds the same data and can decode single sections,
+        so it is preferred over the indented JSON when a package has both.
+        """
+        if not self.compact_names and not self.json_names:
+            return None
+        with profiling.stage('read_manifest') as record:
+            if self.compact_names:
+                with self.member_view(self.compact_names[0]) as data:
+                    record.bytes = len(data)
+                    return read_sections(data, sections)
+            with self.member_view(self.json_names[0]) as data:
+                record.bytes = len(data)
+                metadata = json.loads(str(data, 'utf-8'))
+        if sections is None or not isinstance(metadata, dict):
+            # Left for the schema check to reject
+            return metadata
+        return {key: value for key, value in metadata.items() if key in sections}
+
+    def read_delta(self) -> Optional[dict]:
+        """The delta manifest of a patch package, or None for a full package."""
+        if not self.delta_names:
+            return None
+        with profiling.stage('read_manifest') as record:
+            with self.member_view(self.delta_names[0]) as data:
+                record.bytes = len(data)
+                return load_delta(str(data, 'utf-8'))
+
+    def read_config(self) -> Optional[dict]:
+        """The plain keys of the .config (hash, created, ...); the parsed file is kept as self.config."""
+        if not self.config_name:
+            return None
+        self.config = PackageConfig.parse(self.read_member(self.config_name).decode('utf-8'))
+        return self.config.values
+
+    def verify_entries(self):
+        """Check the central directory against the per-entry records of the .config, then check
+        every member against its record as it is streamed.
+
+        Sizes and CRCs are compared without reading any data, and so is the content hash
+        against the recorded SHA-256s. From then on read_member, member_view and
+        extract_member raise IntegrityError as soon as a member's SHA-256 differs, so a
+        corrupted download fails at its first bad entry. Packages whose .config has no
+        entry records (package.bat, older exports) are left to verify_content_hash.
+        """
+        if self.config is None:
+            self.read_config()
+        if self.config is None or not self.config.entries:
+            return
+        entries = self.config.entries
+
+        if compute_content_hash(self.config.entry_hashes()) != self.config.content_hash:
+            raise IntegrityError("The .config entry records do not match its content hash")
+        members = {info.filename: info for info in self._zip.infolist()
+                   if not info.is_dir() and info.filename != self.config_name}
+        for name, record in entries.items():
+            info = members.get(name)
+            if info is None:
+                raise IntegrityError(f"Entry {name} is missing from the package")
+            if info.file_size != record.size:
+                raise IntegrityError(f"Entry {name} is {info.file_size} bytes, the .config records {record.size}")
+            if record.crc is not None and info.CRC != record.crc:
+                raise IntegrityError(f"Entry {name} has CRC {info.CRC:08x}, the .config records {record.crc:08x}")
+        unrecorded = sorted(set(members) - set(entries))
+        if unrecorded:
+            raise IntegrityError(f"Entries not recorded in the .config: {', '.join(unrecorded)}")
+
+        self._expected = entries
+        for name, sha256 in self._entry_hashes.items():
+            self._check_entry(name, sha256)
+
+    def _record_hash(self, name: str, sha256: str):
+        self._check_entry(name, sha256)
+        self._entry_hashes[name] = sha256
+
+    def _check_entry(self, name: str, sha256: str):
+        record = self._expected.get(name)
+        if record is not None and record.sha256 != sha256:
+            raise IntegrityError(f"Entry {name} is corrupt: SHA-256 {sha256} does not match the .config")
+
+    def extract_member(self, name: str, dest_path: str) -> str:
+        info = self._zip.getinfo(name)
+        partial_path = f"{dest_path}.partial"
+        try:
+            with profiling.stage('extract', info.file_size), open(partial_path, 'wb') as target:
+                view = self._stored_view(info)
+                if view is not None:
+                    with view:
+                        self._scan_view(info, view, target)
+                else:
+                    self._stream_member(info, target)
+            os.replace(partial_path, dest_path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        return dest_path
+
+    def _stream_member(self, info: zipfile.ZipInfo, target=None):
+        digest = hashlib.sha256()
+        with self._zip.open(info, 'r') as source:
+            for chunk in iter(lambda: source.read(STREAM_CHUNK_SIZE), b''):
+                digest.update(chunk)
+                if target is not None:
+                    target.write(chunk)
+        self._record_hash(info.filename, digest.hexdigest().upper())
+
+    def extract_blends(self, dest_dir: str) -> List[str]:
+        blend_paths = []
+        for name in self.blend_names:
+            dest_path = os.path.join(dest_dir, os.path.basename(name))
+            blend_paths.append(self.extract_member(name, dest_path))
+        return blend_paths
+
+    def extract_all(self, dest_dir: str) -> List[str]:
+        """Extract every member under dest_dir, keeping the paths stored in the package."""
+        root = os.path.abspath(dest_dir)
+        extracted = []
+        for info in self._zip.infolist():
+            dest_path = os.path.normpath(os.path.join(root, info.filename))
+            if os.path.commonpath([root, dest_path]) != root:
+                raise zipfile.BadZipFile(f"Member {info.filename!r} points outside the package")
+            if info.is_dir():
+                os.makedirs(dest_path, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            extracted.append(self.extract_member(info.filename, dest_path))
+        return extracted
+
+    def _hash_member(self, name: str) -> str:
+        if name not in self._entry_hashes:
+            info = self._zip.getinfo(name)
+            view = self._stored_view(info)
+            if view is not None:
+                with view:
+                    self._scan_view(info, view)
+            else:
+                self._stream_member(info)
+        return self._entry_hashes[name]
+
+    def content_hash(self) -> str:
+        # Members already streamed by read_member/extract_member are not read again
+        entry_hashes = [
+            f"{info.filename}:{self._hash_member(info.filename)}"
+            for info in self._zip.infolist()
+            if not info.is_dir() and info.filename != self.config_name
+        ]
+        return compute_content_hash(entry_hashes)
+
+    def verify_content_hash(self, expected_hash: str):
+        """Check the content hash of the member bytes against expected_hash.
+
+        The hash is computed from the SHA-256 of every member, never from the .config alone:
+        members already streamed are not read again, the rest are read once here. After
+        verify_entries, each of those is also checked against its .config record.
+        """
+        unread = sum(
+            info.file_size for info in self._zip.infolist()
+            if not info.is_dir() and info.filename != self.config_name and info.filename not in self._entry_hashes
+        )
+        with profiling.stage('verify', unread):
+            actual_hash = self.content_hash()
+        if actual_hash != expected_hash.lower():
+            raise IntegrityError(f"Content hash mismatch: expected {expected_hash}, got {actual_hash}")
+
+
+def read_package_config(node_path: str) -> Optional[dict]:
+    """Read the .config of an existing package, or None if it is missing or unreadable."""
+    if not os.path.exists(node_path):
+        return None
+    try:
+        with NodeArchive(node_path) as archive:
+            return archive.read_config()
+    except (OSError, zipfile.BadZipFile, UnicodeDecodeError, ConfigError):
+        return None
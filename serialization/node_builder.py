@@ -0,0 +1,269 @@
+import re
+import time
+from typing import Iterable, List, Optional
+
+import bpy
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+# Node attributes written for every node at once with foreach_set: (attribute, manifest key, default, size)
+BULK_ATTRIBUTES = (
+    ('location', 'location', (0.0, 0.0), 2),
+    ('width', 'width', None, 1),
+    ('height', 'height', None, 1),
+    ('hide', 'hide', False, 1),
+    ('mute', 'mute', False, 1),
+)
+
+# Socket types whose default_value is an ID, stored by name in the manifest
+ID_SOCKET_COLLECTIONS = {
+    'OBJECT': 'objects',
+    'IMAGE': 'images',
+    'COLLECTION': 'collections',
+    'TEXTURE': 'textures',
+    'MATERIAL': 'materials',
+}
+
+NUMBER_PATTERN = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+# Socket types without an editable default value
+VALUELESS_SOCKET_TYPES = {'GEOMETRY', 'SHADER', 'CUSTOM', 'MATRIX', 'BUNDLE', 'CLOSURE'}
+
+
+def _set_value(socket, value):
+    socket.default_value = value
+
+
+def _set_array(socket, value):
+    if isinstance(value, str):
+        # Older exports wrote the repr, like "<Vector (1.0000, 1.0000, 1.0000)>"
+        value = [float(number) for number in NUMBER_PATTERN.findall(value)]
+    try:
+        socket.default_value = value
+    except (TypeError, ValueError):
+        # An RGB saved for an RGBA socket, or a vector whose size differs in this Blender version
+        current = list(socket.default_value)
+        socket.default_value = (list(value) + current[len(value):])[:len(current)]
+
+
+def _id_setter(collection_name: str):
+    def set_id(socket, value):
+        if isinstance(value, str):
+            value = getattr(bpy.data, collection_name).get(value)
+        if value is not None:
+            socket.default_value = value
+    return set_id
+
+
+SOCKET_SETTERS = {
+    'VALUE': _set_value,
+    'INT': _set_value,
+    'BOOLEAN': _set_value,
+    'STRING': _set_value,
+    'MENU': _set_value,
+    'VECTOR': _set_array,
+    'RGBA': _set_array,
+    'ROTATION': _set_array,
+}
+SOCKET_SETTERS.update((socket_type, _id_setter(name)) for socket_type, name in ID_SOCKET_COLLECTIONS.items())
+SOCKET_SETTERS.update((socket_type, None) for socket_type in VALUELESS_SOCKET_TYPES)
+
+
+def socket_setter(socket_type: Optional[str]):
+    """Setter for the default value of a socket of this type, or None if the type has no value."""
+    return SOCKET_SETTERS.get(socket_type, _set_value)
+
+
+class NodeBuilder:
+    """Creates the nodes of a manifest grouped by bl_idname, then applies shared attributes in bulk.
+
+    Per-node RNA writes are limited to what has no bulk path: name, label, the node
+    group of group nodes, properties and socket defaults. Which properties a node
+    type has is looked up once per type, and each socket default goes through a
+    setter chosen from its manifest type.
+    """
+
+    def __init__(self, node_tree):
+        self.node_tree = node_tree
+        self.nodes_by_name = {}
+        self.created = 0
+        self.errors: List[str] = []
+        self.elapsed = 0.0
+        self._has_property = {}
+
+    def build(self, nodes_data: Iterable[dict]) -> int:
+        start = time.perf_counter()
+        nodes = self.node_tree.nodes
+        base = len(nodes)
+
+        by_type = {}
+        for node_data in nodes_data:
+            bl_idname = node_data.get('bl_idname', node_data.get('type', 'GeometryNodeGroup'))
+            by_type.setdefault(bl_idname, []).append(node_data)
+
+        # Nodes are appended to the collection, so created[i] is nodes[base + i]
+        created = []
+        new_node = nodes.new
+        for bl_idname, group in by_type.items():
+            for index, node_data in enumerate(group):
+                try:
+                    node = new_node(type=bl_idname)
+                except RuntimeError as e:
+                    # The rest of this type would fail the same way; other types are still built
+                    self.errors.append(f"Could not create {len(group) - index} of {len(group)} node(s) "
+                                       f"of type {bl_idname}: {e}")
+                    break
+                created.append((node, node_data))
+                self._apply_node(node, bl_idname, node_data)
+
+        self._apply_bulk(nodes, base, created)
+        self.created = len(created)
+        self.elapsed = time.perf_counter() - start
+        return self.created
+
+    def _apply_node(self, node, bl_idname: str, node_data: dict):
+        name = node_data.get('name')
+        if name:
+            node.name = name
+        label = node_data.get('label')
+        if label:
+            node.label = label
+        self.nodes_by_name[name or node.name] = node
+
+        # Group nodes only get their sockets once the group is set
+        group_name = node_data.get('node_tree')
+        if group_name:
+            node_group = bpy.data.node_groups.get(group_name)
+            if node_group is not None:
+                node.node_tree = node_group
+
+        self._apply_properties(node, bl_idname, node_data.get('properties', {}))
+        self._apply_socket_defaults(node, node_data.get('inputs', []))
+
+    def update(self, node, fields: dict):
+        """Apply changed manifest fields (from a delta package) to a node that already exists.
+
+        Fields set to None were removed from the manifest. Output sockets only mirror
+        the node's state, so changes to them are not applied.
+        """
+        self.nodes_by_name[node.name] = node
+        if 'label' in fields:
+            node.label = fields['label'] or ''
+        if 'node_tree' in fields:
+            node_group = bpy.data.node_groups.get(fields['node_tree']) if fields['node_tree'] else None
+            if fields['node_tree'] and node_group is None:
+                self.errors.append(f"Node group {fields['node_tree']} used by node {node.name} is not in this file")
+            else:
+                node.node_tree = node_group
+        if fields.get('properties'):
+            self._apply_properties(node, node.bl_idname, fields['properties'])
+        if fields.get('inputs'):
+            self._apply_socket_defaults(node, fields['inputs'])
+
+        for attribute, key, _, _ in BULK_ATTRIBUTES:
+            if fields.get(key) is not None:
+                try:
+                    setattr(node, attribute, fields[key])
+                except Exception as e:
+                    self.errors.append(f"Could not set {attribute} on node {node.name}: {e}")
+
+    def _apply_properties(self, node, bl_idname: str, properties: dict):
+        for prop_name, prop_value in properties.items():
+            key = (bl_idname, prop_name)
+            if key not in self._has_property:
+                self._has_property[key] = hasattr(node, prop_name)
+            if self._has_property[key]:
+                try:
+                    setattr(node, prop_name, prop_value)
+                except Exception as e:
+                    self.errors.append(f"Could not set property {prop_name} on node {node.name}: {e}")
+
+    def _apply_socket_defaults(self, node, inputs_data: List[dict]):
+        inputs = None
+        by_identifier = None
+        for index, input_data in enumerate(inputs_data):
+            value = input_data.get('default_value')
+            if value is None:
+                continue
+            setter = socket_setter(input_data.get('type'))
+            if setter is None:
+                continue
+
+            if inputs is None:
+                inputs = node.inputs
+                count = len(inputs)
+            identifier = input_data.get('identifier')
+            socket = inputs[index] if index < count else None
+            # Sockets are matched by position first; identifiers keep packages from other versions working
+            if identifier and (socket is None or socket.identifier != identifier):
+                if by_identifier is None:
+                    by_identifier = {}
+                    for candidate in inputs:
+                        by_identifier.setdefault(candidate.identifier, candidate)
+                socket = by_identifier.get(identifier, socket)
+            if socket is None:
+                continue
+
+            try:
+                setter(socket, value)
+            except Exception as e:
+                self.errors.append(f"Could not set default value for socket {socket.name} of node {node.name}: {e}")
+
+    def _apply_bulk(self, nodes, base: int, created: list):
+        if not created:
+            return
+        total = len(nodes)
+        for attribute, key, default, size in BULK_ATTRIBUTES:
+            values = self._bulk_values(nodes, attribute, key, default, size, base, total, created)
+            if values is None:
+                continue
+            try:
+                nodes.foreach_set(attribute, values)
+            except (TypeError, AttributeError, RuntimeError) as e:
+                logger.debug('Bulk %s write failed, setting it per node: %s', attribute, e)
+                self._apply_per_node(attribute, key, created)
+
+    def _bulk_values(self, nodes, attribute: str, key: str, default, size: int, base: int, total: int,
+                     created: list) -> Optional[list]:
+        if not any(key in node_data for _, node_data in created):
+            return None
+        if default is None:
+            # No manifest-independent default (width depends on the node type): keep what nodes.new set
+            values = [0.0] * (total * size)
+            nodes.foreach_get(attribute, values)
+        elif base:
+            values = [default if size == 1 else 0.0] * (total * size)
+            nodes.foreach_get(attribute, values)
+        else:
+            values = (list(default) if size > 1 else [default]) * total
+
+        for offset, (_, node_data) in enumerate(created):
+            value = node_data.get(key)
+            if value is None:
+                if default is None:
+                    continue
+                value = default
+            start = (base + offset) * size
+            if size == 1:
+                values[start] = value
+            else:
+                values[start:start + size] = value[:size]
+        return values
+
+    def _apply_per_node(self, attribute: str, key: str, created: list):
+        for node, node_data in created:
+            if key in node_data:
+                try:
+                    setattr(node, attribute, node_data[key])
+                except Exception as e:
+                    self.errors.append(f"Could not set {attribute} on node {node.name}: {e}")
+
+
+def build_nodes(node_tree, nodes_data: Iterable[dict]) -> NodeBuilder:
+    builder = NodeBuilder(node_tree)
+    builder.build(nodes_data)
+    for error in builder.errors:
+        logger.warning('%s', error)
+    logger.info('Created %s node(s) in %.1f ms', builder.created, builder.elapsed * 1000)
+    return builder
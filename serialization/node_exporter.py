@@ -0,0 +1,120 @@
+import os
+import re
+import shutil
+import tempfile
+from typing import Optional, Tuple
+
+from .nodegroup_serializer import NodeGroupSerializer
+from .node_packager import package_node_files, get_compression_preset, DEFAULT_COMPRESSION
+from .node_archive import read_package_config
+from . import profiling
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+# Export settings of packages whose .config predates each setting
+EXPORT_SETTING_DEFAULTS = {'compression': 'legacy', 'manifest_format': 'json', 'bundle_dependencies': 'false',
+                           'compression_level': ''}
+
+_UNSAFE_FILE_NAME_CHARACTER = re.compile(r'[^\w.-]')
+
+
+def package_file_name(name: str) -> str:
+    """File name (without .node) for a node group: spaces, path separators and other unsafe characters become '_'."""
+    return _UNSAFE_FILE_NAME_CHARACTER.sub('_', name).lstrip('.') or 'node_group'
+
+
+class NodeGroupExporter:
+    """Serializes a node tree and packages it into a .node file in one call, without any UI context."""
+
+    def __init__(self, force: bool = False, manifest_format: str = 'json', bundle_dependencies: bool = False,
+                 compression: str = DEFAULT_COMPRESSION, compression_level: Optional[int] = None):
+        self.force = force
+        self.manifest_format = manifest_format
+        self.bundle_dependencies = bundle_dependencies
+        self.compression = compression
+        self.compression_level = compression_level
+        self.preset = get_compression_preset(compression)
+        self.skipped = False
+        self.profile = None
+
+    def _export_settings(self) -> dict:
+        # Recorded in .config as strings, which is how they are read back
+        level = self.preset.level if self.compression_level is None else self.compression_level
+        return {
+            'compression': self.compression,
+            'compression_level': '' if level is None else str(level),
+            'manifest_format': self.manifest_format,
+            'bundle_dependencies': 'true' if self.bundle_dependencies else 'false',
+        }
+
+    def export(self, node_tree, output_path: str, package_name: str = None) -> Tuple[bool, str]:
+        self.skipped = False
+
+        if output_path.endswith('.node'):
+            output_path = output_path[:-5]
+
+        with profiling.profile('export', f"{output_path}.node") as export_profile:
+            self.profile = export_profile
+            success, message = self._export(node_tree, output_path, package_name)
+            if not success:
+                export_profile.error = message
+        return success, message
+
+    def _export(self, node_tree, output_path: str, package_name: str = None) -> Tuple[bool, str]:
+        if not package_name:
+            package_name = os.path.basename(output_path) or package_file_name(node_tree.name)
+
+        final_node_file = f"{output_path}.node"
+        previous_fingerprint = None
+        export_settings = self._export_settings()
+        if not self.force:
+            previous_config = read_package_config(final_node_file) or {}
+            # A package written with other export settings is rewritten even if unchanged
+            if all(previous_config.get(key, EXPORT_SETTING_DEFAULTS[key]) == value
+                   for key, value in export_settings.items()):
+                previous_fingerprint = previous_config.get('graph_fingerprint')
+
+        temp_dir = tempfile.mkdtemp(prefix="nodegroup_export_")
+        logger.debug('Created temp directory: %s', temp_dir)
+
+        try:
+            serializer = NodeGroupSerializer(self.manifest_format, self.bundle_dependencies, self.preset.blend_compress)
+
+            logger.debug('Serializing node group data for: %s with package name: %s', node_tree.name, package_name)
+            success = serializer.serialize_nodegroup(node_tree, temp_dir, package_name, previous_fingerprint)
+            if not success:
+                return False, "Failed to serialize node group"
+
+            if serializer.skipped:
+                self.skipped = True
+                return True, f"'{node_tree.name}' is unchanged, kept existing package: {final_node_file}"
+
+            logger.debug('Serialization completed. Temp dir contents: %s', os.listdir(temp_dir))
+
+            files_to_package = [os.path.join(temp_dir, item) for item in os.listdir(temp_dir)]
+            if not files_to_package:
+                return False, "No files to package"
+
+            logger.debug('Output path: %s', final_node_file)
+            logger.debug('Files to package: %s', files_to_package)
+
+            extra_config = {'graph_fingerprint': serializer.fingerprint, **export_settings}
+            success, message = package_node_files(final_node_file, files_to_package, extra_config=extra_config,
+                                                  preset=self.compression, level=self.compression_level)
+            if not success:
+                return False, f"Packaging failed: {message}"
+
+            return True, f"Successfully exported node group to: {final_node_file}"
+
+        finally:
+            try:
+                shutil.rmtree(temp_dir)
+            except Exception as e:
+                logger.warning('Failed to clean up temp directory: %s', e)
+
+
+def export_node_group(node_tree, output_path: str, force: bool = False,
+                      manifest_format: str = 'json', bundle_dependencies: bool = False,
+                      compression: str = DEFAULT_COMPRESSION) -> Tuple[bool, str]:
+    return NodeGroupExporter(force, manifest_format, bundle_dependencies, compression).export(node_tree, output_path)
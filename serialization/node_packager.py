@@ -0,0 +1,164 @@
+import os
+import hashlib
+import zipfile
+import datetime
+from typing import Tuple, List, Optional
+
+from .package_config import CONFIG_FORMAT_VERSION, EntryRecord, PackageConfig
+from . import profiling
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+CONFIG_FILENAME = '.config'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class CompressionPreset:
+    """Where a package gets compressed: inside the .blend (Blender's own compression), in the zip, or both."""
+
+    def __init__(self, blend_compress: bool, zip_method: int, blend_method: Optional[int] = None,
+                 level: Optional[int] = None, description: str = ""):
+        self.blend_compress = blend_compress
+        self.zip_method = zip_method
+        # Method of the .blend member; the manifest and .config always use zip_method
+        self.blend_method = zip_method if blend_method is None else blend_method
+        self.level = level
+        self.description = description
+
+
+# A compressed .blend does not shrink further in the zip, so each preset compresses once.
+# See DOCS.md "Package Compression" for the benchmark behind the default.
+COMPRESSION_PRESETS = {
+    'stored': CompressionPreset(True, zipfile.ZIP_DEFLATED, blend_method=zipfile.ZIP_STORED,
+                                description="Compressed .blend stored as is, fastest import"),
+    'deflate': CompressionPreset(False, zipfile.ZIP_DEFLATED, level=6,
+                                 description="Uncompressed .blend, deflated in the zip"),
+    'lzma': CompressionPreset(False, zipfile.ZIP_LZMA,
+                              description="Uncompressed .blend, LZMA in the zip; smallest, slowest import"),
+    'legacy': CompressionPreset(True, zipfile.ZIP_DEFLATED,
+                                description="Compressed .blend deflated again, as packages were written before"),
+}
+DEFAULT_COMPRESSION = 'stored'
+
+
+def get_compression_preset(name: str) -> CompressionPreset:
+    if name not in COMPRESSION_PRESETS:
+        raise ValueError(f"Unknown compression '{name}', expected one of {tuple(COMPRESSION_PRESETS)}")
+    return COMPRESSION_PRESETS[name]
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest().upper()
+
+
+def compute_content_hash(entry_hashes: List[str]) -> str:
+    """Combine '<entry>:<SHA256>' strings exactly like package.bat does."""
+    # Sort-Object in package.bat compares case-insensitively
+    sorted_entries = sorted(entry_hashes, key=lambda entry: (entry.lower(), entry))
+    combined = '|'.join(sorted_entries)
+    return hashlib.sha256(combined.encode('utf-8')).hexdigest()
+
+
+def _collect_entries(file_paths: List[str]) -> List[Tuple[str, str]]:
+    entries = []
+    for path in file_paths:
+        if os.path.isdir(path):
+            folder_name = os.path.basename(os.path.normpath(path))
+            for root, _, files in os.walk(path):
+                for filename in files:
+                    full_path = os.path.join(root, filename)
+                    relative_path = os.path.relpath(full_path, path).replace(os.sep, '/')
+                    entries.append((full_path, f"{folder_name}/{relative_path}"))
+        elif os.path.isfile(path):
+            entries.append((path, os.path.basename(path)))
+        else:
+            logger.warning("'%s' not found, skipping...", path)
+    return entries
+
+
+class NodePackager:
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED, blend_compression: Optional[int] = None,
+                 compresslevel: Optional[int] = None):
+        self.compression = compression
+        self.blend_compression = compression if blend_compression is None else blend_compression
+        self.compresslevel = compresslevel
+        self.content_hash = None
+
+    @classmethod
+    def from_preset(cls, name: str, level: Optional[int] = None) -> 'NodePackager':
+        preset = get_compression_preset(name)
+        return cls(preset.zip_method, preset.blend_method, preset.level if level is None else level)
+
+    def package(self, output_path: str, file_paths: List[str],
+                extra_config: Optional[dict] = None) -> Tuple[bool, str]:
+        try:
+            if not output_path.lower().endswith('.node'):
+                output_path = f"{output_path}.node"
+
+            entries = _collect_entries(file_paths)
+            if not entries:
+                return False, "No valid files or folders found to package"
+
+            target_dir = os.path.dirname(output_path)
+            if target_dir:
+                os.makedirs(target_dir, exist_ok=True)
+
+            partial_path = f"{output_path}.partial"
+            records = {}
+
+            try:
+                with zipfile.ZipFile(partial_path, 'w', compression=self.compression,
+                                     compresslevel=self.compresslevel) as zip_file:
+                    for source_path, entry_name in entries:
+                        size = os.path.getsize(source_path)
+                        compress_type = self.blend_compression if entry_name.lower().endswith('.blend') else None
+                        with profiling.stage('zip', size):
+                            zip_file.write(source_path, entry_name, compress_type=compress_type)
+                        with profiling.stage('hash', size):
+                            sha256 = _hash_file(source_path)
+                        # zipfile computed the CRC while writing the entry
+                        records[entry_name] = EntryRecord(size, zip_file.getinfo(entry_name).CRC, sha256)
+
+                    config = self._build_config(records, extra_config)
+                    self.content_hash = config.content_hash
+                    zip_file.writestr(CONFIG_FILENAME, config.to_text())
+
+                os.replace(partial_path, output_path)
+            finally:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+
+            logger.debug('Content hash: %s', self.content_hash)
+            logger.info('Successfully created: %s (%s bytes)', output_path, os.path.getsize(output_path))
+            return True, output_path
+
+        except Exception as e:
+            return False, f"Error creating package: {str(e)}"
+
+    def _build_config(self, entries: dict, extra_config: Optional[dict] = None) -> PackageConfig:
+        config = PackageConfig(entries=entries)
+        created = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        config.values = {
+            'hash': compute_content_hash(config.entry_hashes()),
+            'created': created,
+            'format_version': CONFIG_FORMAT_VERSION,
+        }
+        config.values.update(extra_config or {})
+        return config
+
+
+def package_node_files(output_path: str, file_paths: List[str],
+                       compression: Optional[int] = None,
+                       extra_config: Optional[dict] = None,
+                       preset: Optional[str] = None, level: Optional[int] = None) -> Tuple[bool, str]:
+    if preset is not None:
+        packager = NodePackager.from_preset(preset, level)
+    else:
+        packager = NodePackager() if compression is None else NodePackager(compression, compresslevel=level)
+    return packager.package(output_path, file_paths, extra_config)
+
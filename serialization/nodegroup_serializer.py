@@ -1,28 +1,84 @@
 import bpy
 import os
 import json
+import hashlib
 from mathutils import Vector, Euler, Color
 
+from .compact_manifest import COMPACT_MANIFEST_EXT, encode_manifest
+from .link_builder import build_links
+from .dependency_graph import DependencyGraph
+from .manifest_schema import SCHEMA_VERSION
+from . import profiling
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+# Fields that change between exports without the graph itself changing
+VOLATILE_INFO_FIELDS = ('export_timestamp', 'blender_version', 'graph_fingerprint', 'schema_version')
+VOLATILE_NODE_FIELDS = ('select',)
+
+# Which manifest encodings to write next to the .blend
+MANIFEST_FORMATS = ('json', 'compact', 'both')
+
+
+def compute_graph_fingerprint(metadata):
+    """SHA-256 over the serialized graph, ignoring timestamps and selection state."""
+    nodegroup_info = {
+        key: value for key, value in metadata.get('nodegroup_info', {}).items()
+        if key not in VOLATILE_INFO_FIELDS
+    }
+    nodes = [
+        {key: value for key, value in node.items() if key not in VOLATILE_NODE_FIELDS}
+        for node in metadata.get('nodes', [])
+    ]
+    graph = {
+        'nodegroup_info': nodegroup_info,
+        'interface': metadata.get('interface', {}),
+        'nodes': nodes,
+        'links': metadata.get('links', []),
+        'layout': metadata.get('layout', {}),
+        'dependencies': metadata.get('dependencies', {})
+    }
+    canonical = json.dumps(graph, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
 class NodeGroupSerializer:
-    def __init__(self):
+    def __init__(self, manifest_format='json', bundle_dependencies=False, compress_blend=True):
+        if manifest_format not in MANIFEST_FORMATS:
+            raise ValueError(f"Unknown manifest format '{manifest_format}', expected one of {MANIFEST_FORMATS}")
+        self.manifest_format = manifest_format
+        self.bundle_dependencies = bundle_dependencies
+        self.compress_blend = compress_blend
         self.node_group = None
         self.output_dir = None
         self.package_name = None
+        self.fingerprint = None
+        self.skipped = False
         
-    def serialize_nodegroup(self, node_tree, output_directory, package_name=None):
+    def serialize_nodegroup(self, node_tree, output_directory, package_name=None, previous_fingerprint=None):
         try:
             self.node_group = node_tree
             self.output_dir = output_directory
+            self.skipped = False
             
             self.package_name = package_name if package_name else node_tree.name
 
-            print(f"Serializing node group data for: {node_tree.name} as package: {self.package_name}")
+            logger.debug('Serializing node group data for: %s as package: %s', node_tree.name, self.package_name)
 
             if node_tree.bl_rna.identifier != 'GeometryNodeTree':
-                print(f"Error: Not a geometry node tree. Type: {node_tree.bl_rna.identifier}")
+                logger.error('Not a geometry node tree. Type: %s', node_tree.bl_rna.identifier)
                 return False
             
-            json_success = self._create_metadata_json()
+            metadata = self._build_metadata()
+            self.fingerprint = self._export_fingerprint(metadata)
+            
+            if previous_fingerprint and previous_fingerprint == self.fingerprint:
+                logger.info("Node group '%s' is unchanged since the last export, skipping write", node_tree.name)
+                self.skipped = True
+                return True
+            
+            json_success = self._create_metadata_json(metadata)
             if not json_success:
                 return False
             
@@ -33,43 +89,71 @@ class NodeGroupSerializer:
             return True
             
         except Exception as e:
-            print(f"Error during serialization: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error('Error during serialization: %s', e, exc_info=True)
             return False
     
-    def _create_metadata_json(self):
+    def _export_fingerprint(self, metadata):
+        """The graph fingerprint combined with the structural hash of the root.
+        
+        The manifest keeps only some node settings, and nested groups only by name
+        unless dependencies are bundled. The structural hash covers every setting and,
+        recursively, the nested groups, so editing one of them changes the fingerprint.
+        """
+        from .structural_hash import StructuralHasher
+        
+        subgroups = metadata.get('dependencies', {}).get('subgroups', {})
+        root_hash = subgroups.get(self.node_group.name) or StructuralHasher().hash_tree(self.node_group)
+        combined = f"{compute_graph_fingerprint(metadata)}|{root_hash}"
+        return hashlib.sha256(combined.encode('utf-8')).hexdigest()
+    
+    def _build_metadata(self):
+        return {
+            'nodegroup_info': {
+                'name': self.node_group.name,
+                'package_name': self.package_name,
+                'description': getattr(self.node_group, 'description', ''),
+                'type': self.node_group.bl_rna.identifier,
+                'version': '1.0.0',
+                'blender_version': bpy.app.version_string,
+                'export_timestamp': self._get_timestamp(),
+                'schema_version': SCHEMA_VERSION
+            },
+            'interface': self._profiled('serialize_interface', self._serialize_interface),
+            'nodes': self._profiled('serialize_nodes', self._serialize_nodes),
+            'links': self._profiled('serialize_links', self._serialize_links),
+            'layout': self._serialize_layout(),
+            'dependencies': self._profiled('dependencies', self._get_dependencies)
+        }
+    
+    def _profiled(self, stage_name, serialize):
+        with profiling.stage(stage_name):
+            return serialize()
+    
+    def _create_metadata_json(self, metadata=None):
         try:
-            metadata = {
-                'nodegroup_info': {
-                    'name': self.node_group.name,
-                    'package_name': self.package_name,
-                    'description': getattr(self.node_group, 'description', ''),
-                    'type': self.node_group.bl_rna.identifier,
-                    'version': '1.0.0',
-                    'blender_version': bpy.app.version_string,
-                    'export_timestamp': self._get_timestamp()
-                },
-                'interface': self._serialize_interface(),
-                'nodes': self._serialize_nodes(),
-                'links': self._serialize_links(),
-                'layout': self._serialize_layout(),
-                'dependencies': self._get_dependencies()
-            }
-            
-            # Write JSON file
-            json_filename = f"{self.package_name}.json"
-            json_path = os.path.join(self.output_dir, json_filename)
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            if metadata is None:
+                metadata = self._build_metadata()
+            
+            metadata['nodegroup_info']['graph_fingerprint'] = self.fingerprint or compute_graph_fingerprint(metadata)
+            
+            if self.manifest_format in ('json', 'both'):
+                json_path = os.path.join(self.output_dir, f"{self.package_name}.json")
+                with profiling.stage('write_manifest') as record:
+                    with open(json_path, 'w', encoding='utf-8') as f:
+                        json.dump(metadata, f, indent=2, ensure_ascii=False)
+                    record.bytes = os.path.getsize(json_path)
+            
+            if self.manifest_format in ('compact', 'both'):
+                compact_path = os.path.join(self.output_dir, f"{self.package_name}{COMPACT_MANIFEST_EXT}")
+                with profiling.stage('write_manifest') as record:
+                    with open(compact_path, 'wb') as f:
+                        f.write(encode_manifest(metadata))
+                    record.bytes = os.path.getsize(compact_path)
                 
             return True
             
         except Exception as e:
-            print(f"Error creating metadata JSON: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error('Error creating metadata JSON: %s', e, exc_info=True)
             return False
     
     def _serialize_interface(self):
@@ -131,7 +215,7 @@ class NodeGroupSerializer:
                     interface['outputs'].append(socket_data)
         
         except Exception as e:
-            print(f"Error serializing interface: {e}")
+            logger.error('Error serializing interface: %s', e)
             pass
         
         return interface
@@ -204,7 +288,7 @@ class NodeGroupSerializer:
                 return str(value)
                 
         except Exception as e:
-            print(f"Error serializing socket value: {e}")
+            logger.error('Error serializing socket value: %s', e)
             return None
     
     def _serialize_node_properties(self, node):
@@ -275,6 +359,9 @@ class NodeGroupSerializer:
         return layout
     
     def _get_dependencies(self):
+        if self.bundle_dependencies:
+            return self._get_bundled_dependencies()
+        
         dependencies = {
             'node_groups': [],
             'materials': [],
@@ -293,6 +380,40 @@ class NodeGroupSerializer:
             
         return dependencies
     
+    def _get_bundled_dependencies(self):
+        """Transitive dependencies plus a content hash for the root and every nested group.
+        
+        The .blend written for the root already contains each nested group once;
+        the hashes let the importer reuse groups that are already in the file.
+        """
+        from .structural_hash import StructuralHasher
+        
+        graph = DependencyGraph(self.node_group)
+        dependencies = graph.names()
+        
+        hasher = StructuralHasher()
+        dependencies['subgroups'] = {tree.name: hasher.hash_tree(tree) for tree in graph.node_groups}
+        # Lets the importer append any one group with just the groups it uses
+        dependencies['children'] = graph.children
+        return dependencies
+    
+    def _build_graph_metadata(self, node_tree):
+        # Only the graph itself: names of nested groups are covered by their own hashes
+        root = self.node_group
+        try:
+            self.node_group = node_tree
+            nodes = self._serialize_nodes()
+            for node_data in nodes:
+                node_data.pop('node_tree', None)
+            return {
+                'interface': self._serialize_interface(),
+                'nodes': nodes,
+                'links': self._serialize_links(),
+                'layout': self._serialize_layout()
+            }
+        finally:
+            self.node_group = root
+    
     def _get_timestamp(self):
         import datetime
         return datetime.datetime.now().isoformat()
@@ -305,7 +426,7 @@ class NodeGroupSerializer:
             blend_filename = f"{self.package_name}.blend"
             blend_path = os.path.join(self.output_dir, blend_filename)
             
-            print(f"Creating .blend file: {blend_path}")
+            logger.debug('Creating .blend file: %s', blend_path)
             
             try:
                 original_use_fake_user = self.node_group.use_fake_user
@@ -314,35 +435,35 @@ class NodeGroupSerializer:
                 with tempfile.NamedTemporaryFile(suffix='.blend', delete=False) as temp_file:
                     temp_blend_path = temp_file.name
                 
-                bpy.data.libraries.write(
-                    temp_blend_path,
-                    datablocks={self.node_group},
-                    fake_user=True,
-                    compress=True
-                )
+                with profiling.stage('libraries_write') as record:
+                    bpy.data.libraries.write(
+                        temp_blend_path,
+                        datablocks={self.node_group},
+                        fake_user=True,
+                        compress=self.compress_blend
+                    )
+                    record.bytes = os.path.getsize(temp_blend_path)
                 
                 shutil.copy2(temp_blend_path, blend_path)
                 os.unlink(temp_blend_path)
                 
                 self.node_group.use_fake_user = original_use_fake_user
                 
-                print(f"Successfully created .blend file using libraries.write: {blend_path}")
+                logger.info('Successfully created .blend file using libraries.write: %s', blend_path)
                 return True
                 
             except Exception as lib_error:
-                print(f"libraries.write failed: {lib_error}")
+                logger.warning('libraries.write failed: %s', lib_error)
                 
                 return self._create_blend_file_fallback(blend_path)
                 
         except Exception as e:
-            print(f"Error creating .blend file: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error('Error creating .blend file: %s', e, exc_info=True)
             return False
             
     def _create_blend_file_fallback(self, blend_path):
         try:
-            print("Using fallback method to create .blend file")
+            logger.debug('Using fallback method to create .blend file')
             
             current_file = bpy.data.filepath
             current_is_saved = not bpy.data.is_dirty
@@ -437,26 +558,10 @@ class NodeGroupSerializer:
                 
                 node_map[node_data['name']] = new_node
             
-            for link_data in node_group_data['links']:
-                from_node = node_map.get(link_data['from_node'])
-                to_node = node_map.get(link_data['to_node'])
-                
-                if from_node and to_node:
-                    from_socket = None
-                    to_socket = None
-                    
-                    for socket in from_node.outputs:
-                        if socket.identifier == link_data['from_socket']:
-                            from_socket = socket
-                            break
-                    
-                    for socket in to_node.inputs:
-                        if socket.identifier == link_data['to_socket']:
-                            to_socket = socket
-                            break
-                    
-                    if from_socket and to_socket:
-                        new_group.links.new(from_socket, to_socket)
+            build_links(new_group, node_map, (
+                (link_data['from_node'], link_data['from_socket'], link_data['to_node'], link_data['to_socket'])
+                for link_data in node_group_data['links']
+            ))
             
             bpy.ops.wm.save_as_mainfile(filepath=blend_path)
             
@@ -465,13 +570,11 @@ class NodeGroupSerializer:
             elif current_is_saved:
                 bpy.ops.wm.read_homefile(use_empty=True)
             
-            print(f"Successfully created .blend file using fallback method: {blend_path}")
+            logger.info('Successfully created .blend file using fallback method: %s', blend_path)
             return True
             
         except Exception as e:
-            print(f"Fallback .blend creation failed: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error('Fallback .blend creation failed: %s', e, exc_info=True)
             
             try:
                 if current_file:
@@ -479,7 +582,7 @@ class NodeGroupSerializer:
                 else:
                     bpy.ops.wm.read_homefile(use_empty=True)
             except:
-                print("Failed to restore original Blender state")
+                logger.error('Failed to restore original Blender state')
             
             return False
     
@@ -519,7 +622,7 @@ class NodeGroupSerializer:
                             pass
                             
         except Exception as e:
-            print(f"Error copying interface: {e}")
+            logger.error('Error copying interface: %s', e)
     
     def _copy_nodes(self, source_group, target_group):
         try:
@@ -545,7 +648,7 @@ class NodeGroupSerializer:
             return node_map
             
         except Exception as e:
-            print(f"Error copying nodes: {e}")
+            logger.error('Error copying nodes: %s', e)
             return {}
     
     def _copy_node_properties(self, source_node, target_node):
@@ -579,39 +682,15 @@ class NodeGroupSerializer:
                     target_node.node_tree = source_node.node_tree
                     
         except Exception as e:
-            print(f"Error copying node properties: {e}")
+            logger.error('Error copying node properties: %s', e)
     
     def _copy_links(self, source_group, target_group):
         try:
-            node_map = {}
-            for target_node in target_group.nodes:
-                node_map[target_node.name] = target_node
-            
-            # Copy links
-            for source_link in source_group.links:
-                try:
-                    from_node = node_map.get(source_link.from_node.name)
-                    to_node = node_map.get(source_link.to_node.name)
-                    
-                    if from_node and to_node:
-                        from_socket = None
-                        for socket in from_node.outputs:
-                            if socket.identifier == source_link.from_socket.identifier:
-                                from_socket = socket
-                                break
-                        
-                        to_socket = None
-                        for socket in to_node.inputs:
-                            if socket.identifier == source_link.to_socket.identifier:
-                                to_socket = socket
-                                break
-                        
-                        if from_socket and to_socket:
-                            target_group.links.new(from_socket, to_socket)
-                            
-                except Exception as link_error:
-                    print(f"Error copying individual link: {link_error}")
-                    continue
+            node_map = {target_node.name: target_node for target_node in target_group.nodes}
+            build_links(target_group, node_map, (
+                (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+                for link in source_group.links
+            ))
                     
         except Exception as e:
-            print(f"Error copying links: {e}")
+            logger.error('Error copying links: %s', e)
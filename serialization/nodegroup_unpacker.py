@@ -1,25 +1,77 @@
 import bpy
 import os
 import json
+import time
 import tempfile
 import zipfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, List, Optional
 
+from .node_archive import NodeArchive, IntegrityError
+from .package_config import ConfigError, parse_config
+from .compact_manifest import COMPACT_MANIFEST_EXT, CompactManifestError
+from .import_cache import (ImportCache, HASH_PROPERTY, PACKAGE_PROPERTY, open_library_store,
+                           index_loaded_nodegroups, root_nodegroups)
+from .dependency_graph import SUBGROUP_HASH_PROPERTY, index_subgroups, base_name
+from .package_inspector import PackageContents, INSPECT_SECTIONS
+from .manifest_schema import validate_manifest
+from .delta_patcher import apply_delta
+from .structural_hash import NodeGroupDeduplicator, StructuralHasher
+from . import profiling
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+
+class PreparedPackage:
+    """Result of the bpy-free stage of an import: manifest, config and extracted .blend paths."""
+    
+    def __init__(self, filepath: str, requested: Optional[List[str]] = None):
+        self.filepath = filepath
+        self.package_name = os.path.basename(filepath)
+        self.config_data = None
+        self.metadata = None
+        # Set instead of metadata and blend_paths for a patch package
+        self.delta = None
+        self.blend_paths = []
+        # Groups asked for by a selective import, and those plus their dependencies
+        self.requested = list(requested) if requested else None
+        self.append_names = None
+        self.error = None
+        self.profile = profiling.start_profile('import', filepath)
+    
+    @property
+    def content_hash(self) -> Optional[str]:
+        return (self.config_data or {}).get('hash')
+
+
 class NodeGroupUnpacker:    
     REQUIRED_FILES = {'.config', '.json', '.blend'}
     
-    def __init__(self):
+    def __init__(self, streaming: bool = True, use_cache: bool = True, verify_hash: bool = True,
+                 deduplicate: bool = True, link: bool = False, override: bool = False,
+                 library_dir: Optional[str] = None):
         self.temp_dirs = []
         self._mouse_coords = None
+        self.streaming = streaming
+        self.verify_hash = verify_hash
+        self.deduplicate = deduplicate
+        self.cache = ImportCache() if (streaming and use_cache) else None
+        # Linked data stays in the extracted .blend, so link mode extracts to a permanent,
+        # content-addressed store instead of a temp dir or the evictable import cache
+        self.link = link
+        self.override = link and override
+        self.library_store = open_library_store(library_dir) if link else None
     
     def set_mouse_coordinates(self, x: int, y: int):
         self._mouse_coords = (x, y)
-        print(f"Mouse coordinates set for unpacker: ({x}, {y})")
+        logger.debug('Mouse coordinates set for unpacker: (%s, %s)', x, y)
 
-    def unpack_node_file(self, filepath: str) -> Tuple[bool, str]:
+    def unpack_node_file(self, filepath: str, node_groups: Optional[List[str]] = None) -> Tuple[bool, str]:
+        """Import a package. If node_groups is given, only those groups and the groups they use are appended."""
         try:
-            print(f"🔍 Processing .node file: {os.path.basename(filepath)}")
+            logger.debug('🔍 Processing .node file: %s', os.path.basename(filepath))
             
             if not os.path.exists(filepath):
                 return False, f"File does not exist: {filepath}"
@@ -27,8 +79,10 @@ class NodeGroupUnpacker:
             if not filepath.lower().endswith('.node'):
                 return False, f"File is not a .node file: {filepath}"
             
-            temp_dir = tempfile.mkdtemp(prefix="nodegroup_unpack_")
-            self.temp_dirs.append(temp_dir)
+            if self.streaming or self.link:
+                return self._unpack_streaming(filepath, node_groups)
+            
+            temp_dir = self._new_extract_dir()
             
             success, message = self._extract_node_file(filepath, temp_dir)
             if not success:
@@ -40,7 +94,7 @@ class NodeGroupUnpacker:
             
             config_data = self._load_config(temp_dir)
             
-            success, message = self._append_nodegroups(temp_dir, config_data)
+            success, message = self._append_nodegroups(temp_dir, config_data, node_groups)
             if not success:
                 return False, message
             
@@ -49,23 +103,284 @@ class NodeGroupUnpacker:
         except Exception as e:
             return False, f"Error processing {os.path.basename(filepath)}: {str(e)}"
     
-    def _extract_node_file(self, filepath: str, temp_dir: str) -> Tuple[bool, str]:
+    def _unpack_streaming(self, filepath: str, node_groups: Optional[List[str]] = None) -> Tuple[bool, str]:
+        loaded_index = self._index_loaded_nodegroups()
+        prepared = self._prepare_package(filepath, None, loaded_index, node_groups)
+        if prepared.error:
+            return False, prepared.error
+        
+        success, message, nodegroups = self._load_prepared_package(prepared, loaded_index)
+        if not success:
+            prepared.profile.finish(message)
+            return False, message
+        
+        mouse_coords = getattr(self, '_mouse_coords', None)
+        with profiling.activate(prepared.profile), profiling.stage('place'):
+            self._place_nodes_in_editors(nodegroups, len(nodegroups) == 1, mouse_coords)
+        prepared.profile.finish()
+        
+        return True, f"Successfully imported node groups from {os.path.basename(filepath)}"
+    
+    def _index_loaded_nodegroups(self) -> dict:
+        if self.cache is None:
+            return {}
+        return index_loaded_nodegroups(bpy.data.node_groups)
+    
+    def _prepare_package(self, filepath: str, extract_dir: Optional[str], loaded_index: dict,
+                         node_groups: Optional[List[str]] = None) -> PreparedPackage:
+        # Must not touch bpy: this runs on worker threads during batch imports. extract_dir is
+        # only used by packages that bypass the import cache; None creates one when needed
+        prepared = PreparedPackage(filepath, node_groups)
+        with profiling.activate(prepared.profile):
+            self._read_package(prepared, extract_dir, loaded_index)
+        if prepared.error:
+            prepared.profile.finish(prepared.error)
+        return prepared
+    
+    def _read_package(self, prepared: PreparedPackage, extract_dir: Optional[str], loaded_index: dict):
+        filepath = prepared.filepath
+        if not os.path.exists(filepath):
+            prepared.error = f"File does not exist: {filepath}"
+            return
+        if not filepath.lower().endswith('.node'):
+            prepared.error = f"File is not a .node file: {filepath}"
+            return
+        
         try:
-            print(f"Extracting {os.path.basename(filepath)}...")
-            
-            with zipfile.ZipFile(filepath, 'r') as zip_file:
-                try:
-                    zip_file.testzip()
-                except zipfile.BadZipFile:
-                    return False, "File is not a valid zip archive"
+            with NodeArchive(filepath) as archive:
+                if archive.delta_names:
+                    self._read_patch(prepared, archive)
+                    return
+                
+                success, message = archive.validate_structure(self.REQUIRED_FILES)
+                if not success:
+                    prepared.error = message
+                    return
                 
-                zip_file.extractall(temp_dir)
+                prepared.config_data = archive.read_config()
+                if self.verify_hash:
+                    # Every member read from here on is checked against its .config record
+                    archive.verify_entries()
+                prepared.metadata = archive.read_manifest() or {}
+                # The .blend is the payload here; only the sections used to load it must be sound
+                validate_manifest(prepared.metadata, sections=INSPECT_SECTIONS)
+                prepared.package_name = prepared.metadata.get('nodegroup_info', {}).get('package_name', prepared.package_name)
+                logger.debug("Read manifest and config for package '%s' from archive stream", prepared.package_name)
                 
+                if prepared.requested:
+                    contents = PackageContents(filepath, prepared.metadata, prepared.config_data or {},
+                                                [os.path.basename(name) for name in archive.blend_names])
+                    prepared.append_names = contents.dependencies_of(prepared.requested)
+                
+                content_hash = prepared.content_hash
+                if self.library_store is not None:
+                    if not content_hash:
+                        prepared.error = "Linking needs a package with a content hash in its .config"
+                        return
+                    prepared.blend_paths = self.library_store.store_blends(content_hash, archive, verify=self.verify_hash)
+                elif self.cache is not None and content_hash:
+                    if self._loaded_groups(prepared, loaded_index):
+                        return
+                    
+                    cache_entry = self.cache.lookup(content_hash)
+                    if cache_entry:
+                        logger.debug('Import cache hit for %s, skipping extraction', content_hash[:12])
+                        prepared.blend_paths = cache_entry['blend_files']
+                    else:
+                        prepared.blend_paths = self.cache.store_blends(content_hash, archive, verify=self.verify_hash)
+                else:
+                    prepared.blend_paths = archive.extract_blends(extract_dir or self._new_extract_dir())
+                    if self.verify_hash and content_hash:
+                        archive.verify_content_hash(content_hash)
+                    
+        except IntegrityError as e:
+            prepared.error = f"Integrity check failed: {str(e)}"
+        except zipfile.BadZipFile as e:
+            prepared.error = f"File is not a valid zip archive: {str(e)}"
+        except json.JSONDecodeError as e:
+            prepared.error = f"Malformed JSON manifest: {str(e)}"
+        except CompactManifestError as e:
+            prepared.error = f"Malformed compact manifest: {str(e)}"
+        except ConfigError as e:
+            prepared.error = f"Malformed .config: {str(e)}"
+        except ValueError as e:
+            prepared.error = str(e)
+        except Exception as e:
+            prepared.error = f"Error processing {os.path.basename(filepath)}: {str(e)}"
+    
+    def _read_patch(self, prepared: PreparedPackage, archive: NodeArchive):
+        # The base version is looked up on the main thread, when the patch is applied
+        if self.link:
+            prepared.error = "Patch packages change node groups in place and cannot be linked"
+            return
+        prepared.config_data = archive.read_config() or {}
+        if self.verify_hash:
+            archive.verify_entries()
+        prepared.delta = archive.read_delta()
+        if self.verify_hash and prepared.content_hash:
+            archive.verify_content_hash(prepared.content_hash)
+        prepared.package_name = prepared.delta['delta_info'].get('package_name', prepared.package_name)
+        logger.debug("Read patch for package '%s' from archive stream", prepared.package_name)
+    
+    def _prepare_packages(self, file_paths: List[str], max_workers: Optional[int] = None) -> List[PreparedPackage]:
+        loaded_index = self._index_loaded_nodegroups()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="node_unpack") as executor:
+            return list(executor.map(lambda filepath: self._prepare_package(filepath, None, loaded_index), file_paths))
+    
+    def _loaded_groups(self, prepared: PreparedPackage, loaded_index: dict) -> Optional[list]:
+        """Groups of this package already in the file that cover what is being imported, or None."""
+        content_hash = prepared.content_hash
+        loaded_nodegroups = loaded_index.get(content_hash) if content_hash else None
+        if not loaded_nodegroups:
+            return None
+        
+        # A selective import may have loaded only part of the package
+        loaded_names = {base_name(ng.name) for ng in loaded_nodegroups}
+        if prepared.requested:
+            if not set(prepared.requested) <= loaded_names:
+                return None
+            return [ng for ng in loaded_nodegroups if base_name(ng.name) in prepared.requested]
+        
+        root_name = (prepared.metadata or {}).get('nodegroup_info', {}).get('name')
+        if root_name and root_name not in loaded_names:
+            return None
+        return root_nodegroups(loaded_nodegroups)
+    
+    def _load_prepared_package(self, prepared: PreparedPackage, loaded_index: dict) -> Tuple[bool, str, list]:
+        if prepared.delta is not None:
+            with profiling.activate(prepared.profile):
+                return self._apply_patch(prepared, loaded_index)
+        
+        content_hash = prepared.content_hash
+        # Linking an already linked library hands back the existing datablocks, no lookup needed
+        loaded_groups = None if self.link else self._loaded_groups(prepared, loaded_index)
+        if loaded_groups:
+            # Loaded by an earlier package of the same batch after this one was prepared
+            self._release_prepared(prepared)
+            logger.debug("Package '%s' is already loaded, reusing %s node group(s)", prepared.package_name, len(loaded_groups))
+            reused = [(ng.name, getattr(ng, 'type', 'Unknown'), ng) for ng in loaded_groups]
+            return True, f"Reused {len(reused)} already loaded node group(s): {', '.join(name for name, _, _ in reused)}", reused
+        
+        metadata = prepared.metadata or {}
+        subgroups = metadata.get('dependencies', {}).get('subgroups')
+        root_name = metadata.get('nodegroup_info', {}).get('name')
+        with profiling.activate(prepared.profile):
+            success, message, imported = self._load_blend_files(prepared.blend_paths, subgroups, root_name,
+                                                                prepared.append_names, prepared.requested)
+        if success:
+            if self.link:
+                self._register_linked_package(imported, prepared.package_name, content_hash)
+            self._tag_nodegroups(imported, prepared.config_data)
+            if content_hash and self.cache is not None and not self.link:
+                loaded_index.setdefault(content_hash, []).extend(node_group for _, _, node_group in imported)
+        elif content_hash and self.cache is not None:
+            self.cache.release(content_hash)
+        return success, message, imported
+    
+    def _release_prepared(self, prepared: PreparedPackage):
+        """Let the import cache evict a prepared package again without loading it, e.g. when the import is cancelled."""
+        if prepared.blend_paths and prepared.content_hash and self.cache is not None and not self.link:
+            self.cache.release(prepared.content_hash)
+    
+    def _apply_patch(self, prepared: PreparedPackage, loaded_index: dict) -> Tuple[bool, str, list]:
+        """Update the base version of a node group to the patch's target version.
+        
+        The base is the group already in the file, or else the base package's .blend in
+        the import cache, which is appended first. Only a group appended that way is
+        returned to be placed; a group patched in place keeps its users.
+        """
+        info = prepared.delta['delta_info']
+        root_name, base_hash, target_hash = info['name'], info['base_hash'], info['target_hash']
+        
+        if self._find_root(loaded_index.get(target_hash), root_name) is not None:
+            return True, f"'{root_name}' is already at version {target_hash[:12]}", []
+        
+        package_groups = loaded_index.get(base_hash)
+        root = self._find_root(package_groups, root_name)
+        appended = []
+        if root is None:
+            cache_entry = self.cache.lookup(base_hash) if self.cache is not None else None
+            if not cache_entry:
+                return False, (f"Base version {base_hash[:12]} of '{root_name}' is neither in this file nor in the "
+                               f"import cache; import the full package instead"), []
+            success, message, imported = self._load_blend_files(cache_entry['blend_files'], root_name=root_name)
+            if not success:
+                self.cache.release(base_hash)
+                return False, message, []
+            self._tag_nodegroups(imported, {'hash': base_hash})
+            package_groups = [node_group for _, _, node_group in imported]
+            root = self._find_root(package_groups, root_name)
+            appended = [item for item in imported if item[2] is root]
+            if root is None:
+                return False, f"The cached base version of '{root_name}' does not contain it", []
+        
+        if root.library is not None or root.override_library is not None:
+            return False, f"'{root.name}' comes from a linked library and cannot be patched", []
+        
+        # The delta is applied to a copy, so a base the user edited is left untouched when it does not fit
+        patched = root.copy()
+        with profiling.stage('patch'):
+            patcher = apply_delta(patched, prepared.delta)
+        if patcher.errors:
+            bpy.data.node_groups.remove(patched)
+            return False, (f"'{root.name}' differs from base version {base_hash[:12]} ({patcher.errors[0]}); "
+                           f"import the full package instead"), []
+        
+        name = root.name
+        others = [ng for ng in loaded_index.get(base_hash, []) if ng not in package_groups]
+        package_groups = [patched if node_group == root else node_group for node_group in package_groups]
+        appended = [(source_name, blend_path, patched) for source_name, blend_path, _ in appended]
+        root.user_remap(patched)
+        bpy.data.node_groups.remove(root)
+        patched.name = name
+        
+        # The other groups of the package are unchanged (deltas refuse nested changes), so all move to the target
+        for node_group in package_groups:
+            if node_group.library is None and node_group.override_library is None:
+                node_group[HASH_PROPERTY] = target_hash
+        loaded_index[base_hash] = others
+        loaded_index.setdefault(target_hash, []).extend(package_groups)
+        
+        return True, f"Patched '{name}' to version {target_hash[:12]}", appended
+    
+    @staticmethod
+    def _find_root(node_groups: Optional[list], root_name: str):
+        candidates = [ng for ng in node_groups or [] if base_name(ng.name) == root_name]
+        # Prefer the group that kept its name over '.001' copies
+        return next((ng for ng in candidates if ng.name == root_name), candidates[0] if candidates else None)
+    
+    def _new_extract_dir(self) -> str:
+        # Inside the cache's staging folder when there is one, so the startup cleanup
+        # of the store also finds what a crashed session left behind
+        root = None
+        if self.cache is not None:
+            os.makedirs(self.cache.staging_dir, exist_ok=True)
+            root = self.cache.staging_dir
+        temp_dir = tempfile.mkdtemp(prefix="nodegroup_unpack_", dir=root)
+        self.temp_dirs.append(temp_dir)
+        return temp_dir
+    
+    def _extract_node_file(self, filepath: str, temp_dir: str) -> Tuple[bool, str]:
+        try:
+            logger.debug('Extracting %s...', os.path.basename(filepath))
+            
+            # Every member is CRC-checked (and with verify_hash, hash-checked) as it is written,
+            # so there is no separate testzip pass
+            with NodeArchive(filepath) as archive:
+                content_hash = (archive.read_config() or {}).get('hash') if self.verify_hash else None
+                if content_hash:
+                    archive.verify_entries()
+                archive.extract_all(temp_dir)
+                if content_hash:
+                    archive.verify_content_hash(content_hash)
+            
             extracted_files = os.listdir(temp_dir)
-            print(f"Extracted {len(extracted_files)} files: {extracted_files}")
+            logger.debug('Extracted %s files: %s', len(extracted_files), extracted_files)
             
             return True, "Extraction successful"
             
+        except IntegrityError as e:
+            return False, f"Integrity check failed: {str(e)}"
         except zipfile.BadZipFile:
             return False, "File is not a valid zip archive"
         except Exception as e:
@@ -74,8 +389,8 @@ class NodeGroupUnpacker:
     def _validate_node_structure(self, temp_dir: str) -> Tuple[bool, str]:
         try:
             extracted_files = os.listdir(temp_dir)
-            print(f"Validating file structure...")
-            print(f"   Found files: {extracted_files}")
+            logger.debug('Validating file structure...')
+            logger.debug('   Found files: %s', extracted_files)
             
             found_files = set()
             for filename in extracted_files:
@@ -85,9 +400,11 @@ class NodeGroupUnpacker:
                     _, ext = os.path.splitext(filename)
                     if ext.lower() in {'.json', '.blend'}:
                         found_files.add(ext.lower())
+                    elif ext.lower() == COMPACT_MANIFEST_EXT:
+                        found_files.add('.json')
             
-            print(f"   Found required files: {found_files}")
-            print(f"   Required files: {self.REQUIRED_FILES}")
+            logger.debug('   Found required files: %s', found_files)
+            logger.debug('   Required files: %s', self.REQUIRED_FILES)
             
             missing_files = self.REQUIRED_FILES - found_files
             
@@ -95,7 +412,7 @@ class NodeGroupUnpacker:
                 missing_str = ", ".join(missing_files)
                 return False, f"Malformed .node file - missing required files: {missing_str}"
             
-            print("File structure validation passed")
+            logger.debug('File structure validation passed')
             return True, "Valid .node file structure"
             
         except Exception as e:
@@ -105,67 +422,238 @@ class NodeGroupUnpacker:
         try:
             config_files = [f for f in os.listdir(temp_dir) if f.endswith('.config')]
             if not config_files:
-                print("No .config file found")
+                logger.debug('No .config file found')
                 return None
             
             config_path = os.path.join(temp_dir, config_files[0])
             
-            try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                print(f"Loaded configuration: {config_files[0]}")
-                return config_data
-            except json.JSONDecodeError:
-                print(".config file is not valid JSON, skipping...")
-                return None
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config_data = parse_config(f.read())
+            logger.debug('Loaded configuration: %s', config_files[0])
+            return config_data
                 
         except Exception as e:
-            print(f"Error loading config: {e}")
+            logger.error('Error loading config: %s', e)
             return None
     
-    def _append_nodegroups(self, temp_dir: str, config_data: Optional[dict]) -> Tuple[bool, str]:
+    def _append_nodegroups(self, temp_dir: str, config_data: Optional[dict],
+                           node_groups: Optional[List[str]] = None) -> Tuple[bool, str]:
+        blend_paths = [os.path.join(temp_dir, f) for f in os.listdir(temp_dir) if f.endswith('.blend')]
+        return self._append_blend_files(blend_paths, config_data, node_groups)
+    
+    def _append_blend_files(self, blend_paths: List[str], config_data: Optional[dict],
+                            node_groups: Optional[List[str]] = None) -> Tuple[bool, str]:
+        # Without a manifest the dependencies are unknown; Blender appends them as indirect data
+        success, message, imported = self._load_blend_files(blend_paths, append_names=node_groups, requested=node_groups)
+        if not success:
+            return False, message
+        
+        self._tag_nodegroups(imported, config_data)
+        
+        should_place_at_cursor = (len(blend_paths) == 1 and len(imported) == 1)
+        mouse_coords = getattr(self, '_mouse_coords', None)
+        self._place_nodes_in_editors(imported, should_place_at_cursor, mouse_coords)
+        
+        return True, message
+    
+    def _load_blend_files(self, blend_paths: List[str], subgroups: Optional[dict] = None,
+                          root_name: Optional[str] = None, append_names: Optional[List[str]] = None,
+                          requested: Optional[List[str]] = None) -> Tuple[bool, str, list]:
+        """Append node groups from the .blend files: all of them, or only append_names.
+        
+        For a selective import only the requested groups are returned (and placed);
+        the dependencies appended with them are used by those groups.
+        """
         try:
-            blend_files = [f for f in os.listdir(temp_dir) if f.endswith('.blend')]
-            if not blend_files:
-                return False, "No .blend file found in .node package"
-            
-            print(f"Found {len(blend_files)} blend file(s): {blend_files}")
+            if not blend_paths:
+                return False, "No .blend file found in .node package", []
             
-            existing_nodegroups = set(bpy.data.node_groups.keys())
+            blend_files = [os.path.basename(path) for path in blend_paths]
+            logger.debug('Found %s blend file(s): %s', len(blend_files), blend_files)
             
             all_imported_nodegroups = []
             
-            for blend_file in blend_files:
-                blend_path = os.path.join(temp_dir, blend_file)
-                print(f"Processing blend file: {blend_file}")
+            for blend_path in blend_paths:
+                blend_file = os.path.basename(blend_path)
+                logger.debug('Processing blend file: %s', blend_file)
                 
-                with bpy.data.libraries.load(blend_path) as (data_from, data_to):
-                    print(f"Available node groups in {blend_file}: {data_from.node_groups}")
+                # Entering the load block reads the library, leaving it performs the append (or link)
+                start = time.perf_counter()
+                with bpy.data.libraries.load(blend_path, link=self.link) as (data_from, data_to):
+                    loaded = time.perf_counter()
+                    logger.debug('Available node groups in %s: %s', blend_file, data_from.node_groups)
                     
-                    if data_from.node_groups:
-                        data_to.node_groups = data_from.node_groups
-            
-            new_nodegroups = set(bpy.data.node_groups.keys()) - existing_nodegroups
-            
-            if new_nodegroups:
-                print(f"Successfully appended {len(new_nodegroups)} node group(s) from {len(blend_files)} blend file(s):")
-                for ng_name in sorted(new_nodegroups):
-                    node_group = bpy.data.node_groups[ng_name]
-                    ng_type = getattr(node_group, 'type', 'Unknown')
-                    print(f"   • {ng_name} ({ng_type})")
-                    all_imported_nodegroups.append((ng_name, ng_type, node_group))
-                
-                should_place_at_cursor = (len(blend_files) == 1 and len(all_imported_nodegroups) == 1)
+                    source_names = list(data_from.node_groups)
+                    if append_names is not None:
+                        source_names = [name for name in source_names if name in append_names]
+                    if source_names:
+                        data_to.node_groups = source_names
+                profiling.record('load', loaded - start, os.path.getsize(blend_path))
+                profiling.record('append', time.perf_counter() - loaded)
                 
-                mouse_coords = getattr(self, '_mouse_coords', None)
-                self._place_nodes_in_editors(all_imported_nodegroups, should_place_at_cursor, mouse_coords)
+                # After the load block data_to holds the appended datablocks themselves
+                appended = [
+                    (source_name, node_group)
+                    for source_name, node_group in zip(source_names, data_to.node_groups)
+                    if node_group is not None
+                ]
+                kept_names = set(requested) if requested else {root_name}
+                if self.link:
+                    # Linked groups are read-only and shared through their library, nothing to merge.
+                    # Only the root (or requested groups) are placed and overridden.
+                    appended = [(source_name, node_group) for source_name, node_group in appended
+                                if source_name in kept_names] or appended
+                    if self.override:
+                        appended = self._create_overrides(appended)
+                else:
+                    with profiling.stage('deduplicate'):
+                        if subgroups:
+                            appended = self._reuse_shared_subgroups(appended, subgroups, kept_names)
+                        if self.deduplicate and appended:
+                            appended = self._collapse_duplicates(appended)
+                    if requested:
+                        appended = [(source_name, node_group) for source_name, node_group in appended
+                                    if source_name in kept_names]
                 
-                return True, f"Appended {len(new_nodegroups)} node group(s) from {len(blend_files)} blend file(s): {', '.join(sorted(new_nodegroups))}"
-            else:
-                return False, "No new node groups were appended (they may already exist)"
+                for _, node_group in appended:
+                    all_imported_nodegroups.append((node_group.name, getattr(node_group, 'type', 'Unknown'), node_group))
+            
+            if not all_imported_nodegroups:
+                return False, "No new node groups were appended (they may already exist)", []
+            
+            logger.info('Successfully appended %s node group(s) from %s blend file(s):', len(all_imported_nodegroups), len(blend_files))
+            for ng_name, ng_type, _ in all_imported_nodegroups:
+                logger.debug('   • %s (%s)', ng_name, ng_type)
+            
+            names = ', '.join(name for name, _, _ in all_imported_nodegroups)
+            return True, f"Appended {len(all_imported_nodegroups)} node group(s) from {len(blend_files)} blend file(s): {names}", all_imported_nodegroups
                 
         except Exception as e:
-            return False, f"Error appending node groups: {str(e)}"
+            return False, f"Error appending node groups: {str(e)}", []
+    
+    def _reuse_shared_subgroups(self, appended: list, subgroups: dict, kept_names: set) -> list:
+        """Swap appended groups for identical ones already in the file instead of keeping '.001' copies.
+        
+        appended holds (name in the package, appended group) pairs. Reused nested groups
+        are dropped from the result; a reused root (or requested group, in kept_names)
+        is kept so it can still be placed.
+        """
+        appended_groups = {node_group for _, node_group in appended}
+        existing = index_subgroups(ng for ng in bpy.data.node_groups if ng not in appended_groups)
+        hasher = StructuralHasher()
+        
+        kept = []
+        reused = []
+        for source_name, node_group in appended:
+            group_hash = subgroups.get(source_name)
+            match = self._unchanged_subgroup(existing.get(group_hash), group_hash, hasher) if group_hash else None
+            
+            if match is None:
+                if group_hash:
+                    node_group[SUBGROUP_HASH_PROPERTY] = group_hash
+                kept.append((source_name, node_group))
+                continue
+            
+            node_group.user_remap(match)
+            bpy.data.node_groups.remove(node_group)
+            reused.append(match.name)
+            if source_name in kept_names:
+                kept.append((source_name, match))
+        
+        if reused:
+            logger.info('Reused %s node group(s) already in the file: %s', len(reused), ', '.join(reused))
+        return kept
+    
+    def _unchanged_subgroup(self, candidates: Optional[list], group_hash: str, hasher: StructuralHasher):
+        """First tagged group that still hashes to group_hash; edited groups are retagged with their current hash."""
+        for node_group in candidates or ():
+            current_hash = hasher.hash_tree(node_group)
+            if current_hash == group_hash:
+                return node_group
+            logger.debug("'%s' was edited since import, not reusing it", node_group.name)
+            node_group[SUBGROUP_HASH_PROPERTY] = current_hash
+        return None
+    
+    def _collapse_duplicates(self, appended: list) -> list:
+        """Merge appended groups into structurally identical groups already in the file.
+        
+        Removed nested groups are dropped from the result; a removed root is replaced by
+        the group it was merged into so it can still be placed.
+        """
+        node_groups = [node_group for _, node_group in appended]
+        root_names = {node_group.name for node_group in root_nodegroups(node_groups)}
+        names = [node_group.name for node_group in node_groups]
+        
+        deduplicator = NodeGroupDeduplicator()
+        try:
+            if not deduplicator.deduplicate(node_groups):
+                return appended
+        except Exception as e:
+            # The groups are appended either way; a failed merge only leaves duplicates behind
+            logger.warning('Could not merge duplicate node groups: %s', e)
+            if not deduplicator.remapped:
+                return appended
+        
+        kept = []
+        for (source_name, node_group), name in zip(appended, names):
+            canonical = deduplicator.remapped.get(name)
+            if canonical is None:
+                kept.append((source_name, node_group))
+            elif name in root_names:
+                kept.append((source_name, canonical))
+        return kept
+    
+    def _create_overrides(self, linked: list) -> list:
+        """Replace linked groups with local library overrides, keeping the linked group if that fails."""
+        overridden = []
+        for source_name, node_group in linked:
+            override = None
+            try:
+                override = node_group.override_create(remap_local_usages=True)
+            except Exception as e:
+                logger.warning("Could not create a library override for '%s': %s", node_group.name, e)
+            overridden.append((source_name, override or node_group))
+        return overridden
+    
+    def _register_linked_package(self, imported_nodegroups, package_name: str, content_hash: Optional[str]):
+        """Tag the library a package was linked from and move users of its older versions onto it."""
+        libraries = []
+        for _, _, node_group in imported_nodegroups:
+            linked = node_group.override_library.reference if node_group.override_library else node_group
+            if linked.library is not None and linked.library not in libraries:
+                libraries.append(linked.library)
+        
+        for library in libraries:
+            library[PACKAGE_PROPERTY] = package_name
+            if content_hash:
+                library[HASH_PROPERTY] = content_hash
+            
+            current = {ng.name: ng for ng in bpy.data.node_groups if ng.library == library}
+            remapped = 0
+            for old_library in bpy.data.libraries:
+                if (old_library == library or old_library.get(PACKAGE_PROPERTY) != package_name
+                        or old_library.get(HASH_PROPERTY) == content_hash):
+                    continue
+                for old_group in [ng for ng in bpy.data.node_groups if ng.library == old_library]:
+                    new_group = current.get(old_group.name)
+                    if new_group is not None:
+                        old_group.user_remap(new_group)
+                        remapped += 1
+            if remapped:
+                logger.info("Moved %s node group(s) of '%s' to the newly linked version", remapped, package_name)
+    
+    def _tag_nodegroups(self, imported_nodegroups, config_data: Optional[dict]):
+        content_hash = (config_data or {}).get('hash')
+        if not content_hash:
+            return
+        
+        for _, _, node_group in imported_nodegroups:
+            # Linked data cannot hold new properties; its library is tagged instead
+            if node_group.library is None and node_group.override_library is None:
+                node_group[HASH_PROPERTY] = content_hash
+        
+        if self.cache is not None:
+            self.cache.record_node_groups(content_hash, [name for name, _, _ in imported_nodegroups])
     
     def _place_nodes_in_editors(self, imported_nodegroups, place_at_cursor: bool = False, mouse_coords = None):
         """Place imported node groups as nodes in appropriate editors"""
@@ -173,7 +661,7 @@ class NodeGroupUnpacker:
             context = bpy.context
             
             if not (context.area and context.area.type == 'NODE_EDITOR' and context.space_data):
-                print("📍 Not in node editor - nodes imported but not placed")
+                logger.debug('📍 Not in node editor - nodes imported but not placed')
                 return
             
             space = context.space_data
@@ -181,11 +669,11 @@ class NodeGroupUnpacker:
             active_tree = getattr(space, 'node_tree', None)
             
             if not active_tree:
-                print("No active node tree - nodes imported but not placed")
+                logger.debug('No active node tree - nodes imported but not placed')
                 return
 
-            print(f"Detected editor context: {tree_type}")
-            print(f"Placement mode: {'cursor position' if place_at_cursor else 'automatic spacing'}")
+            logger.debug('Detected editor context: %s', tree_type)
+            logger.debug('Placement mode: %s', 'cursor position' if place_at_cursor else 'automatic spacing')
 
             compatible_groups = []
             
@@ -211,15 +699,15 @@ class NodeGroupUnpacker:
                 node_type_to_create = 'CompositorNodeGroup'
                 
             else:
-                print(f"Unsupported editor type: {tree_type}")
+                logger.debug('Unsupported editor type: %s', tree_type)
                 return
             
-            print(f"Found {len(compatible_groups)} compatible node group(s) for {tree_type}")
+            logger.debug('Found %s compatible node group(s) for %s', len(compatible_groups), tree_type)
             for name, ng_type, _ in compatible_groups:
-                print(f"   • {name} ({ng_type})")
+                logger.debug('   • %s (%s)', name, ng_type)
             
             if not compatible_groups:
-                print(f"No compatible node groups found for {tree_type}")
+                logger.debug('No compatible node groups found for %s', tree_type)
                 return
 
             cursor_location = None
@@ -233,11 +721,14 @@ class NodeGroupUnpacker:
                     else:
                         cursor_location = (0, 0)
                     
-                    print(f"Target location: {cursor_location} (converted from mouse {mouse_coords})")
+                    logger.debug('Target location: %s (converted from mouse %s)', cursor_location, mouse_coords)
                 except Exception as e:
-                    print(f"Could not convert mouse coordinates, using default: {e}")
+                    logger.warning('Could not convert mouse coordinates, using default: %s', e)
                     cursor_location = (0, 0)
             
+            for node in active_tree.nodes:
+                node.select = False
+            
             placed_count = 0
             for name, ng_type, node_group in compatible_groups:
                 try:
@@ -254,44 +745,75 @@ class NodeGroupUnpacker:
                     
                     new_node.location = location
                     
-                    for node in active_tree.nodes:
-                        node.select = False
                     new_node.select = True
                     active_tree.nodes.active = new_node
                     
-                    print(f"Placed node: {name} at ({location[0]}, {location[1]})")
+                    logger.debug('Placed node: %s at (%s, %s)', name, location[0], location[1])
                     placed_count += 1
                     
                 except Exception as e:
-                    print(f"Failed to place node {name}: {e}")
+                    logger.error('Failed to place node %s: %s', name, e)
             
             if placed_count > 0:
-                print(f"Successfully placed {placed_count} node(s) in {tree_type} editor")
+                logger.info('Successfully placed %s node(s) in %s editor', placed_count, tree_type)
                 if context.area:
                     context.area.tag_redraw()
             
         except Exception as e:
-            print(f"Error placing nodes in editors: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error('Error placing nodes in editors: %s', e, exc_info=True)
     
-    def process_multiple_files(self, file_paths: List[str]) -> Tuple[int, int, List[str]]:
+    def process_multiple_files(self, file_paths: List[str], max_workers: Optional[int] = None) -> Tuple[int, int, List[str]]:
         success_count = 0
         failure_count = 0
         error_messages = []
         
-        print(f"Processing {len(file_paths)} .node file(s)...")
+        logger.debug('Processing %s .node file(s)...', len(file_paths))
         
-        for filepath in file_paths:
-            success, message = self.unpack_node_file(filepath)
-            if success:
-                success_count += 1
-                print(f"✅ {os.path.basename(filepath)}: {message}")
-            else:
-                failure_count += 1
-                error_msg = f"❌ {os.path.basename(filepath)}: {message}"
-                print(error_msg)
-                error_messages.append(error_msg)
+        if not self.streaming:
+            for filepath in file_paths:
+                success, message = self.unpack_node_file(filepath)
+                if success:
+                    success_count += 1
+                    logger.info('✅ %s: %s', os.path.basename(filepath), message)
+                else:
+                    failure_count += 1
+                    error_msg = f"❌ {os.path.basename(filepath)}: {message}"
+                    logger.error('%s', error_msg)
+                    error_messages.append(error_msg)
+            
+            return success_count, failure_count, error_messages
+        
+        # Archive work runs on a thread pool, library loads stay on the main thread
+        with profiling.profile('import_batch', f"{len(file_paths)} file(s)"):
+            with profiling.stage('prepare'):
+                prepared_packages = self._prepare_packages(file_paths, max_workers)
+            loaded_index = self._index_loaded_nodegroups()
+            all_nodegroups = []
+            
+            with profiling.stage('load'):
+                for prepared in prepared_packages:
+                    filename = os.path.basename(prepared.filepath)
+                    if prepared.error:
+                        success, message = False, prepared.error
+                    else:
+                        success, message, nodegroups = self._load_prepared_package(prepared, loaded_index)
+                        prepared.profile.finish(None if success else message)
+                        if success:
+                            all_nodegroups.extend(nodegroups)
+                    
+                    if success:
+                        success_count += 1
+                        logger.info('✅ %s: %s', filename, message)
+                    else:
+                        failure_count += 1
+                        error_msg = f"❌ {filename}: {message}"
+                        logger.error('%s', error_msg)
+                        error_messages.append(error_msg)
+            
+            if all_nodegroups:
+                mouse_coords = getattr(self, '_mouse_coords', None)
+                with profiling.stage('place'):
+                    self._place_nodes_in_editors(all_nodegroups, len(all_nodegroups) == 1, mouse_coords)
         
         return success_count, failure_count, error_messages
     
@@ -300,9 +822,9 @@ class NodeGroupUnpacker:
             try:
                 if os.path.exists(temp_dir):
                     shutil.rmtree(temp_dir)
-                    print(f"Cleaned up temp directory: {temp_dir}")
+                    logger.debug('Cleaned up temp directory: %s', temp_dir)
             except Exception as e:
-                print(f"Failed to clean up {temp_dir}: {e}")
+                logger.error('Failed to clean up %s: %s', temp_dir, e)
         self.temp_dirs.clear()
     
     def __del__(self):
@@ -4,6 +4,7 @@ setlocal enabledelayedexpansion
 :: Package files into a .node zip file
 :: Usage: package_to_node.bat <output_name> <file1> [file2] [file3] ...
 :: Example: package_to_node.bat my_package file.txt folder\
+:: .blend members are stored without zip compression, Blender already compresses them
 
 if "%~1"=="" (
     echo Usage: %~nx0 ^<output_name^> ^<file1^> [file2] [file3] ...
@@ -64,7 +65,9 @@ powershell -NoProfile -ExecutionPolicy Bypass -Command ^
     "if (Test-Path '%node_file%') { Remove-Item '%node_file%' -Force }; " ^
     "Add-Type -AssemblyName System.IO.Compression.FileSystem; " ^
     "$zip = [System.IO.Compression.ZipFile]::Open('%CD%\%node_file%', 'Create'); " ^
+    "function Get-Level($name) { if ($name -like '*.blend') { [System.IO.Compression.CompressionLevel]::NoCompression } else { [System.IO.Compression.CompressionLevel]::Optimal } }; " ^
     "$hashData = @(); " ^
+    "$entryLines = @(); " ^
     "foreach ($file in $files) { " ^
         "if (Test-Path $file) { " ^
             "if ((Get-Item $file).PSIsContainer) { " ^
@@ -73,16 +76,18 @@ powershell -NoProfile -ExecutionPolicy Bypass -Command ^
                     "if (-not $_.PSIsContainer) { " ^
                         "$relativePath = $_.FullName.Substring((Resolve-Path $file).Path.Length + 1); " ^
                         "$entryName = $folderName + '/' + $relativePath.Replace('\', '/'); " ^
-                        "[System.IO.Compression.ZipFileExtensions]::CreateEntryFromFile($zip, $_.FullName, $entryName) | Out-Null; " ^
+                        "[System.IO.Compression.ZipFileExtensions]::CreateEntryFromFile($zip, $_.FullName, $entryName, (Get-Level $entryName)) | Out-Null; " ^
                         "$fileHash = (Get-FileHash $_.FullName -Algorithm SHA256).Hash; " ^
                         "$hashData += $entryName + ':' + $fileHash; " ^
+                        "$entryLines += 'entry=' + $_.Length + ' - ' + $fileHash + ' ' + $entryName; " ^
                     "} " ^
                 "}; " ^
             "} else { " ^
                 "$fileName = Split-Path $file -Leaf; " ^
-                "[System.IO.Compression.ZipFileExtensions]::CreateEntryFromFile($zip, (Resolve-Path $file).Path, $fileName) | Out-Null; " ^
+                "[System.IO.Compression.ZipFileExtensions]::CreateEntryFromFile($zip, (Resolve-Path $file).Path, $fileName, (Get-Level $fileName)) | Out-Null; " ^
                 "$fileHash = (Get-FileHash (Resolve-Path $file).Path -Algorithm SHA256).Hash; " ^
                 "$hashData += $fileName + ':' + $fileHash; " ^
+                "$entryLines += 'entry=' + (Get-Item $file).Length + ' - ' + $fileHash + ' ' + $fileName; " ^
             "} " ^
         "} " ^
     "}; " ^
@@ -92,7 +97,7 @@ powershell -NoProfile -ExecutionPolicy Bypass -Command ^
     "$hashString = [System.BitConverter]::ToString($finalHash).Replace('-', '').ToLower(); " ^
     "$configEntry = $zip.CreateEntry('.config'); " ^
     "$configStream = $configEntry.Open(); " ^
-    "$configBytes = [System.Text.Encoding]::UTF8.GetBytes('hash=' + $hashString + [Environment]::NewLine + 'created=' + (Get-Date -Format 'yyyy-MM-ddTHH:mm:ssZ') + [Environment]::NewLine); " ^
+    "$configBytes = [System.Text.Encoding]::UTF8.GetBytes('hash=' + $hashString + [Environment]::NewLine + 'created=' + (Get-Date -Format 'yyyy-MM-ddTHH:mm:ssZ') + [Environment]::NewLine + 'format_version=2' + [Environment]::NewLine + ($entryLines -join [Environment]::NewLine) + [Environment]::NewLine); " ^
     "$configStream.Write($configBytes, 0, $configBytes.Length); " ^
     "$configStream.Close(); " ^
     "$zip.Dispose(); " ^
@@ -0,0 +1,131 @@
+"""The .config member of a package: content hash, export settings and per-entry records.
+
+The file is key=value lines, which is what package.bat has always written, and
+JSON is accepted as well. Format version 2 adds one line per zip entry::
+
+    format_version=2
+    hash=<content hash>
+    created=2025-09-07T12:34:56Z
+    entry=<size> <CRC-32, 8 hex digits or -> <SHA-256> <entry name>
+
+The content hash is derived from the entry SHA-256s (see compute_content_hash),
+so the records can be checked against it without reading any data. Readers of
+version 1 see the entry lines as one unknown key and ignore them.
+"""
+
+import json
+from typing import Dict, List, Optional
+
+CONFIG_FORMAT_VERSION = 2
+ENTRY_KEY = 'entry'
+# Written in place of the CRC by packagers that cannot compute one (package.bat)
+UNKNOWN_CRC = '-'
+
+
+class ConfigError(ValueError):
+    pass
+
+
+class EntryRecord:
+    """Size, CRC-32 and SHA-256 of one zip entry, as recorded when the package was written."""
+
+    def __init__(self, size: int, crc: Optional[int], sha256: str):
+        self.size = size
+        self.crc = crc
+        self.sha256 = sha256.upper()
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, EntryRecord)
+                and (self.size, self.crc, self.sha256) == (other.size, other.crc, other.sha256))
+
+    def to_line(self, name: str) -> str:
+        crc = UNKNOWN_CRC if self.crc is None else f"{self.crc:08x}"
+        return f"{ENTRY_KEY}={self.size} {crc} {self.sha256} {name}"
+
+    @classmethod
+    def from_value(cls, value: str):
+        """Parse the value of an entry line into (name, record)."""
+        parts = value.split(' ', 3)
+        if len(parts) != 4 or not parts[3]:
+            raise ConfigError(f"Malformed entry record: {value!r}")
+        size, crc, sha256, name = parts
+        try:
+            return name, cls(int(size), None if crc == UNKNOWN_CRC else int(crc, 16), sha256)
+        except ValueError as e:
+            raise ConfigError(f"Malformed entry record: {value!r}") from e
+
+
+class PackageConfig:
+    """A parsed .config. values holds every plain key, as strings; entries the per-entry records."""
+
+    def __init__(self, values: Optional[dict] = None, entries: Optional[Dict[str, EntryRecord]] = None):
+        self.values = dict(values or {})
+        self.entries = dict(entries or {})
+
+    @property
+    def content_hash(self) -> Optional[str]:
+        return self.values.get('hash')
+
+    @property
+    def format_version(self) -> int:
+        try:
+            return int(str(self.values.get('format_version', 1)).split('.')[0])
+        except ValueError:
+            return 1
+
+    def entry_hashes(self) -> List[str]:
+        """The '<entry>:<SHA256>' strings the content hash is computed from."""
+        return [f"{name}:{record.sha256}" for name, record in self.entries.items()]
+
+    def to_text(self) -> str:
+        values = dict(self.values)
+        if self.entries:
+            values['format_version'] = CONFIG_FORMAT_VERSION
+        lines = [f"{key}={value}" for key, value in values.items()]
+        lines.extend(record.to_line(name) for name, record in self.entries.items())
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def parse(cls, text: str) -> 'PackageConfig':
+        stripped = text.strip()
+        if stripped.startswith('{'):
+            try:
+                data = json.loads(stripped)
+            except json.JSONDecodeError:
+                pass
+            else:
+                return cls._from_json(data)
+
+        values = {}
+        entries = {}
+        for line in stripped.splitlines():
+            key, sep, value = line.partition('=')
+            key = key.strip()
+            if not sep or not key:
+                continue
+            if key == ENTRY_KEY:
+                name, record = EntryRecord.from_value(value.strip())
+                entries[name] = record
+            else:
+                values[key] = value.strip()
+        return cls(values, entries)
+
+    @classmethod
+    def _from_json(cls, data) -> 'PackageConfig':
+        if not isinstance(data, dict):
+            raise ConfigError("A JSON .config must be an object")
+        values = {key: value for key, value in data.items() if key != 'entries'}
+        entries = {}
+        for name, record in (data.get('entries') or {}).items():
+            try:
+                crc = record.get('crc')
+                entries[name] = EntryRecord(int(record['size']), None if crc is None else int(str(crc), 16),
+                                            record['sha256'])
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                raise ConfigError(f"Malformed entry record for {name}: {e}") from e
+        return cls(values, entries)
+
+
+def parse_config(text: str) -> dict:
+    """Parse a .config payload into its plain keys, accepting both JSON and package.bat's key=value lines."""
+    return PackageConfig.parse(text).values
@@ -0,0 +1,80 @@
+import os
+from typing import Iterable, List
+
+from .node_archive import NodeArchive
+
+# Manifest sections that describe what a package contains; nodes and links are never read
+INSPECT_SECTIONS = ('nodegroup_info', 'dependencies')
+
+
+class PackageContents:
+    """The node groups a package holds, read from its manifest without loading any .blend data.
+
+    node_groups lists the root first, then every nested group the manifest names.
+    Packages exported with bundled dependencies also record which groups each group
+    uses, so the dependencies of any group are known; older packages only say that
+    the root depends on everything else.
+    """
+
+    def __init__(self, filepath: str, metadata: dict, config_data: dict, blend_files: List[str]):
+        nodegroup_info = metadata.get('nodegroup_info', {})
+        dependencies = metadata.get('dependencies', {})
+
+        self.filepath = filepath
+        self.name = nodegroup_info.get('name', '')
+        self.package_name = nodegroup_info.get('package_name', self.name)
+        self.type = nodegroup_info.get('type', '')
+        self.content_hash = config_data.get('hash')
+        self.blend_files = blend_files
+        self.subgroups = dependencies.get('subgroups', {})
+        self.children = dependencies.get('children', {})
+
+        nested = [name for name in dependencies.get('node_groups', []) if name != self.name]
+        self.node_groups = ([self.name] if self.name else []) + nested
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.node_groups
+
+    def dependencies_of(self, names: Iterable[str]) -> List[str]:
+        """The given groups plus every group they use, in node_groups order."""
+        names = list(names)
+        unknown = [name for name in names if name not in self.node_groups]
+        if unknown:
+            raise ValueError(f"Node group(s) not in package {os.path.basename(self.filepath)}: {', '.join(unknown)}")
+
+        if self.children:
+            closure = set()
+            stack = list(names)
+            while stack:
+                name = stack.pop()
+                if name not in closure:
+                    closure.add(name)
+                    stack.extend(self.children.get(name, []))
+        elif self.name in names:
+            closure = set(self.node_groups)
+        else:
+            # Without a per-group map, Blender still appends what these use as indirect data
+            closure = set(names)
+
+        return [name for name in self.node_groups if name in closure]
+
+    def to_dict(self) -> dict:
+        return {
+            'filepath': self.filepath,
+            'name': self.name,
+            'package_name': self.package_name,
+            'type': self.type,
+            'hash': self.content_hash,
+            'node_groups': self.node_groups,
+            'children': self.children,
+            'blend_files': self.blend_files
+        }
+
+
+def inspect_package(filepath: str) -> PackageContents:
+    """List the node groups of a package from its central directory, manifest and .config."""
+    with NodeArchive(filepath) as archive:
+        config_data = archive.read_config() or {}
+        metadata = archive.read_manifest(INSPECT_SECTIONS) or {}
+        blend_files = [os.path.basename(name) for name in archive.blend_names]
+    return PackageContents(filepath, metadata, config_data, blend_files)
@@ -0,0 +1,189 @@
+"""Per-stage wall time and byte counts for exports and imports.
+
+Every export and every imported package records a Profile. Code inside the pipeline
+marks its stages with ``with stage('zip'):``, which is a no-op when no profile is
+active on the current thread. Finished profiles are kept in memory and, if a log
+path is set, appended to it as JSON lines::
+
+    from serialization import profiling
+
+    profiling.set_log_path("/tmp/node_profile.jsonl")
+    ...
+    for profile in profiling.recent_profiles():
+        print(profile['operation'], profile['target'], profile['stages'])
+"""
+
+import os
+import json
+import time
+import datetime
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import List, Optional
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+RECENT_PROFILES = 100
+
+_current = contextvars.ContextVar('node_file_profile', default=None)
+_recent = deque(maxlen=RECENT_PROFILES)
+_lock = threading.Lock()
+_log_path = None
+
+
+class Stage:
+    __slots__ = ('name', 'seconds', 'bytes', 'calls')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.bytes = 0
+        self.calls = 0
+
+    def to_dict(self) -> dict:
+        return {'seconds': round(self.seconds, 6), 'bytes': self.bytes, 'calls': self.calls}
+
+
+class Profile:
+    """Stages of one export or one imported package. Repeated stages accumulate."""
+
+    def __init__(self, operation: str, target: str):
+        self.operation = operation
+        self.target = target
+        self.stages = {}
+        self.error = None
+        self.started = datetime.datetime.now(datetime.timezone.utc)
+        self._start = time.perf_counter()
+        self.seconds = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, nbytes: int = 0):
+        record = Stage(name)
+        record.bytes = nbytes
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            self.add(name, time.perf_counter() - start, record.bytes)
+
+    def add(self, name: str, seconds: float, nbytes: int = 0):
+        with self._lock:
+            total = self.stages.setdefault(name, Stage(name))
+            total.seconds += seconds
+            total.bytes += nbytes
+            total.calls += 1
+
+    @property
+    def finished(self) -> bool:
+        return self.seconds is not None
+
+    def finish(self, error: Optional[str] = None):
+        if self.finished:
+            return
+        self.seconds = time.perf_counter() - self._start
+        self.error = error or self.error
+        _publish(self)
+
+    def to_dict(self) -> dict:
+        return {
+            'operation': self.operation,
+            'target': self.target,
+            'started': self.started.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+            'seconds': round(self.seconds, 6) if self.seconds is not None else None,
+            'error': self.error,
+            'stages': {name: stage.to_dict() for name, stage in self.stages.items()}
+        }
+
+    def summary(self) -> str:
+        parts = [f"{name} {stage.seconds * 1000:.1f} ms" for name, stage in self.stages.items()]
+        total = f"{self.seconds * 1000:.1f} ms" if self.seconds is not None else "running"
+        return f"{self.operation} {os.path.basename(self.target)}: {total} ({', '.join(parts)})"
+
+
+def _publish(profile: Profile):
+    record = profile.to_dict()
+    with _lock:
+        _recent.append(record)
+        log_path = _log_path
+    logger.info('%s', profile.summary())
+
+    if log_path:
+        try:
+            with _lock, open(log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning('Could not write profile log %s: %s', log_path, e)
+
+
+def start_profile(operation: str, target: str) -> Profile:
+    """Create a profile without activating it; pair with activate() and Profile.finish()."""
+    return Profile(operation, target)
+
+
+@contextmanager
+def activate(profile: Optional[Profile]):
+    """Make profile the target of stage() calls on this thread, e.g. in a worker or timer."""
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def profile(operation: str, target: str):
+    """Record a whole operation; the profile is finished and published on exit."""
+    current = Profile(operation, target)
+    with activate(current):
+        try:
+            yield current
+        except Exception as e:
+            current.finish(str(e))
+            raise
+    current.finish()
+
+
+@contextmanager
+def stage(name: str, nbytes: int = 0):
+    """Time a stage of the active profile. Set ``.bytes`` on the yielded record if the size is known later."""
+    current = _current.get()
+    if current is None:
+        yield Stage(name)
+        return
+    with current.stage(name, nbytes) as record:
+        yield record
+
+
+def record(name: str, seconds: float, nbytes: int = 0):
+    """Add an already measured duration to the active profile, for stages that are not a single block."""
+    current = _current.get()
+    if current is not None:
+        current.add(name, seconds, nbytes)
+
+
+def current_profile() -> Optional[Profile]:
+    return _current.get()
+
+
+def recent_profiles(operation: Optional[str] = None) -> List[dict]:
+    with _lock:
+        records = list(_recent)
+    if operation:
+        records = [entry for entry in records if entry['operation'] == operation]
+    return records
+
+
+def clear_profiles():
+    with _lock:
+        _recent.clear()
+
+
+def set_log_path(path: Optional[str]):
+    """Append every finished profile to path as one JSON object per line; None disables the log."""
+    global _log_path
+    with _lock:
+        _log_path = path
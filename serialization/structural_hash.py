@@ -0,0 +1,189 @@
+import bpy
+import json
+import hashlib
+from typing import Dict, List, Optional, Iterable
+
+from .nodegroup_serializer import NodeGroupSerializer, compute_graph_fingerprint
+from .dependency_graph import SUBGROUP_HASH_PROPERTY, base_name, subgroup_hash
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+# RNA properties left out of the settings hash: selection, and values Blender derives from others
+SKIPPED_RNA_PROPERTIES = frozenset(('rna_type', 'select', 'dimensions', 'internal_links', 'is_linked', 'links'))
+# Tree-level properties covered by the walk over nodes, links and interface items, and node
+# editor state (pan position, annotations) that does not change what the group computes
+SKIPPED_TREE_PROPERTIES = frozenset(('nodes', 'links', 'interface', 'animation_data',
+                                     'view_center', 'grease_pencil', 'annotation'))
+# Nested structs (color ramps, curve mappings, their points...) are followed this deep
+MAX_RNA_DEPTH = 4
+
+
+def _reference_types() -> tuple:
+    # Pointers to these are references inside the tree, not settings, and would recurse forever
+    names = ('Node', 'NodeSocket', 'NodeLink', 'NodeTreeInterfaceItem')
+    return tuple(getattr(bpy.types, name) for name in names if isinstance(getattr(bpy.types, name, None), type))
+
+
+def _plain(value):
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    try:
+        return [_plain(item) for item in value]
+    except TypeError:
+        return str(value)
+
+
+def rna_settings(struct, skip=frozenset(), depth: int = 0) -> dict:
+    """Every RNA property of a struct as plain values, following nested structs and collections.
+
+    ID pointers become the ID's type and name (the base name for node groups, whose
+    content is hashed on its own); other pointers to nodes, sockets and interface
+    items, like a frame parent, become their name or identifier.
+    """
+    values = {}
+    references = _reference_types()
+    for prop in struct.bl_rna.properties:
+        identifier = prop.identifier
+        if identifier in SKIPPED_RNA_PROPERTIES or identifier in skip:
+            continue
+        try:
+            value = getattr(struct, identifier)
+        except AttributeError:
+            continue
+        if prop.type == 'POINTER':
+            values[identifier] = _pointer_value(value, references, depth)
+        elif prop.type == 'COLLECTION':
+            # Items of a collection (sockets of a node, points of a curve) are owned by it, so they are followed
+            values[identifier] = [_pointer_value(item, (), depth) for item in value]
+        else:
+            values[identifier] = _plain(value)
+    return values
+
+
+def _pointer_value(value, references: tuple, depth: int):
+    if value is None:
+        return None
+    if isinstance(value, bpy.types.ID):
+        name = base_name(value.name) if isinstance(value, bpy.types.NodeTree) else value.name_full
+        return [type(value).__name__, name]
+    if references and isinstance(value, references):
+        return getattr(value, 'identifier', None) or getattr(value, 'name', None)
+    if depth >= MAX_RNA_DEPTH or not hasattr(value, 'bl_rna'):
+        return None
+    return rna_settings(value, depth=depth + 1)
+
+
+def settings_fingerprint(node_tree) -> str:
+    """SHA-256 over the full RNA state of a tree's nodes, sockets and interface items.
+
+    The serializer's manifest only keeps the node properties it can rebuild, so two groups
+    differing in a clamp flag or a color ramp would otherwise hash the same.
+    """
+    id_properties = frozenset(prop.identifier for prop in bpy.types.ID.bl_rna.properties)
+    settings = {
+        'tree': rna_settings(node_tree, id_properties | SKIPPED_TREE_PROPERTIES),
+        'interface': [rna_settings(item) for item in node_tree.interface.items_tree],
+        'nodes': sorted((rna_settings(node) for node in node_tree.nodes), key=lambda values: values.get('name', '')),
+    }
+    canonical = json.dumps(settings, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class StructuralHasher:
+    """Content hashes of node trees, computed from the same walk the serializer uses.
+
+    Two groups hash the same when their interface, nodes, links and layout match, every
+    RNA setting of their nodes and interface items matches, their names only differ by a
+    '.001' suffix, and the groups nested in them hash the same. Hashes are memoized, so
+    hashing every group of a file walks each tree once.
+    """
+
+    def __init__(self):
+        self._serializer = NodeGroupSerializer()
+        self._hashes: Dict[str, str] = {}
+
+    def hash_tree(self, node_tree) -> str:
+        key = node_tree.name_full
+        if key not in self._hashes:
+            child_hashes = [self.hash_tree(child) for child in self._child_trees(node_tree)]
+            graph = compute_graph_fingerprint(self._serializer._build_graph_metadata(node_tree))
+            fingerprint = f"{graph}:{settings_fingerprint(node_tree)}"
+            self._hashes[key] = subgroup_hash(fingerprint, node_tree.name, child_hashes)
+        return self._hashes[key]
+
+    def _child_trees(self, node_tree) -> list:
+        children = []
+        for node in node_tree.nodes:
+            child = getattr(node, 'node_tree', None)
+            if child is not None and child != node_tree and child not in children:
+                children.append(child)
+        return children
+
+
+def _pick_canonical(node_groups: list):
+    # Prefer a group that already carries its hash, then the one without a '.001' suffix
+    for node_group in node_groups:
+        if node_group.get(SUBGROUP_HASH_PROPERTY):
+            return node_group
+    for node_group in node_groups:
+        if node_group.name == base_name(node_group.name):
+            return node_group
+    return node_groups[0]
+
+
+class NodeGroupDeduplicator:
+    """Collapses structurally identical node groups onto one datablock and remaps their users."""
+
+    def __init__(self, hasher: Optional[StructuralHasher] = None):
+        self.hasher = hasher or StructuralHasher()
+        # Name of every removed group -> the group its users were remapped to
+        self.remapped: Dict[str, object] = {}
+
+    def deduplicate(self, candidates: Optional[Iterable] = None) -> int:
+        """Merge duplicates among all local node groups.
+
+        If candidates is given, only those groups can be removed; every other local group
+        can still serve as the canonical copy. Returns the number of groups removed.
+        """
+        local_groups = [ng for ng in bpy.data.node_groups if ng.library is None]
+        if candidates is None:
+            removable = set(local_groups)
+        else:
+            removable = set(candidates)
+            # The base name is part of the hash, so groups with other names can never match
+            names = {base_name(ng.name) for ng in removable}
+            local_groups = [ng for ng in local_groups if base_name(ng.name) in names]
+
+        by_hash: Dict[str, List] = {}
+        for node_group in local_groups:
+            by_hash.setdefault(self.hasher.hash_tree(node_group), []).append(node_group)
+
+        duplicates = []
+        for group_hash, node_groups in by_hash.items():
+            keepers = [ng for ng in node_groups if ng not in removable] or node_groups
+            canonical = _pick_canonical(keepers)
+            canonical[SUBGROUP_HASH_PROPERTY] = group_hash
+            duplicates.extend(
+                (node_group, canonical) for node_group in node_groups
+                if node_group != canonical and node_group in removable
+            )
+
+        # Hashes are all computed before anything is removed, so removal order does not matter
+        for node_group, canonical in duplicates:
+            self.remapped[node_group.name] = canonical
+            node_group.user_remap(canonical)
+            bpy.data.node_groups.remove(node_group)
+
+        if duplicates:
+            logger.info('Merged %s duplicate node group(s) into %s canonical group(s)', len(duplicates), len({ng.name for ng in self.remapped.values()}))
+        return len(duplicates)
+
+
+def deduplicate_node_groups(candidates: Optional[Iterable] = None) -> Dict[str, str]:
+    """Merge duplicate node groups and return a map of removed name -> canonical name."""
+    deduplicator = NodeGroupDeduplicator()
+    deduplicator.deduplicate(candidates)
+    return {name: canonical.name for name, canonical in deduplicator.remapped.items()}
@@ -0,0 +1,40 @@
+"""Unit tests for the bpy-free serialization modules, runnable without Blender::
+
+    python -m pytest tests
+
+The addon is imported through the benchmark stub of bpy (benchmarks/bpy_stub.py), so
+only code that never touches real Blender data can be tested here.
+"""
+
+import os
+import sys
+import importlib
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import bpy_stub  # noqa: E402
+
+bpy_stub.install()
+bpy_stub.load_addon()
+
+
+def addon_module(name: str):
+    """Import a module of the addon, e.g. addon_module('serialization.node_packager')."""
+    return importlib.import_module(f"{bpy_stub.ADDON_PACKAGE}.{name}")
+
+
+@pytest.fixture
+def write_files(tmp_path):
+    """Write {name: bytes} into a fresh source folder and return the paths, in order."""
+    def write(files: dict) -> list:
+        source_dir = tmp_path / "source"
+        source_dir.mkdir(exist_ok=True)
+        paths = []
+        for name, data in files.items():
+            path = source_dir / name
+            path.write_bytes(data)
+            paths.append(str(path))
+        return paths
+    return write
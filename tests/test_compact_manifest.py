@@ -0,0 +1,79 @@
+import json
+import math
+import random
+
+import pytest
+
+from conftest import addon_module
+from synthetic import TreeSpec, build_manifest
+
+compact_manifest = addon_module('serialization.compact_manifest')
+
+
+@pytest.mark.parametrize('spec', [
+    TreeSpec("Small", nodes=5, links=4, sockets=2),
+    TreeSpec("Nested", nodes=300, links=450, sockets=9, nested=4),
+])
+def test_round_trip(spec):
+    manifest = build_manifest(spec)
+    data = compact_manifest.encode_manifest(manifest)
+    # The JSON manifest is the reference: whatever it holds must come back unchanged
+    assert compact_manifest.decode_manifest(data) == json.loads(json.dumps(manifest))
+    assert len(data) < len(json.dumps(manifest))
+
+
+def test_read_section():
+    manifest = build_manifest(TreeSpec("Tree", nodes=20, links=30))
+    data = compact_manifest.encode_manifest(manifest)
+    assert compact_manifest.read_section(data, 'nodegroup_info') == manifest['nodegroup_info']
+    assert compact_manifest.read_section(data, 'missing') is None
+    assert set(compact_manifest.read_sections(data, ('nodes', 'links'))) == {'nodes', 'links'}
+
+
+def test_mixed_values():
+    manifest = {'values': [None, True, 0, -1, 2 ** 40, 0.1, "text", [0.5, 0.25], {'key': [1, "a"]}],
+                'rows': [{'a': 1, 'b': "x"}, {'a': 2.5}, {'b': None, 'c': [1.0, 2.0]}]}
+    assert compact_manifest.decode_manifest(compact_manifest.encode_manifest(manifest)) == manifest
+
+
+@pytest.mark.parametrize('value', [1e300, -1e300, 3.5e38, 5e-324, math.inf, -math.inf])
+def test_floats_outside_float32(value):
+    manifest = {'scalar': value, 'list': [0.5, value], 'rows': [{'x': 0.5, 'v': [value, 1.0]}, {'x': value, 'v': [0.0]}]}
+    assert compact_manifest.decode_manifest(compact_manifest.encode_manifest(manifest)) == manifest
+
+
+@pytest.mark.parametrize('value', [-2 ** 63 - 1, -2 ** 63, 2 ** 63, -2 ** 200, 2 ** 200])
+def test_ints_of_any_size(value):
+    manifest = {'scalar': value, 'list': [1, value], 'rows': [{'n': 1}, {'n': value}]}
+    assert compact_manifest.decode_manifest(compact_manifest.encode_manifest(manifest)) == manifest
+
+
+def test_random_round_trips():
+    rng = random.Random(0)
+
+    def scalar():
+        kind = rng.randrange(5)
+        if kind == 0:
+            return rng.choice([-1, 1]) * rng.randrange(2 ** rng.randrange(1, 80))
+        if kind == 1:
+            return rng.choice([-1, 1]) * 10.0 ** rng.uniform(-320, 308)
+        if kind == 2:
+            return rng.choice([None, True, False])
+        if kind == 3:
+            return rng.choice(["", "a", "Socket_1", "ü"])
+        return [rng.random() for _ in range(rng.randrange(1, 4))]
+
+    for _ in range(500):
+        keys = ["a", "b", "c"]
+        manifest = {
+            'value': scalar(),
+            'values': [scalar() for _ in range(rng.randrange(4))],
+            'rows': [{key: scalar() for key in keys if rng.random() < 0.8} or {'a': 0} for _ in range(rng.randrange(2, 5))],
+        }
+        assert compact_manifest.decode_manifest(compact_manifest.encode_manifest(manifest)) == manifest
+
+
+@pytest.mark.parametrize('data', [b"", b"JSON{}", compact_manifest.MAGIC + b"\x05"])
+def test_corrupt_data(data):
+    with pytest.raises(compact_manifest.CompactManifestError):
+        compact_manifest.decode_manifest(data)
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from conftest import addon_module
+
+delta_package = addon_module('serialization.delta_package')
+node_packager = addon_module('serialization.node_packager')
+manifest_delta = addon_module('serialization.manifest_delta')
+
+
+def _package(tmp_path, write_files, name: str, nodes: list, dependencies: dict) -> str:
+    manifest = {'nodegroup_info': {'name': 'Tree', 'package_name': 'Tree'}, 'interface': {'inputs': [], 'outputs': []},
+                'nodes': nodes, 'links': [], 'dependencies': dependencies}
+    paths = write_files({"Tree.blend": name.encode('utf-8') * 100, "Tree.json": json.dumps(manifest).encode('utf-8')})
+    output = str(tmp_path / f"{name}.node")
+    success, message = node_packager.package_node_files(output, paths)
+    assert success, message
+    return output
+
+
+def _nodes(operation: str) -> list:
+    return [{'name': 'Math', 'bl_idname': 'ShaderNodeMath', 'properties': {'operation': operation}}]
+
+
+def test_patch_package(tmp_path, write_files):
+    dependencies = {'node_groups': ['Sub'], 'subgroups': {'Tree': 'a' * 64, 'Sub': 'b' * 64}}
+    base = _package(tmp_path, write_files, "v1", _nodes('ADD'), dependencies)
+    target = _package(tmp_path, write_files, "v2", _nodes('MULTIPLY'), dependencies)
+
+    success, patch_path = delta_package.create_delta_package(base, target)
+    assert success, patch_path
+    assert patch_path == str(tmp_path / "v2.patch.node")
+    delta = delta_package.build_delta(base, target)
+    assert delta['nodes']['changed'] == [{'name': 'Math', 'fields': {'properties': {'operation': 'MULTIPLY'}}}]
+
+
+def test_refuses_packages_without_subgroup_hashes(tmp_path, write_files):
+    base = _package(tmp_path, write_files, "v1", _nodes('ADD'), {'node_groups': ['Sub']})
+    target = _package(tmp_path, write_files, "v2", _nodes('MULTIPLY'), {'node_groups': ['Sub']})
+
+    success, message = delta_package.create_delta_package(base, target)
+    assert not success
+    assert "bundled dependencies" in message
+    assert not (tmp_path / "v2.patch.node").exists()
+    with pytest.raises(manifest_delta.DeltaError):
+        delta_package.build_delta(base, target)
@@ -0,0 +1,168 @@
+import os
+import time
+
+import pytest
+
+from conftest import addon_module
+
+import_cache = addon_module('serialization.import_cache')
+ImportCache = import_cache.ImportCache
+
+
+class FakeArchive:
+    """Stands in for NodeArchive: extract_blends writes one .blend of the given size."""
+
+    def __init__(self, name: str, size: int, fail: bool = False):
+        self.filepath = f"/packages/{name}.node"
+        self.name = name
+        self.size = size
+        self.fail = fail
+        self.extracted = 0
+
+    def extract_blends(self, dest_dir: str) -> list:
+        self.extracted += 1
+        path = os.path.join(dest_dir, f"{self.name}.blend")
+        with open(path, 'wb') as f:
+            f.write(b"B" * self.size)
+        if self.fail:
+            raise OSError("disk full")
+        return [path]
+
+    def verify_content_hash(self, expected_hash: str):
+        pass
+
+
+def _hash(index: int) -> str:
+    return f"{index:064x}"
+
+
+def test_store_and_lookup(tmp_path):
+    cache = ImportCache(str(tmp_path))
+    archive = FakeArchive("Cube", 100)
+    paths = cache.store_blends(_hash(1), archive)
+    assert paths == [os.path.join(str(tmp_path), _hash(1), "Cube.blend")]
+    assert cache.store_blends(_hash(1), archive) == paths
+    assert archive.extracted == 1
+
+    reopened = ImportCache(str(tmp_path))
+    assert reopened.lookup(_hash(1))['blend_files'] == paths
+    assert reopened.total_size == 100
+
+
+def test_failed_extraction_is_not_published(tmp_path):
+    cache = ImportCache(str(tmp_path))
+    with pytest.raises(OSError):
+        cache.store_blends(_hash(1), FakeArchive("Cube", 100, fail=True))
+    assert cache.lookup(_hash(1)) is None
+    assert not os.path.exists(cache.entry_dir(_hash(1)))
+    assert os.listdir(cache.staging_dir) == []
+
+
+def test_lookup_drops_incomplete_entries(tmp_path):
+    cache = ImportCache(str(tmp_path))
+    paths = cache.store_blends(_hash(1), FakeArchive("Cube", 100))
+    os.remove(paths[0])
+    assert cache.lookup(_hash(1)) is None
+    assert _hash(1) not in cache.entries
+
+
+def test_least_recently_used_are_evicted(tmp_path):
+    cache = ImportCache(str(tmp_path), max_bytes=250)
+    for index in range(3):
+        cache.store_blends(_hash(index), FakeArchive(f"Tree{index}", 100))
+        cache.release(_hash(index))
+    # Storing the third entry went over the cap; the oldest went
+    assert sorted(cache.entries) == [_hash(1), _hash(2)]
+
+    cache.lookup(_hash(1))
+    cache.release(_hash(1))
+    cache.store_blends(_hash(3), FakeArchive("Tree3", 100))
+    assert sorted(cache.entries) == [_hash(1), _hash(3)]
+    assert not os.path.exists(cache.entry_dir(_hash(2)))
+
+
+def test_entries_in_use_are_kept(tmp_path):
+    cache = ImportCache(str(tmp_path), max_bytes=150)
+    cache.store_blends(_hash(1), FakeArchive("Tree1", 100))
+    cache.store_blends(_hash(2), FakeArchive("Tree2", 100))
+    # Neither was loaded yet, so the store stays over its cap for now
+    assert sorted(cache.entries) == [_hash(1), _hash(2)]
+
+
+def test_cleanup_stale(tmp_path):
+    cache = ImportCache(str(tmp_path))
+    cache.store_blends(_hash(1), FakeArchive("Kept", 100))
+    old = time.time() - import_cache.STALE_SECONDS - 1
+
+    staged = os.path.join(cache.staging_dir, "crashed")
+    orphan = os.path.join(str(tmp_path), _hash(2))
+    recent = os.path.join(str(tmp_path), _hash(3))
+    for path in (staged, orphan, recent):
+        os.makedirs(path)
+    for path in (staged, orphan):
+        os.utime(path, (old, old))
+
+    assert ImportCache(str(tmp_path)).cleanup_stale() == 2
+    assert not os.path.exists(staged)
+    assert not os.path.exists(orphan)
+    # Might belong to another Blender instance that is still working
+    assert os.path.exists(recent)
+    assert os.path.exists(cache.entry_dir(_hash(1)))
+
+
+def test_cleanup_temp_dirs(tmp_path):
+    old = time.time() - import_cache.STALE_SECONDS - 1
+    for name in ("nodegroup_unpack_abc", "nodegroup_export_def", "unrelated"):
+        os.makedirs(tmp_path / name)
+        os.utime(tmp_path / name, (old, old))
+    assert import_cache.cleanup_temp_dirs(str(tmp_path)) == 2
+    assert os.listdir(tmp_path) == ["unrelated"]
+
+
+def test_linked_store_is_never_trimmed(tmp_path):
+    import_cache.set_cache_limit(150)
+    try:
+        store = import_cache.open_library_store(str(tmp_path))
+        for index in range(3):
+            store.store_blends(_hash(index), FakeArchive(f"Tree{index}", 100))
+            store.release(_hash(index))
+        assert store.limit is None
+        assert len(store.entries) == 3
+        assert store.cleanup_stale() == 0
+        assert all(os.path.exists(store.entry_dir(_hash(index))) for index in range(3))
+    finally:
+        import_cache.set_cache_limit(import_cache.DEFAULT_CACHE_LIMIT)
+
+
+@pytest.mark.parametrize('content_hash', ["../../outside", "/tmp/x", "A" * 64, "a" * 63, "", None])
+def test_malformed_hashes_are_rejected(tmp_path, content_hash):
+    cache = ImportCache(str(tmp_path / "cache"))
+    archive = FakeArchive("Cube", 100)
+    with pytest.raises(ValueError):
+        cache.store_blends(content_hash, archive)
+    assert archive.extracted == 0
+    assert cache.lookup(content_hash) is None
+    cache.evict(content_hash)
+    assert sorted(os.listdir(tmp_path)) == ["cache"]
+
+
+def test_index_with_malformed_hashes(tmp_path):
+    with open(tmp_path / import_cache.INDEX_FILENAME, 'w') as f:
+        f.write('{"../x": {"blend_files": []}, "%s": {"blend_files": []}}' % _hash(1))
+    assert list(ImportCache(str(tmp_path)).entries) == [_hash(1)]
+
+
+def test_entry_is_kept_until_every_import_released_it(tmp_path):
+    cache = ImportCache(str(tmp_path), max_bytes=150)
+    # Two imports of the same package, then a third package that goes over the cap
+    cache.store_blends(_hash(1), FakeArchive("Tree1", 100))
+    cache.lookup(_hash(1))
+    cache.release(_hash(1))
+    cache.store_blends(_hash(2), FakeArchive("Tree2", 100))
+    assert _hash(1) in cache.entries
+
+    cache.record_node_groups(_hash(1), ["Tree1"])
+    cache.release(_hash(1))
+    cache.release(_hash(2))
+    cache.store_blends(_hash(3), FakeArchive("Tree3", 100))
+    assert _hash(1) not in cache.entries
@@ -0,0 +1,72 @@
+import threading
+import types
+
+from conftest import addon_module
+
+import_workers = addon_module('serialization.import_workers')
+profiling = addon_module('serialization.profiling')
+
+
+class FakeUnpacker:
+    """Prepares packages that hold an import cache entry until they are loaded or released."""
+
+    def __init__(self, gate: threading.Event = None):
+        self.gate = gate
+        self.held = set()
+        self.loaded = []
+        self.cleaned_up = False
+        self._lock = threading.Lock()
+
+    def _index_loaded_nodegroups(self):
+        return {}
+
+    def _prepare_package(self, filepath, extract_dir, loaded_index):
+        if self.gate is not None:
+            self.gate.wait(5)
+        with self._lock:
+            self.held.add(filepath)
+        return types.SimpleNamespace(filepath=filepath, error=None, profile=profiling.start_profile('import', filepath))
+
+    def _load_prepared_package(self, prepared, loaded_index):
+        self.loaded.append(prepared.filepath)
+        self._release_prepared(prepared)
+        return True, "loaded", []
+
+    def _release_prepared(self, prepared):
+        with self._lock:
+            self.held.discard(prepared.filepath)
+
+    def cleanup(self):
+        self.cleaned_up = True
+
+
+def _queue(unpacker, count=4):
+    queue = import_workers.AsyncImportQueue(unpacker, max_workers=1)
+    queue.start([f"/packages/Tree{index}.node" for index in range(count)], use_timer=False)
+    return queue
+
+
+def test_abort_releases_prepared_packages():
+    gate = threading.Event()
+    unpacker = FakeUnpacker(gate)
+    queue = _queue(unpacker)
+    # One package is being prepared when the import is aborted, the others are still queued
+    gate.set()
+    queue.abort()
+
+    assert queue.is_finished and unpacker.cleaned_up
+    assert unpacker.loaded == []
+    assert unpacker.held == set()
+
+
+def test_cancel_releases_prepared_packages():
+    unpacker = FakeUnpacker()
+    queue = _queue(unpacker)
+    for future in list(queue._futures):
+        future.result()
+    queue.cancel()
+    while queue.step():
+        pass
+
+    assert unpacker.loaded == []
+    assert unpacker.held == set()
@@ -0,0 +1,58 @@
+import os
+import json
+
+import pytest
+
+from conftest import addon_module
+
+library_index = addon_module('serialization.library_index')
+node_packager = addon_module('serialization.node_packager')
+
+
+def _package(tmp_path, write_files, extra_config=None) -> str:
+    manifest = {'nodegroup_info': {'name': 'Tree', 'package_name': 'Tree'},
+                'interface': {'inputs': [{'name': 'Size', 'socket_type': 'NodeSocketFloat'}], 'outputs': []},
+                'dependencies': {'node_groups': ['Sub']}}
+    paths = write_files({"Tree.blend": b"BLENDER", "Tree.json": json.dumps(manifest).encode('utf-8')})
+    output = str(tmp_path / "Tree.node")
+    success, message = node_packager.package_node_files(output, paths, extra_config=extra_config)
+    assert success, message
+    return output
+
+
+def test_package_summary(tmp_path, write_files):
+    summary = library_index.read_package_summary(_package(tmp_path, write_files))
+    assert summary['name'] == 'Tree'
+    assert summary['inputs'] == [['Size', 'NodeSocketFloat']]
+    assert summary['dependencies'] == ['Sub']
+    assert len(summary['hash']) == 64
+
+
+def test_malformed_hash_is_dropped(tmp_path, write_files):
+    # Extra keys are written after the computed hash, so this one wins when the .config is read back
+    path = _package(tmp_path, write_files, extra_config={'hash': '../../outside'})
+    assert library_index.read_package_summary(path)['hash'] == ''
+
+
+@pytest.mark.parametrize('manifest', [
+    {'nodegroup_info': {'name': 'Broken'}, 'interface': []},
+    {'nodegroup_info': {'name': 7}},
+    {'nodegroup_info': {'name': 'Broken'}, 'dependencies': {'node_groups': [None]}},
+    ['not', 'an', 'object'],
+])
+def test_malformed_package_is_skipped(tmp_path, write_files, manifest):
+    library_dir = tmp_path / "library"
+    library_dir.mkdir()
+    good = _package(tmp_path, write_files)
+    os.replace(good, library_dir / "Tree.node")
+    paths = write_files({"Broken.blend": b"BLENDER", "Broken.json": json.dumps(manifest).encode('utf-8')})
+    success, message = node_packager.package_node_files(str(library_dir / "Broken.node"), paths)
+    assert success, message
+
+    indexer = library_index.LibraryIndexer(str(library_dir))
+    success, message = indexer.scan()
+    assert success, message
+    assert len(indexer.errors) == 1 and 'Broken.node' in indexer.errors[0]
+    with library_index.LibraryCatalog(indexer.catalog_path) as catalog:
+        assert [record['name'] for record in catalog] == ['Tree']
+        assert catalog.find_by_name('Tree')
@@ -0,0 +1,124 @@
+import copy
+
+import pytest
+
+from conftest import addon_module
+
+manifest_delta = addon_module('serialization.manifest_delta')
+
+
+def _node(name, bl_idname='ShaderNodeMath', **fields):
+    node = {'name': name, 'bl_idname': bl_idname, 'location': [0.0, 0.0], 'properties': {'operation': 'ADD'}}
+    node.update(fields)
+    return node
+
+
+def _link(from_node, to_node, from_socket='Value', to_socket='Value', **fields):
+    link = {'from_node': from_node, 'from_socket': from_socket, 'to_node': to_node, 'to_socket': to_socket}
+    link.update(fields)
+    return link
+
+
+def _manifest(nodes, links, inputs=(), outputs=(), node_groups=(), subgroups=None):
+    manifest = {
+        'nodegroup_info': {'name': 'Tree'},
+        'interface': {'inputs': list(inputs), 'outputs': list(outputs)},
+        'nodes': nodes,
+        'links': links,
+        'dependencies': {'node_groups': list(node_groups)},
+    }
+    if subgroups is not None:
+        manifest['dependencies']['subgroups'] = subgroups
+    return manifest
+
+
+@pytest.fixture
+def base():
+    return _manifest([_node('A'), _node('B'), _node('C')], [_link('A', 'B'), _link('B', 'C')],
+                     inputs=[{'identifier': 'Socket_0', 'name': 'Size'}, {'identifier': 'Socket_1', 'name': 'Seed'}])
+
+
+def test_identical_manifests(base):
+    delta = manifest_delta.diff_manifests(base, copy.deepcopy(base))
+    assert delta['nodes'] == {'added': [], 'changed': [], 'removed': []}
+    assert delta['links'] == {'added': [], 'changed': [], 'removed': []}
+    assert delta['interface'] == {}
+
+
+def test_changed_added_and_removed_nodes(base):
+    target = copy.deepcopy(base)
+    target['nodes'][0]['properties'] = {'operation': 'MULTIPLY'}
+    target['nodes'][0]['select'] = True
+    del target['nodes'][0]['location']
+    target['nodes'].pop(2)
+    target['nodes'].append(_node('D'))
+    target['links'] = [_link('A', 'B'), _link('B', 'D')]
+
+    delta = manifest_delta.diff_manifests(base, target)
+    assert delta['nodes']['changed'] == [{'name': 'A', 'fields': {'properties': {'operation': 'MULTIPLY'},
+                                                                  'location': None}}]
+    assert delta['nodes']['removed'] == ['C']
+    assert [node['name'] for node in delta['nodes']['added']] == ['D']
+    # The link to the removed node goes with it, so only the new one is listed
+    assert delta['links'] == {'added': [_link('B', 'D')], 'changed': [], 'removed': []}
+
+
+def test_recreated_node_relinks(base):
+    target = copy.deepcopy(base)
+    target['nodes'][1]['bl_idname'] = 'ShaderNodeVectorMath'
+
+    delta = manifest_delta.diff_manifests(base, target)
+    assert delta['nodes']['removed'] == ['B']
+    assert [node['name'] for node in delta['nodes']['added']] == ['B']
+    assert delta['links']['added'] == target['links']
+    assert delta['links']['removed'] == []
+
+
+def test_muted_link(base):
+    target = copy.deepcopy(base)
+    target['links'][0]['is_muted'] = True
+    delta = manifest_delta.diff_manifests(base, target)
+    assert delta['links'] == {'added': [], 'changed': [target['links'][0]], 'removed': []}
+
+
+def test_interface_changes(base):
+    target = copy.deepcopy(base)
+    seed = target['interface']['inputs'].pop(1)
+    target['interface']['inputs'].insert(0, seed)
+    target['interface']['inputs'].append({'identifier': 'Socket_2', 'name': 'Count'})
+
+    delta = manifest_delta.diff_manifests(base, target)
+    assert delta['interface'] == {'inputs': {
+        'added': [{'identifier': 'Socket_2', 'name': 'Count'}],
+        'order': ['Socket_1', 'Socket_0', 'Socket_2'],
+    }}
+    assert "1 interface socket(s) changed" in manifest_delta.describe_delta(delta)
+
+
+def test_refuses_other_group(base):
+    target = copy.deepcopy(base)
+    target['nodegroup_info']['name'] = 'Other'
+    with pytest.raises(manifest_delta.DeltaError):
+        manifest_delta.diff_manifests(base, target)
+
+
+def test_refuses_nested_group_changes(base):
+    base['dependencies'] = {'node_groups': ['Sub'], 'subgroups': {'Sub': 'a' * 64}}
+    target = copy.deepcopy(base)
+    target['dependencies']['subgroups']['Sub'] = 'b' * 64
+    assert manifest_delta.nested_group_changes(base, target) == ['Sub']
+    with pytest.raises(manifest_delta.DeltaError):
+        manifest_delta.diff_manifests(base, target)
+
+
+def test_load_delta_round_trip(base):
+    target = copy.deepcopy(base)
+    target['nodes'].append(_node('D'))
+    delta = manifest_delta.diff_manifests(base, target)
+    delta['delta_info'] = {'format': manifest_delta.DELTA_FORMAT_VERSION, 'name': 'Tree',
+                           'base_hash': 'a' * 64, 'target_hash': 'b' * 64}
+    assert manifest_delta.load_delta(manifest_delta.dump_delta(delta).decode('utf-8')) == delta
+
+    delta['delta_info']['format'] = manifest_delta.DELTA_FORMAT_VERSION + 1
+    with pytest.raises(manifest_delta.DeltaError):
+        manifest_delta.load_delta(manifest_delta.dump_delta(delta).decode('utf-8'))
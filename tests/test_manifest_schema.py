@@ -0,0 +1,88 @@
+import copy
+
+import pytest
+
+from conftest import addon_module
+from synthetic import TreeSpec, build_manifest
+
+manifest_schema = addon_module('serialization.manifest_schema')
+
+
+@pytest.fixture
+def manifest():
+    return build_manifest(TreeSpec("Tree", nodes=40, links=60, sockets=5, nested=2))
+
+
+def _errors(manifest, **kwargs):
+    with pytest.raises(manifest_schema.ManifestSchemaError) as error:
+        manifest_schema.validate_manifest(manifest, **kwargs)
+    return error.value.errors
+
+
+def test_valid_manifest(manifest):
+    manifest_schema.validate_manifest(manifest)
+    manifest_schema.validate_manifest({'nodegroup_info': {'name': 'Tree'}})
+
+
+def test_wrong_types(manifest):
+    manifest['nodes'][3]['location'] = "0, 0"
+    manifest['nodes'][4]['mute'] = 1
+    del manifest['nodegroup_info']['name']
+    errors = _errors(manifest)
+    assert errors[:3] == ["nodegroup_info is missing 'name'", "nodes[3].location must be a list",
+                          "nodes[4].mute must be a boolean"]
+
+
+def test_duplicate_node_names(manifest):
+    manifest['nodes'][5]['name'] = manifest['nodes'][4]['name']
+    assert any("duplicate node name" in error for error in _errors(manifest))
+
+
+def test_dangling_links(manifest):
+    manifest['links'][0]['from_node'] = "Missing"
+    manifest['links'][1]['to_socket'] = "NoSuchSocket"
+    errors = _errors(manifest)
+    assert any("'Missing' is not a node of this manifest" in error for error in errors)
+    assert any("has no input 'NoSuchSocket'" in error for error in errors)
+
+
+def test_default_values_match_socket_type(manifest):
+    node = next(node for node in manifest['nodes'] if node['bl_idname'] == 'ShaderNodeMath')
+    node['inputs'][0]['default_value'] = "half"
+    assert any("default_value" in error for error in _errors(manifest))
+
+    # Older exports wrote vectors as their repr
+    fixed = copy.deepcopy(manifest)
+    node = next(node for node in fixed['nodes'] if node['bl_idname'] == 'ShaderNodeMath')
+    node['inputs'][0]['default_value'] = 0.5
+    vector_socket = next(socket for node in fixed['nodes'] for socket in node['inputs'] if socket['type'] == 'VECTOR')
+    vector_socket['default_value'] = "<Vector (1.0000, 1.0000, 1.0000)>"
+    manifest_schema.validate_manifest(fixed)
+
+
+def test_unknown_node_types_are_asked_once(manifest):
+    asked = []
+
+    def known_node_type(bl_idname):
+        asked.append(bl_idname)
+        return bl_idname != 'ShaderNodeMath'
+
+    errors = _errors(manifest, known_node_type=known_node_type)
+    assert all("unknown node type 'ShaderNodeMath'" in error for error in errors)
+    assert len(asked) == len(set(asked))
+
+
+def test_sections(manifest):
+    manifest['links'][0]['from_node'] = "Missing"
+    manifest_schema.validate_manifest(manifest, sections=('nodegroup_info', 'dependencies'))
+
+
+def test_error_limit(manifest):
+    for node in manifest['nodes']:
+        node['mute'] = "no"
+    assert len(_errors(manifest)) == manifest_schema.MAX_ERRORS
+
+
+def test_unsupported_version(manifest):
+    manifest['nodegroup_info']['schema_version'] = manifest_schema.SCHEMA_VERSION + 1
+    assert "not supported" in _errors(manifest)[0]
@@ -0,0 +1,52 @@
+import re
+import zipfile
+
+import pytest
+
+from conftest import addon_module
+
+node_archive = addon_module('serialization.node_archive')
+node_packager = addon_module('serialization.node_packager')
+
+
+def _package(tmp_path, write_files) -> str:
+    paths = write_files({"Cube.blend": b"BLENDER" * 100, "Cube.json": b'{"nodegroup_info": {}}'})
+    output = str(tmp_path / "Cube.node")
+    success, message = node_packager.package_node_files(output, paths)
+    assert success, message
+    return output
+
+
+def _tamper(path: str, name: str, data: bytes):
+    """Replace a member with same-sized bytes, with '-' CRCs in the .config like package.bat writes."""
+    with zipfile.ZipFile(path) as source:
+        members = {info.filename: source.read(info) for info in source.infolist()}
+    assert len(members[name]) == len(data)
+    members[name] = data
+    members['.config'] = re.sub(rb'^(entry=\d+) [0-9a-f]{8} ', rb'\1 - ', members['.config'], flags=re.MULTILINE)
+    with zipfile.ZipFile(path, 'w') as target:
+        for member, member_data in members.items():
+            target.writestr(member, member_data)
+
+
+def _verify(path: str, read_blend: bool = True):
+    with node_archive.NodeArchive(path) as archive:
+        expected_hash = archive.read_config()['hash']
+        archive.verify_entries()
+        if read_blend:
+            archive.read_member(archive.blend_names[0])
+        archive.verify_content_hash(expected_hash)
+
+
+def test_intact_package_verifies(tmp_path, write_files):
+    path = _package(tmp_path, write_files)
+    _verify(path)
+    _verify(path, read_blend=False)
+
+
+def test_unread_member_is_hashed(tmp_path, write_files):
+    path = _package(tmp_path, write_files)
+    _tamper(path, "Cube.json", b'{"nodegroup_info": []}')
+    # The import only read the .blend; the tampered manifest must still fail the content hash check
+    with pytest.raises(node_archive.IntegrityError):
+        _verify(path)
@@ -0,0 +1,33 @@
+import types
+
+from conftest import addon_module
+
+node_builder = addon_module('serialization.node_builder')
+
+
+class Nodes(list):
+    """nodes.new that runs out of room for a node type after `limit` of them."""
+
+    def __init__(self, limits: dict):
+        super().__init__()
+        self.limits = limits
+
+    def new(self, type):
+        if sum(1 for node in self if node.bl_idname == type) >= self.limits.get(type, 1000):
+            raise RuntimeError(f"cannot add more {type} nodes")
+        node = types.SimpleNamespace(bl_idname=type, name=f"{type}.{len(self)}", label='', inputs=[])
+        self.append(node)
+        return node
+
+
+def test_partially_created_type_reports_what_failed():
+    nodes = Nodes({'GeometryNodeMath': 2})
+    nodes_data = [{'name': f"Math {index}", 'bl_idname': 'GeometryNodeMath'} for index in range(5)]
+    nodes_data.append({'name': "Join", 'bl_idname': 'GeometryNodeJoinGeometry'})
+
+    builder = node_builder.NodeBuilder(types.SimpleNamespace(nodes=nodes))
+    assert builder.build(nodes_data) == 3
+
+    assert sorted(builder.nodes_by_name) == ["Join", "Math 0", "Math 1"]
+    assert builder.errors == ["Could not create 3 of 5 node(s) of type GeometryNodeMath: "
+                              "cannot add more GeometryNodeMath nodes"]
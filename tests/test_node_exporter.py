@@ -0,0 +1,102 @@
+import os
+import types
+
+import pytest
+
+from conftest import addon_module
+
+node_exporter = addon_module('serialization.node_exporter')
+
+
+class FakeSerializer:
+    """Writes a fixed manifest and .blend, skipping like the serializer when the fingerprint matches."""
+    fingerprint_value = 'f' * 64
+    seen = []
+
+    def __init__(self, manifest_format, bundle_dependencies, compress_blend):
+        self.fingerprint = None
+        self.skipped = False
+
+    def serialize_nodegroup(self, node_tree, output_directory, package_name=None, previous_fingerprint=None):
+        FakeSerializer.seen.append(previous_fingerprint)
+        self.fingerprint = FakeSerializer.fingerprint_value
+        if previous_fingerprint == self.fingerprint:
+            self.skipped = True
+            return True
+        for name, data in ((f"{package_name}.blend", b"BLENDER"), (f"{package_name}.json", b"{}")):
+            with open(os.path.join(output_directory, name), 'wb') as f:
+                f.write(data)
+        return True
+
+
+@pytest.fixture
+def export(monkeypatch, tmp_path):
+    monkeypatch.setattr(node_exporter, 'NodeGroupSerializer', FakeSerializer)
+    FakeSerializer.seen = []
+    node_tree = types.SimpleNamespace(name="Tree")
+
+    def run(**settings):
+        exporter = node_exporter.NodeGroupExporter(**settings)
+        success, message = exporter.export(node_tree, str(tmp_path / "Tree"))
+        assert success, message
+        return exporter.skipped
+    return run
+
+
+def test_unchanged_group_is_skipped(export):
+    assert not export()
+    assert export()
+    assert FakeSerializer.seen == [None, FakeSerializer.fingerprint_value]
+
+
+@pytest.mark.parametrize('settings', [
+    {'manifest_format': 'compact'},
+    {'bundle_dependencies': True},
+    {'compression': 'deflate'},
+    {'compression': 'legacy', 'compression_level': 9},
+])
+def test_other_export_settings_rewrite(export, settings):
+    assert not export()
+    assert not export(**settings)
+    assert export(**settings)
+
+
+def test_compression_level(export):
+    export(compression='deflate')
+    assert not export(compression='deflate', compression_level=9)
+    assert export(compression='deflate', compression_level=9)
+    # The preset's own level is the same as asking for it explicitly
+    assert not export(compression='deflate')
+    assert export(compression='deflate', compression_level=6)
+
+
+def test_force(export):
+    export()
+    assert not export(force=True)
+
+
+def test_export_records_profile(monkeypatch, tmp_path):
+    monkeypatch.setattr(node_exporter, 'NodeGroupSerializer', FakeSerializer)
+    exporter = node_exporter.NodeGroupExporter()
+    success, message = exporter.export(types.SimpleNamespace(name="Tree"), str(tmp_path / "Tree.node"))
+    assert success, message
+
+    record = exporter.profile.to_dict()
+    assert record['operation'] == 'export'
+    assert record['target'] == str(tmp_path / "Tree.node")
+    assert record['error'] is None and record['seconds'] is not None
+    assert {'zip', 'hash'} <= set(record['stages'])
+    assert record['stages']['zip']['bytes'] > 0
+
+
+@pytest.mark.parametrize('name, file_name', [
+    ("My Group", "My_Group"),
+    ("Rig/Arm", "Rig_Arm"),
+    ("..\\..\\escape", "_.._escape"),
+    ("../up", "_up"),
+    ("Ünïcode-1.2", "Ünïcode-1.2"),
+    ("..", "node_group"),
+])
+def test_package_file_name(name, file_name):
+    assert node_exporter.package_file_name(name) == file_name
+    assert os.path.basename(file_name) == file_name
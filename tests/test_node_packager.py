@@ -0,0 +1,52 @@
+import hashlib
+import zipfile
+
+from conftest import addon_module
+
+node_packager = addon_module('serialization.node_packager')
+package_config = addon_module('serialization.package_config')
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest().upper()
+
+
+def test_content_hash_matches_package_bat():
+    # package.bat: $hashData | Sort-Object (case-insensitive), joined with '|', SHA-256 as lowercase hex
+    entries = ["B.blend:" + "1" * 64, "a.json:" + "2" * 64]
+    expected = hashlib.sha256(f"a.json:{'2' * 64}|B.blend:{'1' * 64}".encode('utf-8')).hexdigest()
+    assert node_packager.compute_content_hash(entries) == expected
+    assert node_packager.compute_content_hash(list(reversed(entries))) == expected
+
+
+def test_package_records_every_entry(tmp_path, write_files):
+    blend, manifest = b"BLENDER" * 1000, b'{"nodegroup_info": {"name": "Cube"}}'
+    paths = write_files({"Cube.blend": blend, "Cube.json": manifest})
+    output = str(tmp_path / "Cube.node")
+
+    success, message = node_packager.package_node_files(output, paths, extra_config={'compression': 'stored'},
+                                                        preset='stored')
+    assert success, message
+
+    with zipfile.ZipFile(output) as zip_file:
+        assert sorted(zip_file.namelist()) == ['.config', 'Cube.blend', 'Cube.json']
+        assert zip_file.getinfo('Cube.blend').compress_type == zipfile.ZIP_STORED
+        config = package_config.PackageConfig.parse(zip_file.read('.config').decode('utf-8'))
+        crcs = {name: zip_file.getinfo(name).CRC for name in ('Cube.blend', 'Cube.json')}
+
+    assert config.format_version == package_config.CONFIG_FORMAT_VERSION
+    assert config.values['compression'] == 'stored'
+    assert config.entries == {
+        'Cube.blend': package_config.EntryRecord(len(blend), crcs['Cube.blend'], _sha256(blend)),
+        'Cube.json': package_config.EntryRecord(len(manifest), crcs['Cube.json'], _sha256(manifest)),
+    }
+    assert config.content_hash == node_packager.compute_content_hash(
+        [f"Cube.blend:{_sha256(blend)}", f"Cube.json:{_sha256(manifest)}"])
+
+
+def test_failed_package_leaves_nothing_behind(tmp_path):
+    output = tmp_path / "Missing.node"
+    success, _ = node_packager.package_node_files(str(output), [str(tmp_path / "missing.blend")])
+    assert not success
+    assert not output.exists()
+    assert not (tmp_path / "Missing.node.partial").exists()
@@ -0,0 +1,81 @@
+import bpy
+import pytest
+
+from conftest import addon_module
+
+nodegroup_unpacker = addon_module('serialization.nodegroup_unpacker')
+SUBGROUP_HASH_PROPERTY = addon_module('serialization.dependency_graph').SUBGROUP_HASH_PROPERTY
+
+
+class FakeGroup(dict):
+    """A node group: custom properties as dict items, hashing to its content."""
+
+    def __init__(self, name, content, tag=None):
+        super().__init__()
+        self.name = name
+        self.content = content
+        self.remapped_to = None
+        if tag:
+            self[SUBGROUP_HASH_PROPERTY] = tag
+
+    def user_remap(self, other):
+        self.remapped_to = other
+
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+
+class FakeHasher:
+    def hash_tree(self, node_tree):
+        return f"hash-of-{node_tree.content}"
+
+
+class NodeGroups(list):
+    def remove(self, node_group):
+        list.remove(self, node_group)
+
+
+@pytest.fixture
+def reuse(monkeypatch):
+    monkeypatch.setattr(nodegroup_unpacker, 'StructuralHasher', FakeHasher)
+    unpacker = nodegroup_unpacker.NodeGroupUnpacker(use_cache=False)
+
+    def run(existing, appended, subgroups):
+        monkeypatch.setattr(bpy.data, 'node_groups', NodeGroups(existing + [group for _, group in appended]))
+        return unpacker._reuse_shared_subgroups(appended, subgroups, {'Root'})
+    return run
+
+
+def test_unchanged_group_is_reused(reuse):
+    helper = FakeGroup("Helper", "helper", tag="hash-of-helper")
+    appended_helper = FakeGroup("Helper.001", "helper")
+    root = FakeGroup("Root", "root")
+
+    kept = reuse([helper], [('Helper', appended_helper), ('Root', root)],
+                 {'Helper': "hash-of-helper", 'Root': "hash-of-root"})
+
+    assert kept == [('Root', root)]
+    assert appended_helper.remapped_to is helper
+    assert appended_helper not in bpy.data.node_groups
+
+
+def test_edited_group_is_not_reused(reuse):
+    # Tagged on import, then edited by the user
+    edited = FakeGroup("Helper", "edited helper", tag="hash-of-helper")
+    appended_helper = FakeGroup("Helper.001", "helper")
+
+    kept = reuse([edited], [('Helper', appended_helper)], {'Helper': "hash-of-helper"})
+
+    assert kept == [('Helper', appended_helper)]
+    assert appended_helper.remapped_to is None
+    assert appended_helper[SUBGROUP_HASH_PROPERTY] == "hash-of-helper"
+    assert edited[SUBGROUP_HASH_PROPERTY] == "hash-of-edited helper"
+
+
+def test_unchanged_copy_is_found_next_to_an_edited_one(reuse):
+    edited = FakeGroup("Helper", "edited helper", tag="hash-of-helper")
+    unchanged = FakeGroup("Helper.002", "helper", tag="hash-of-helper")
+    appended_helper = FakeGroup("Helper.001", "helper")
+
+    assert reuse([edited, unchanged], [('Helper', appended_helper)], {'Helper': "hash-of-helper"}) == []
+    assert appended_helper.remapped_to is unchanged
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from conftest import addon_module
+
+package_config = addon_module('serialization.package_config')
+EntryRecord = package_config.EntryRecord
+PackageConfig = package_config.PackageConfig
+
+SHA_A = "A" * 64
+SHA_B = "b" * 64
+
+
+def test_round_trip():
+    config = PackageConfig({'hash': 'f' * 64, 'created': '2025-09-07T12:34:56Z', 'compression': 'stored'}, {
+        'Cube.blend': EntryRecord(3145728, 0x337ca9a3, SHA_A),
+        'Nested Folder/Cube Copy.json': EntryRecord(80, None, SHA_B),
+    })
+    text = config.to_text()
+    assert "format_version=2\n" in text
+    assert f"entry=80 - {SHA_B.upper()} Nested Folder/Cube Copy.json\n" in text
+
+    parsed = PackageConfig.parse(text)
+    assert parsed.entries == config.entries
+    assert parsed.values == {**config.values, 'format_version': '2'}
+    assert parsed.format_version == 2
+
+
+def test_package_bat_lines():
+    # PowerShell writes CRLF line endings and no CRC
+    text = f"hash={'f' * 64}\r\ncreated=2025-09-07T12:34:56Z\r\nformat_version=2\r\nentry=12 - {SHA_A} Cube.blend\r\n"
+    config = PackageConfig.parse(text)
+    assert config.content_hash == 'f' * 64
+    assert config.entries == {'Cube.blend': EntryRecord(12, None, SHA_A)}
+    assert config.entry_hashes() == [f"Cube.blend:{SHA_A}"]
+
+
+def test_version_1_config():
+    config = PackageConfig.parse("hash=abc\ncreated=2025-09-07T12:34:56Z\nformat_version=1.0.0\n")
+    assert config.format_version == 1
+    assert config.entries == {}
+    assert package_config.parse_config("hash=abc\n") == {'hash': 'abc'}
+
+
+def test_json_config():
+    config = PackageConfig.parse(json.dumps({
+        'hash': 'abc', 'entries': {'Cube.blend': {'size': 3, 'crc': '0000abcd', 'sha256': SHA_B}},
+    }))
+    assert config.values == {'hash': 'abc'}
+    assert config.entries == {'Cube.blend': EntryRecord(3, 0xabcd, SHA_B)}
+
+
+@pytest.mark.parametrize('line', [
+    "entry=12 - " + SHA_A,
+    "entry=twelve - " + SHA_A + " Cube.blend",
+    "entry=12 zz " + SHA_A + " Cube.blend",
+])
+def test_malformed_entry(line):
+    with pytest.raises(package_config.ConfigError):
+        PackageConfig.parse(f"hash=abc\n{line}\n")
@@ -0,0 +1,86 @@
+import types
+
+import bpy
+
+from conftest import addon_module
+
+structural_hash = addon_module('serialization.structural_hash')
+
+
+class Struct:
+    """An RNA struct: every keyword becomes a property, typed from its value."""
+
+    def __init__(self, **values):
+        properties = []
+        for identifier, value in values.items():
+            if isinstance(value, list):
+                kind = 'COLLECTION'
+            elif value is None or isinstance(value, (Struct, bpy.types.ID)):
+                kind = 'POINTER'
+            else:
+                kind = 'FLOAT'
+            properties.append(types.SimpleNamespace(identifier=identifier, type=kind))
+            setattr(self, identifier, value)
+        self.bl_rna = types.SimpleNamespace(properties=properties)
+
+
+def _node_group(name):
+    node_group = bpy.types.NodeTree()
+    node_group.name = name
+    return node_group
+
+
+def _color_ramp_node(position=0.5, **values):
+    ramp = Struct(interpolation='LINEAR', elements=[Struct(position=0.0, color=(0.0, 0.0, 0.0, 1.0), select=True),
+                                                    Struct(position=position, color=(1.0, 1.0, 1.0, 1.0))])
+    return Struct(name="Color Ramp", select=False, use_clamp=False, color_ramp=ramp, **values)
+
+
+def test_nested_settings_are_compared():
+    assert structural_hash.rna_settings(_color_ramp_node()) == structural_hash.rna_settings(_color_ramp_node())
+    assert structural_hash.rna_settings(_color_ramp_node()) != structural_hash.rna_settings(_color_ramp_node(0.75))
+    clamped = _color_ramp_node()
+    clamped.use_clamp = True
+    assert structural_hash.rna_settings(_color_ramp_node()) != structural_hash.rna_settings(clamped)
+
+
+def test_selection_is_ignored():
+    selected = _color_ramp_node()
+    selected.select = True
+    selected.color_ramp.elements[0].select = False
+    assert structural_hash.rna_settings(selected) == structural_hash.rna_settings(_color_ramp_node())
+
+
+def test_id_pointers():
+    values = structural_hash.rna_settings(_color_ramp_node(node_tree=_node_group("Sub.001")))
+    # Nested groups are hashed on their own, so their suffix does not matter
+    assert values['node_tree'] == ['NodeTree', 'Sub']
+
+
+def test_depth_is_limited():
+    struct = Struct(value=1.0)
+    for _ in range(structural_hash.MAX_RNA_DEPTH + 2):
+        struct = Struct(child=struct)
+    depth = 0
+    values = structural_hash.rna_settings(struct)
+    while isinstance(values, dict):
+        values = values['child']
+        depth += 1
+    assert depth == structural_hash.MAX_RNA_DEPTH + 1
+
+
+def _tree(**values):
+    settings = dict(name="Tree", description="", view_center=(0.0, 0.0), grease_pencil=None,
+                    nodes=[_color_ramp_node()], links=[], interface=Struct(items_tree=[]), animation_data=None)
+    settings.update(values)
+    return Struct(**settings)
+
+
+def test_editor_view_state_is_ignored(monkeypatch):
+    id_properties = [types.SimpleNamespace(identifier='name', type='STRING')]
+    monkeypatch.setattr(bpy.types.ID, 'bl_rna', types.SimpleNamespace(properties=id_properties), raising=False)
+    fingerprint = structural_hash.settings_fingerprint
+
+    panned = _tree(view_center=(812.5, -140.0), grease_pencil=Struct(layers=[Struct(info="Note")]))
+    assert fingerprint(panned) == fingerprint(_tree())
+    assert fingerprint(_tree(description="Scatters rocks")) != fingerprint(_tree())